@@ -4,9 +4,13 @@
 from __future__ import absolute_import, division, print_function
 
 from ramlfications.config import setup_config
-from ramlfications.parser import parse_raml
+from ramlfications.parser import iter_raml_resources, parse_raml
 
+from ramlfications._cache import cached
 from ramlfications._helpers import load_file, load_string
+from ramlfications import _pool
+from ramlfications.loader import INCLUDE_CACHE, RAMLLoader
+from ramlfications.raml import UNLOADED  # NOQA
 
 
 __author__ = "Lynn Root"
@@ -18,17 +22,31 @@ __uri__ = "https://ramlfications.readthedocs.io"
 __description__ = "A Python RAML parser"
 
 
-def load(raml_file):
+def load(raml_file, cache_dir=None, lazy_includes=False):
     """
     Module helper function to load a RAML File using \
     :py:class:`.loader.RAMLLoader`.
 
     :param str raml_file: String path to RAML file
+    :param str cache_dir: Directory to cache the loaded RAML in, if any. \
+        The cache is invalidated when the RAML file or any file it \
+        includes changes. \
+        Cached results are loaded with ``pickle``, so anyone who can \
+        write to ``cache_dir`` can run code in this process: use a \
+        private directory.  A missing one is created with mode ``0o700``.
+    :param bool lazy_includes: Only read & load included JSON files, \
+        i.e. schemas and examples, on first access (see \
+        :py:class:`.loader.LazyInclude`).
     :return: loaded RAML
     :rtype: dict
     :raises LoadRAMLError: If error occurred trying to load the RAML file
     """
-    return load_file(raml_file)
+    loader = RAMLLoader(lazy=lazy_includes)
+    if cache_dir:
+        key = dict(lazy_includes=lazy_includes)
+        return cached(raml_file, cache_dir, "load", key,
+                      lambda: load_file(raml_file, loader), loader)
+    return load_file(raml_file, loader)
 
 
 def loads(raml_string):
@@ -44,7 +62,8 @@ def loads(raml_string):
     return load_string(raml_string)
 
 
-def parse(raml, config_file=None):
+def parse(raml, config_file=None, cache_dir=None, lazy_includes=False,
+          fields=None, lazy_attributes=False, intern_params=True):
     """
     Module helper function to parse a RAML File.  First loads the RAML file
     with :py:class:`.loader.RAMLLoader` then parses with
@@ -54,7 +73,29 @@ def parse(raml, config_file=None):
     :param raml: Either string path to the RAML file, a file object, or \
         a string representation of RAML.
     :param str config_file:  String path to desired config file, if any.
-    :return: parsed API
+    :param str cache_dir: Directory to cache the parsed API in, if any. \
+        The cache is invalidated when the RAML file, any file it reaches \
+        through ``!include`` or JSON ``$ref``, or the config changes. \
+        Cached results are loaded with ``pickle``, so anyone who can \
+        write to ``cache_dir`` can run code in this process: use a \
+        private directory.  A missing one is created with mode ``0o700``.
+    :param bool lazy_includes: Only read & load included JSON files, \
+        i.e. schemas and examples, on first access (see \
+        :py:class:`.loader.LazyInclude`).
+    :param fields: Only build these attributes of each resource: a \
+        profile name, ``"routing"`` or ``"full"``, or a list of \
+        :py:class:`.raml.ResourceNode` attribute names.  Skipped \
+        attributes are set to :py:data:`.raml.UNLOADED`.  Defaults to all.
+    :param bool lazy_attributes: Only compute the headers, body, \
+        responses, query & form parameters and security schemes of a \
+        resource on first access.  If validating, they are validated \
+        then; use :py:meth:`.raml.ResourceNode.load` to do so up front.
+    :param bool intern_params: Share one parameter object between all \
+        resources that declare or inherit an identical parameter.  Pass \
+        ``False`` if you change parameter objects after parsing.
+    :return: parsed API; its ``raw`` data may be shared with other APIs \
+        parsed from the same included files (see \
+        :py:data:`.loader.INCLUDE_CACHE`), and must not be changed.
     :rtype: RAMLRoot
     :raises LoadRAMLError: If error occurred trying to load the RAML file
         (see :py:class:`.loader.RAMLLoader`)
@@ -65,9 +106,55 @@ def parse(raml, config_file=None):
     :raises InvalidParameterError: Named parameter is invalid \
         according to RAML `specification <http://raml.org/spec.html>`_.
     """
-    loader = load(raml)
+    loader = RAMLLoader(include_cache=INCLUDE_CACHE, lazy=lazy_includes)
+    if cache_dir:
+        config = setup_config(config_file)
+        key = dict(config=config, fields=fields, intern=intern_params,
+                   lazy_includes=lazy_includes)
+        return cached(raml, cache_dir, "parse", key,
+                      lambda: parse_raml(load_file(raml, loader), config,
+                                         fields, lazy_attributes,
+                                         intern_params),
+                      loader)
+    loaded_raml = load_file(raml, loader)
+    config = setup_config(config_file)
+    return parse_raml(loaded_raml, config, fields, lazy_attributes,
+                      intern_params)
+
+
+def iter_resources(raml, config_file=None, lazy_includes=False,
+                   fields=None, lazy_attributes=False, intern_params=True):
+    """
+    Module helper function to parse a RAML File one resource at a time.
+    Like :py:func:`parse`, but yields each :py:class:`.raml.ResourceNode`
+    as soon as it is built instead of returning the complete API, in the
+    order of :py:obj:`.raml.RootNode.resources`.
+
+    :param raml: Either string path to the RAML file, a file object, or \
+        a string representation of RAML.
+    :param str config_file:  String path to desired config file, if any.
+    :param bool lazy_includes: Only read & load included JSON files, \
+        i.e. schemas and examples, on first access (see \
+        :py:class:`.loader.LazyInclude`).
+    :param fields: Only build these attributes of each resource, see \
+        :py:func:`parse`.
+    :param bool lazy_attributes: Compute attributes of each resource on \
+        first access, see :py:func:`parse`.
+    :param bool intern_params: Share identical parameter objects, see \
+        :py:func:`parse`.
+    :return: generator of parsed resources
+    :rtype: generator
+    :raises LoadRAMLError: If error occurred trying to load the RAML file
+        (see :py:class:`.loader.RAMLLoader`)
+    :raises InvalidRAMLError: RAML file is invalid according to RAML \
+        `specification <http://raml.org/spec.html>`_; raised once all \
+        resources have been yielded.
+    """
+    loader = RAMLLoader(include_cache=INCLUDE_CACHE, lazy=lazy_includes)
+    loaded_raml = load_file(raml, loader)
     config = setup_config(config_file)
-    return parse_raml(loader, config)
+    return iter_raml_resources(loaded_raml, config, fields,
+                               lazy_attributes, intern_params)
 
 
 def validate(raml, config_file=None):
@@ -96,3 +183,44 @@ def validate(raml, config_file=None):
     config = setup_config(config_file)
     config["validate"] = True
     parse_raml(loader, config)
+
+
+def parse_many(raml_files, config_file=None, workers=None):
+    """
+    Module helper function to parse many RAML files in a pool of worker
+    processes, like calling :py:func:`parse` for each file.  The config
+    is set up once and shared by all workers.
+
+    :param list raml_files: String paths to the RAML files
+    :param str config_file:  String path to desired config file, if any.
+    :param int workers: Number of worker processes; defaults to the \
+        number of CPUs.  With ``1``, files are parsed in this process.
+    :return: generator of each file's parsed API, or the \
+        :py:class:`.errors.InvalidRAMLError` or \
+        :py:class:`.errors.LoadRAMLError` it failed with, in the order \
+        of ``raml_files`` and as soon as it is available
+    :rtype: generator
+    """
+    config = setup_config(config_file)
+    return _pool.imap(_pool._parse, raml_files, config, workers)
+
+
+def validate_many(raml_files, config_file=None, workers=None):
+    """
+    Module helper function to validate many RAML files in a pool of \
+    worker processes, like calling :py:func:`validate` for each file.  \
+    The config is set up once and shared by all workers.
+
+    :param list raml_files: String paths to the RAML files
+    :param str config_file:  String path to desired config file, if any.
+    :param int workers: Number of worker processes; defaults to the \
+        number of CPUs.  With ``1``, files are validated in this process.
+    :return: generator of ``None`` for each valid file, or the \
+        :py:class:`.errors.InvalidRAMLError` or \
+        :py:class:`.errors.LoadRAMLError` it failed with, in the order \
+        of ``raml_files`` and as soon as it is available
+    :rtype: generator
+    """
+    config = setup_config(config_file)
+    config["validate"] = True
+    return _pool.imap(_pool._validate, raml_files, config, workers)
@@ -4,14 +4,18 @@
 
 from __future__ import absolute_import, division, print_function
 
+import glob
+import os
+
 import click
 
+from .config import setup_config
 from .tree import tree as ttree
-from .errors import InvalidRAMLError
+from .errors import InvalidRAMLError, LoadRAMLError
 from .utils import update_mime_types as umt
 from ._helpers import load_file
 
-from ramlfications import validate as vvalidate
+from ramlfications import parse, _pool
 
 
 #: Global Click defaults
@@ -26,21 +30,54 @@ def main():
     # Needed to collect the validate & tree commands
 
 
+def _expand_files(ctx, param, value):
+    """Expands glob patterns, e.g. for shells that do not."""
+    raml_files = []
+    for arg in value:
+        if glob.has_magic(arg):
+            matches = sorted(glob.glob(arg))
+            if not matches:
+                raise click.BadParameter(
+                    'Pattern "{0}" does not match any file.'.format(arg))
+            raml_files.extend(matches)
+        elif os.path.exists(arg):
+            raml_files.append(arg)
+        else:
+            raise click.BadParameter(
+                'Path "{0}" does not exist.'.format(arg))
+    return raml_files
+
+
 @main.command(context_settings=CONTEXT_SETTINGS,
-              help="Validate a RAML file.")
-@click.argument("ramlfile", type=click.Path(exists=True))
+              help="Validate RAML files.")
+@click.argument("ramlfile", nargs=-1, required=True,
+                callback=_expand_files)
 @click.option("--config", "-c", type=click.Path(exists=True),
               help="Additionally supported items beyond RAML spec.")
-def validate(ramlfile, config):
-    """Validate a given RAML file."""
-    try:
-        vvalidate(ramlfile, config)
-        click.secho("Success! Valid RAML file: {0}".format(ramlfile),
-                    fg="green")
-
-    except InvalidRAMLError as e:
-        msg = "Error validating file {0}: \n{1}".format(ramlfile, e)
-        click.secho(msg, fg="red", err=True)
+@click.option("--jobs", "-j", type=click.IntRange(0), default=1,
+              help="Files to validate in parallel, 0 for one per CPU.")
+def validate(ramlfile, config, jobs):
+    """Validate the given RAML files."""
+    config = setup_config(config)
+    config["validate"] = True
+    # report each file as soon as it is done, not in the given order
+    results = _pool.imap_unordered(_pool._validate, ramlfile, config,
+                                   jobs or None)
+    failed = 0
+    for raml_file, error in results:
+        if error is None:
+            click.secho("Success! Valid RAML file: {0}".format(raml_file),
+                        fg="green")
+        else:
+            failed += 1
+            msg = "Error validating file {0}: \n{1}".format(raml_file, error)
+            click.secho(msg, fg="red", err=True)
+
+    if len(ramlfile) > 1:
+        msg = "{0} of {1} RAML files valid.".format(
+            len(ramlfile) - failed, len(ramlfile))
+        click.secho(msg, fg="red" if failed else "green")
+    if failed:
         raise SystemExit(1)
 
 
@@ -70,6 +107,65 @@ def tree(ramlfile, color, output, verbose, validate, config):
         raise SystemExit(1)
 
 
+@main.command(context_settings=CONTEXT_SETTINGS,
+              help="Dump the parsed RAML file as JSON.")
+@click.argument('ramlfile', type=click.Path(exists=True))
+@click.option("-c", "--config", type=click.Path(exists=True),
+              help="Additionally supported items beyond RAML spec.")
+@click.option("-o", "--output", type=click.File('w'), default="-",
+              help="Save output to file instead of stdout.")
+@click.option("-r", "--raw", default=False, is_flag=True,
+              help="Include the raw RAML data of each object.")
+def dump(ramlfile, config, output, raw):
+    """Dump the parsed RAML-defined API as JSON, one node at a time."""
+    try:
+        api = parse(ramlfile, config)
+    except InvalidRAMLError as e:
+        msg = '"{0}" is not a valid RAML file: {1}'.format(
+            click.format_filename(ramlfile), e)
+        click.secho(msg, fg="red", err=True)
+        raise SystemExit(1)
+    except LoadRAMLError as e:
+        msg = 'Error loading file {0}: \n{1}'.format(
+            click.format_filename(ramlfile), e)
+        click.secho(msg, fg="red", err=True)
+        raise SystemExit(1)
+    api.dump(output, raw=raw)
+
+
+@main.command(context_settings=CONTEXT_SETTINGS,
+              help="Serve the examples of a RAML file from a mock server.")
+@click.argument('ramlfile', type=click.Path(exists=True))
+@click.option("-c", "--config", type=click.Path(exists=True),
+              help="Additionally supported items beyond RAML spec.")
+@click.option("-H", "--host", default="127.0.0.1", show_default=True,
+              help="Address to listen on.")
+@click.option("-p", "--port", type=click.IntRange(0, 65535), default=8000,
+              show_default=True, help="Port to listen on.")
+@click.option("-l", "--latency", type=float, default=0,
+              help="Seconds to delay each response by.")
+@click.option("-j", "--jitter", type=float, default=0,
+              help="Random extra latency, up to that many seconds.")
+def mock(ramlfile, config, host, port, latency, jitter):
+    """Serve the response examples of the RAML-defined API."""
+    try:
+        from .mock import serve
+    except ImportError:  # NOCOV
+        click.secho("The mock server requires Python 3.4+.", fg="red",
+                    err=True)
+        raise SystemExit(1)
+    try:
+        api = parse(ramlfile, config)
+    except InvalidRAMLError as e:
+        msg = '"{0}" is not a valid RAML file: {1}'.format(
+            click.format_filename(ramlfile), e)
+        click.secho(msg, fg="red", err=True)
+        raise SystemExit(1)
+    click.secho("Serving {0} on http://{1}:{2}/".format(
+        click.format_filename(ramlfile), host, port), fg="green")
+    serve(api, host, port, latency, jitter)
+
+
 @main.command(context_settings=CONTEXT_SETTINGS,
               help="Update RAMLfications' supported MIME types from IANA.")
 def update():
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2015 Spotify AB
+
+from __future__ import absolute_import, division, print_function
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+from six.moves import cPickle as pickle
+
+#: Bump when the layout of cached data changes
+CACHE_FORMAT = 2
+
+_replace = getattr(os, "replace", os.rename)
+
+
+def _digest_file(file_name):
+    """sha256 hex digest of a file's content."""
+    sha = hashlib.sha256()
+    with open(file_name, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _source_path(raml):
+    """
+    Returns the absolute path of the RAML file to parse, or ``None`` if
+    ``raml`` is not backed by a file on disk (and can not be cached).
+    """
+    if hasattr(raml, "read"):
+        raml = getattr(raml, "name", None)
+    if isinstance(raml, bytes):
+        raml = raml.decode(sys.getfilesystemencoding())
+    if raml and os.path.isfile(raml):
+        return os.path.abspath(raml)
+    return None
+
+
+def _cache_key(kind, raml_file, config):
+    from . import __version__
+
+    key = json.dumps([
+        CACHE_FORMAT, __version__, sys.version_info[0], kind, raml_file,
+        _digest_file(raml_file), config
+    ], sort_keys=True, default=repr)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _read(cache_dir, key):
+    """
+    Returns the cached result, or ``None`` if missing or stale.
+
+    Results are unpickled, so whoever can write to ``cache_dir`` can run
+    code in this process.
+    """
+    deps_file = os.path.join(cache_dir, key + ".deps")
+    data_file = os.path.join(cache_dir, key + ".pickle")
+    try:
+        with open(deps_file, "r") as f:
+            deps = json.load(f)
+        for file_name, digest in deps:
+            if _digest_file(file_name) != digest:
+                return None
+        with open(data_file, "rb") as f:
+            return pickle.load(f)
+    except Exception:  # missing, unreadable or corrupt entries are misses
+        return None
+
+
+def _write_atomic(file_name, data, mode):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(file_name))
+    try:
+        with os.fdopen(fd, mode) as f:
+            f.write(data)
+        _replace(tmp, file_name)
+    except Exception:
+        os.remove(tmp)
+        raise
+
+
+def _write(cache_dir, key, result, loader):
+    try:
+        # pickling also resolves any lazy JSON $ref proxies & includes,
+        # so only then is it known what the result depends on
+        data = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        if not loader.cacheable:
+            return
+        deps = sorted(set(loader.includes))
+        deps = [(d, _digest_file(d)) for d in deps]
+        if not os.path.isdir(cache_dir):
+            # only readable & writable by us: entries are unpickled
+            os.makedirs(cache_dir, 0o700)
+        # write the data before the dependency list that validates it
+        _write_atomic(os.path.join(cache_dir, key + ".pickle"), data, "wb")
+        _write_atomic(os.path.join(cache_dir, key + ".deps"),
+                      json.dumps(deps), "w")
+    except (IOError, OSError, pickle.PicklingError):
+        pass
+
+
+def cached(raml, cache_dir, kind, config, build, loader):
+    """
+    Returns the result of ``build()`` for the RAML file ``raml``, served
+    from ``cache_dir`` when neither the RAML file, any file it reaches
+    through ``!include`` or JSON ``$ref``, nor ``config`` changed.
+
+    :param raml: String path to RAML file, or a file object
+    :param str cache_dir: Directory to store cached results in
+    :param str kind: Name of what ``build`` produces, e.g. ``"parse"``
+    :param dict config: Effective config, and any other options, that \
+        ``build`` depends on
+    :param build: Callable that loads ``raml`` with ``loader``
+    :param RAMLLoader loader: Loader used by ``build``
+    """
+    raml_file = _source_path(raml)
+    if not cache_dir or raml_file is None:
+        return build()
+
+    key = _cache_key(kind, raml_file, config)
+    result = _read(cache_dir, key)
+    if result is not None:
+        return result
+
+    result = build()
+    _write(cache_dir, key, result, loader)
+    return result
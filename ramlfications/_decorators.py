@@ -1,8 +1,43 @@
+from contextlib import contextmanager
+import threading
+
 from .errors import BaseRAMLError
 
+_state = threading.local()
+
+
+def _validating():
+    return getattr(_state, "run_validators", True)
+
+
+@contextmanager
+def run_validators(run):
+    """
+    Turns the validators of RAML objects created in the current thread
+    on or off, without touching attrs' process-wide switch, so parses in
+    other threads keep their own setting.
+    """
+    previous = _validating()
+    _state.run_validators = run
+    try:
+        yield
+    finally:
+        _state.run_validators = previous
+
+
+def skippable(validator):
+    """Only runs ``validator`` if validators are turned on."""
+    def func_wrapper(inst, attr, value):
+        if _validating():
+            validator(inst, attr, value)
+
+    return func_wrapper
+
 
 def collecterrors(func):
     def func_wrapper(inst, attr, value):
+        if not _validating():
+            return
         try:
             func(inst, attr, value)
         except BaseRAMLError as e:
@@ -13,10 +13,12 @@ if sys.version_info[0] == 2:
     from io import open
 
 
-def load_file(raml_file):
+def load_file(raml_file, loader=None):
+    if loader is None:
+        loader = RAMLLoader()
     try:
         with _get_raml_object(raml_file) as raml:
-            return RAMLLoader().load(raml)
+            return loader.load(raml)
     except IOError as e:
         raise LoadRAMLError(e)
 
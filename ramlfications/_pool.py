@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2015 Spotify AB
+
+from __future__ import absolute_import, division, print_function
+
+import functools
+import multiprocessing
+
+from .errors import InvalidRAMLError, LoadRAMLError
+from .parser import parse_raml
+from ._helpers import load_file
+
+#: Config of the worker process, set once by :py:func:`_init_worker`
+_config = None
+
+
+def _init_worker(config):
+    global _config
+    _config = config
+
+
+def _parse(raml_file, config=None):
+    """
+    Parses ``raml_file`` with ``config``, or the worker's config.  Returns
+    the error instead if the file can not be loaded or is invalid.
+    """
+    if config is None:
+        config = _config
+    try:
+        return parse_raml(load_file(raml_file), config)
+    except (InvalidRAMLError, LoadRAMLError) as e:
+        return e
+
+
+def _validate(raml_file, config=None):
+    """Like :py:func:`_parse`, but only returns errors."""
+    result = _parse(raml_file, config)
+    if isinstance(result, Exception):
+        return result
+    return None
+
+
+def _pair(func, raml_file, config=None):
+    return raml_file, func(raml_file, config)
+
+
+def _run(func, raml_files, config, workers, ordered):
+    if workers == 1:
+        for raml_file in raml_files:
+            yield func(raml_file, config)
+        return
+
+    pool = multiprocessing.Pool(workers, _init_worker, (config,))
+    try:
+        results = pool.imap if ordered else pool.imap_unordered
+        for result in results(func, raml_files):
+            yield result
+        pool.close()
+    finally:
+        # also stops the workers if the caller stops iterating early
+        pool.terminate()
+        pool.join()
+
+
+def imap(func, raml_files, config, workers=None):
+    """
+    Yields ``func(raml_file)`` for each of ``raml_files`` in order, run
+    in a pool of ``workers`` processes that share ``config``.  A single
+    worker runs in the current process.
+    """
+    return _run(func, raml_files, config, workers, True)
+
+
+def imap_unordered(func, raml_files, config, workers=None):
+    """
+    Like :py:func:`imap`, but yields ``(raml_file, func(raml_file))``
+    pairs as soon as each one is done, in any order.
+    """
+    return _run(functools.partial(_pair, func), raml_files, config,
+                workers, False)
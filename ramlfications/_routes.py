@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2015 Spotify AB
+
+from __future__ import absolute_import, division, print_function
+
+import re
+
+from six.moves.urllib.parse import unquote, urlsplit
+
+_TEMPLATE = re.compile(r"\{(.*?)\}")
+
+#: Regexes of URI parameter values by primitive type
+_TYPE_PATTERNS = {
+    "integer": r"-?[0-9]+",
+    "number": r"-?[0-9]+(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?",
+    "boolean": r"true|false",
+}
+
+
+def _param_pattern(param, default):
+    """Regex of the values of the URI parameter ``param``."""
+    if param is None:
+        return default
+    if param.enum:
+        return "|".join(re.escape(str(e)) for e in param.enum)
+    if param.pattern:
+        pattern = param.pattern
+        if pattern.startswith("^"):
+            pattern = pattern[1:]
+        if pattern.endswith("$") and not pattern.endswith("\\$"):
+            pattern = pattern[:-1]
+        return pattern
+    return _TYPE_PATTERNS.get(param.type, default)
+
+
+def _compile(template, params, version, default, end=r"\Z"):
+    """
+    Compiles the URI ``template`` into a regex whose groups ``p0``,
+    ``p1``, ... capture the values of the returned parameter names.
+
+    :param dict params: ``URIParameter`` s by name, to constrain values
+    :param str version: API version, to fill in an undeclared ``{version}``
+    :param str default: Regex of values of parameters without constraints
+    """
+    names = []
+    regex = []
+    pos = 0
+    for m in _TEMPLATE.finditer(template):
+        regex.append(re.escape(template[pos:m.start()]))
+        pos = m.end()
+        name = m.group(1)
+        if name == "version" and name not in params and version:
+            regex.append(re.escape(str(version)))
+            continue
+        pattern = _param_pattern(params.get(name), default)
+        group = "(?P<p{0}>{1})".format(len(names), pattern)
+        try:
+            # checked as part of the regex, e.g. for inline flags
+            re.compile(group)
+        except re.error:  # not our job to validate it here
+            group = "(?P<p{0}>{1})".format(len(names), default)
+        regex.append(group)
+        names.append(name)
+    regex.append(re.escape(template[pos:]))
+    try:
+        return re.compile("".join(regex) + end), names
+    except re.error:  # e.g. group names of the patterns clash
+        if all(p is None for p in params.values()):
+            raise
+        return _compile(template, {}, version, default, end)
+
+
+def _values(match, names):
+    return [(n, unquote(match.group("p{0}".format(i))))
+            for i, n in enumerate(names)]
+
+
+class _Segment(object):
+    """A path segment in the route trie."""
+    __slots__ = ("literals", "templates", "patterns", "methods")
+
+    def __init__(self):
+        self.literals = {}
+        self.templates = {}
+        self.patterns = []
+        self.methods = {}
+
+    def child(self, part, params, version):
+        if "{" not in part:
+            return self.literals.setdefault(part, _Segment())
+        child = self.templates.get(part)
+        if child is None:
+            child = self.templates[part] = _Segment()
+            regex, names = _compile(part, params, version, "[^/]+")
+            self.patterns.append((regex, names, child))
+        return child
+
+
+class Router(object):
+    """
+    Route index of a :py:class:`.raml.RootNode`: a trie of the path
+    segments of its resources, with literal segments looked up by value
+    before templated ones are tried in definition order.  Matching time
+    depends on the depth of the path, not on the number of resources.
+    """
+    def __init__(self, root):
+        self.trie = _Segment()
+        version = root.version
+        for node in root.resources or []:
+            params = dict((p.name, p) for p in node.uri_params or [])
+            segment = self.trie
+            for part in _split(node.path):
+                segment = segment.child(part, params, version)
+            segment.methods.setdefault(_method(node.method), node)
+
+        self.base = None
+        if root.base_uri:
+            base = urlsplit(root.base_uri)
+            template = base.netloc + base.path.rstrip("/")
+            params = dict((p.name, p) for p in root.base_uri_params or [])
+            self.base = _compile(template, params, version, "[^/]+",
+                                 end="(?=/|$)")
+
+    def match(self, method, url):
+        """
+        Returns the ``ResourceNode`` of ``method`` & ``url`` and a
+        ``dict`` of the URI (and base URI) parameter values in ``url``,
+        or ``None``.
+        """
+        url = urlsplit(url)
+        path = url.path
+        values = []
+        if url.netloc:
+            if self.base is None:
+                return None
+            regex, names = self.base
+            m = regex.match(url.netloc + path)
+            if m is None:
+                return None
+            values = _values(m, names)
+            path = (url.netloc + path)[m.end():]
+        found = _match(self.trie, _split(path), 0, _method(method))
+        if found is None:
+            return None
+        node, path_values = found
+        return node, dict(values + path_values)
+
+
+def _split(path):
+    path = path.strip("/")
+    return path.split("/") if path else []
+
+
+def _method(method):
+    return method.lower() if method else method
+
+
+def _match(segment, parts, i, method):
+    if i == len(parts):
+        node = segment.methods.get(method)
+        return (node, []) if node is not None else None
+
+    part = parts[i]
+    child = segment.literals.get(part)
+    if child is not None:
+        found = _match(child, parts, i + 1, method)
+        if found is not None:
+            return found
+    for regex, names, child in segment.patterns:
+        m = regex.match(part)
+        if m is None:
+            continue
+        found = _match(child, parts, i + 1, method)
+        if found is not None:
+            return found[0], _values(m, names) + found[1]
+    return None
+
+
+def router(root):
+    """
+    Returns the :py:class:`Router` of ``root``, compiled on first use and
+    again once ``root.resources`` is replaced.
+    """
+    cached = root.__dict__.get("_router")
+    if cached is None or cached[0] is not root.resources:
+        cached = root.__dict__["_router"] = (root.resources, Router(root))
+    return cached[1]
@@ -38,6 +38,12 @@ AUTH_SCHEMES = [
 HTTP_RESP_CODES = list(iterkeys(httpserver.BaseHTTPRequestHandler.responses))
 PRIM_TYPES = ["string", "integer", "number", "boolean", "date", "file"]
 
+#: ``True`` if the parameter and node classes are defined with
+#: ``__slots__``, so that their instances carry no ``__dict__``; set the
+#: ``RAMLFICATIONS_SLOTS`` environment variable to ``1`` before importing
+#: ``ramlfications`` to turn it on.  Needs ``attrs>=16.0.0``.
+SLOTS = os.environ.get("RAMLFICATIONS_SLOTS", "0") not in ("", "0")
+
 CONFIG_VARS = [
     "auth_schemes", "resp_codes", "media_types", "protocols", "http_methods",
     "prim_types", "raml_versions"
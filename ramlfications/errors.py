@@ -40,11 +40,23 @@ class InvalidParameterError(BaseRAMLError):
         super(InvalidParameterError, self).__init__(message)
         self.parameter = parameter
 
+    def __reduce__(self):
+        return (self.__class__, (str(self), self.parameter))
+
 
 class InvalidSecuritySchemeError(BaseRAMLError):
     pass
 
 
+class InvalidPayloadError(BaseRAMLError):
+    def __init__(self, message, path):
+        super(InvalidPayloadError, self).__init__(message)
+        self.path = path
+
+    def __reduce__(self):
+        return (self.__class__, (str(self), self.path))
+
+
 #####
 # Loader Exceptions
 #####
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2015 Spotify AB
+"""
+JSON export of a parsed API.
+
+Each node is written once.  References from a node to other nodes
+(``parent``, ``resource_type``, ``traits``, ``security_schemes``) are
+replaced by the index of that node in the respective list of the root,
+and ``root`` itself is left out.  Attributes that were not parsed (see
+the ``fields`` of :py:func:`ramlfications.parse`) are left out, too.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+
+import attr
+from six import integer_types, iteritems, string_types
+
+from .parameters import Content, Documentation
+
+
+__all__ = ["to_dict", "dump", "iterencode"]
+
+#: Attributes never exported: back-references, parser state & settings
+SKIP = frozenset(["root", "group", "raml_obj", "config", "errors",
+                  "resource_groups"])
+
+#: Attributes of nodes that refer to other nodes, by the list of the root
+#: they refer into
+REFERENCES = {
+    "parent": "resources",
+    "resource_type": "resource_types",
+    "traits": "traits",
+    "security_schemes": "security_schemes",
+}
+
+#: Lists of nodes of the root, in the order they are written
+NODE_LISTS = ["resource_types", "traits", "security_schemes", "resources"]
+
+_SCALARS = string_types + integer_types + (float, bool, type(None))
+
+_fields = {}
+
+
+def _field_names(cls, raw):
+    key = cls, raw
+    names = _fields.get(key)
+    if names is None:
+        names = _fields[key] = [
+            a.name for a in attr.fields(cls)
+            if a.name not in SKIP and not a.name.startswith("_") and
+            (raw or a.name != "raw")
+        ]
+    return names
+
+
+def _plain(value, raw):
+    """Converts ``value`` into JSON-serializable data."""
+    if isinstance(value, _SCALARS):
+        return value
+    # a ``jsonref`` reference is written as such, also keeping recursive
+    # schemas finite
+    ref = getattr(value, "__reference__", None)
+    if isinstance(ref, dict):
+        return dict(ref)
+    value = getattr(value, "__subject__", value)  # e.g. ``LazyInclude``
+    if isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, dict):
+        return dict((k if isinstance(k, string_types) else str(k),
+                     _plain(v, raw)) for k, v in iteritems(value))
+    if isinstance(value, (list, tuple)):
+        return [_plain(v, raw) for v in value]
+    if isinstance(value, Content):
+        return _plain(value.raw, raw)
+    if isinstance(value, Documentation):
+        return {"title": _plain(value.title.raw, raw),
+                "content": _plain(value.content.raw, raw)}
+    if attr.has(type(value)):
+        return dict((n, _plain(getattr(value, n), raw))
+                    for n in _field_names(type(value), raw))
+    return str(value)
+
+
+def _ids(root):
+    """Index of each node in its list of the root, by list & node id."""
+    return dict((name, dict((id(n), i) for i, n in
+                            enumerate(getattr(root, name) or [])))
+                for name in NODE_LISTS)
+
+
+def _node(node, ids, raw):
+    from .raml import UNLOADED  # ``raml`` imports this module
+
+    data = {}
+    for name in _field_names(type(node), raw):
+        value = getattr(node, name)
+        if value is UNLOADED:
+            continue
+        target = REFERENCES.get(name)
+        if target is None or value is None:
+            data[name] = _plain(value, raw)
+        elif isinstance(value, list):
+            data[name] = [ids[target].get(id(v)) for v in value]
+        else:
+            data[name] = ids[target].get(id(value))
+    return data
+
+
+def iterencode(root, raw=False):
+    """
+    Yields the JSON document of ``root`` in chunks, one per node, so
+    that it is never held in memory as a whole.
+
+    :param RootNode root: The parsed API
+    :param bool raw: Include the ``raw`` data of each object, too.
+    """
+    ids = _ids(root)
+    encode = json.JSONEncoder(sort_keys=False).encode
+    sep = "{"
+    for name in _field_names(type(root), raw):
+        if name in NODE_LISTS:
+            continue
+        yield '{0}{1}: {2}'.format(sep, encode(name),
+                                   encode(_plain(getattr(root, name), raw)))
+        sep = ",\n"
+    for name in NODE_LISTS:
+        nodes = getattr(root, name)
+        if nodes is None:
+            yield '{0}{1}: null'.format(sep, encode(name))
+            sep = ",\n"
+            continue
+        yield '{0}{1}: ['.format(sep, encode(name))
+        item_sep = "\n"
+        for node in nodes:
+            yield item_sep + encode(_node(node, ids, raw))
+            item_sep = ",\n"
+        yield "\n]"
+        sep = ",\n"
+    yield "}\n"
+
+
+def dump(root, fp, raw=False):
+    """
+    Writes the JSON document of ``root`` to the file object ``fp``, one
+    node at a time.
+
+    :param RootNode root: The parsed API
+    :param fp: Text file object to write to
+    :param bool raw: Include the ``raw`` data of each object, too.
+    """
+    write = fp.write
+    for chunk in iterencode(root, raw):
+        write(chunk)
+
+
+def to_dict(root, raw=False):
+    """
+    Returns the JSON-serializable ``dict`` of ``root``, as written by
+    :py:func:`dump`.
+
+    :param RootNode root: The parsed API
+    :param bool raw: Include the ``raw`` data of each object, too.
+    """
+    ids = _ids(root)
+    data = {}
+    for name in _field_names(type(root), raw):
+        value = getattr(root, name)
+        if name not in NODE_LISTS:
+            data[name] = _plain(value, raw)
+        elif value is not None:
+            data[name] = [_node(n, ids, raw) for n in value]
+        else:
+            data[name] = None
+    return data
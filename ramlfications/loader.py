@@ -6,21 +6,326 @@ try:
 except ImportError:  # pragma: no cover
     from ordereddict import OrderedDict
 
+from collections import namedtuple
+import io
+import json
+import operator
+from multiprocessing.pool import ThreadPool
 import os
+import threading
 
 import jsonref
+from six import string_types
+from six.moves.urllib.parse import urldefrag, urljoin, urlparse
+from six.moves.urllib.request import url2pathname
 import yaml
 
 from .errors import LoadRAMLError
 
 
-__all__ = ["RAMLLoader"]
+__all__ = ["RAMLLoader", "IncludeCache", "INCLUDE_CACHE", "LazyInclude"]
+
+#: ``True`` if PyYAML was built against libyaml
+LIBYAML = getattr(yaml, "__with_libyaml__", False)
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_CacheEntry = namedtuple("_CacheEntry", ["value", "deps"])
+
+YAML_EXT = [".yaml", ".yml", ".raml"]
+
+#: Extensions of ``!include`` d files that may be loaded lazily: JSON
+#: schemas & examples, which the parser only reads through
+#: :py:func:`.utils.load_schema`
+LAZY_EXT = [".json"]
+
+
+def _file_stamp(file_name):
+    """
+    Returns the cache key of a file: its absolute path, modification
+    time and size.
+
+    :raises OSError: if the file can not be ``stat``-ed
+    """
+    file_name = os.path.abspath(file_name)
+    stat = os.stat(file_name)
+    mtime = getattr(stat, "st_mtime_ns", stat.st_mtime)
+    return file_name, mtime, stat.st_size
+
+
+def _iter_refs(data):
+    if isinstance(data, dict):
+        ref = data.get("$ref")
+        if isinstance(ref, string_types):
+            yield ref
+        for value in data.values():
+            for r in _iter_refs(value):
+                yield r
+    elif isinstance(data, list):
+        for value in data:
+            for r in _iter_refs(value):
+                yield r
+
+
+def _json_ref_files(json_file, seen=None, content=None):
+    """
+    Returns the absolute paths of the local files a JSON file reaches
+    through ``$ref`` s, or ``None`` if a reference can not be tracked
+    (e.g. a remote HTTP reference).
+    """
+    if seen is None:
+        seen = []
+    try:
+        if content is None:
+            with open(json_file, "r") as f:
+                content = f.read()
+        data = json.loads(content)
+    except (IOError, ValueError):
+        return seen
+    # mirrors the base URI given to jsonref in ``RAMLLoader._parse_json``
+    base_uri = "file://" + os.path.dirname(os.path.abspath(json_file)) + "/"
+    for ref in _iter_refs(data):
+        uri = urldefrag(urljoin(base_uri, ref))[0]
+        if uri in ("", base_uri):
+            continue
+        parsed = urlparse(uri)
+        if parsed.scheme != "file":
+            return None
+        path = os.path.abspath(url2pathname(parsed.path))
+        if path in seen:
+            continue
+        seen.append(path)
+        if _json_ref_files(path, seen) is None:
+            return None
+    return seen
+
+
+def _is_fresh(stamp):
+    try:
+        return _file_stamp(stamp[0]) == stamp
+    except OSError:
+        return False
+
+
+class IncludeCache(object):
+    """
+    Thread-safe LRU cache of loaded ``!include`` files, keyed by the
+    included file's absolute path, modification time and size.
+
+    An entry also records every file it pulled in through nested
+    ``!include`` s, and is only served while all of them are unchanged.
+
+    .. note::
+        Cached values are shared between every RAML file that includes
+        them and must be treated as read-only, so the cache is only used
+        where the loaded data is not handed out, e.g. by
+        :py:func:`ramlfications.parse`.
+
+    :param int maxsize: Maximum number of cached files.
+    """
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, stamp):
+        """
+        Returns the cached ``_CacheEntry`` for ``stamp``, or ``None``.
+        """
+        with self._lock:
+            entry = self._entries.get(stamp)
+            if entry is not None and all(_is_fresh(d) for d in entry.deps):
+                # move to the end to mark as most recently used
+                del self._entries[stamp]
+                self._entries[stamp] = entry
+                self.hits += 1
+                return entry
+            if entry is not None:
+                del self._entries[stamp]
+            self.misses += 1
+            return None
+
+    def __contains__(self, stamp):
+        """
+        ``True`` if a fresh entry for ``stamp`` is cached.  Does not \
+        count as a hit or a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(stamp)
+        return entry is not None and all(_is_fresh(d) for d in entry.deps)
+
+    def set(self, stamp, value, deps=()):
+        """Cache ``value`` loaded from the file identified by ``stamp``."""
+        entry = _CacheEntry(value, tuple(deps))
+        if not self.maxsize:
+            return entry
+        with self._lock:
+            self._entries.pop(stamp, None)
+            self._entries[stamp] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        """Empty the cache and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        :returns: ``CacheInfo(hits, misses, maxsize, currsize)``
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize,
+                             len(self._entries))
+
+
+#: Process-wide include cache used by :py:func:`ramlfications.parse`
+INCLUDE_CACHE = IncludeCache()
+
+
+def _subject(proxy):
+    try:
+        return object.__getattribute__(proxy, "cache")
+    except AttributeError:
+        value = object.__getattribute__(proxy, "_load")()
+        object.__setattr__(proxy, "cache", value)
+        return value
+
+
+#: Attributes of a :py:class:`LazyInclude` itself rather than its value
+_OWN = frozenset(["__subject__", "__class__", "loaded", "_load", "cache"])
+
+
+class LazyInclude(object):
+    """
+    Transparent proxy for an ``!include`` d value: the file is read and
+    loaded on first access, and the result is kept for later accesses.
+
+    Until then, ``isinstance`` checks against anything but
+    :py:class:`LazyInclude` are ``False`` rather than loading the file.
+
+    :param load: Callable returning the value
+    """
+    __slots__ = ("_load", "cache")
+
+    def __init__(self, load):
+        object.__setattr__(self, "_load", load)
+
+    @property
+    def __subject__(self):
+        """The loaded value."""
+        return _subject(self)
+
+    @property
+    def __class__(self):
+        try:
+            return type(object.__getattribute__(self, "cache"))
+        except AttributeError:
+            return LazyInclude
+
+    @property
+    def loaded(self):
+        """``True`` once the included file has been loaded."""
+        return hasattr(self, "cache")
+
+    def __getattribute__(self, name):
+        if name in _OWN:
+            return object.__getattribute__(self, name)
+        return getattr(_subject(self), name)
+
+    def __setattr__(self, name, value):
+        setattr(_subject(self), name, value)
+
+    def __delattr__(self, name):
+        delattr(_subject(self), name)
+
+
+def _forward(func, reflected=False):
+    # special methods are looked up on the type, bypassing
+    # ``__getattribute__``, so each one is forwarded explicitly
+    if reflected:
+        return lambda self, other: func(other, _subject(self))
+    return lambda self, *args, **kwargs: func(_subject(self), *args,
+                                              **kwargs)
+
+
+for _name, _func in [
+        ("getitem", operator.getitem), ("setitem", operator.setitem),
+        ("delitem", operator.delitem), ("contains", operator.contains),
+        ("len", len), ("iter", iter), ("reversed", reversed),
+        ("hash", hash), ("str", str), ("repr", repr),
+        ("bool", bool), ("nonzero", bool),
+        ("eq", operator.eq), ("ne", operator.ne), ("lt", operator.lt),
+        ("le", operator.le), ("gt", operator.gt), ("ge", operator.ge),
+        ("add", operator.add), ("mul", operator.mul),
+        ("mod", operator.mod), ("call", lambda f, *a, **kw: f(*a, **kw))]:
+    setattr(LazyInclude, "__{0}__".format(_name), _forward(_func))
+for _name, _func in [("radd", operator.add), ("rmul", operator.mul),
+                     ("rmod", operator.mod)]:
+    setattr(LazyInclude, "__{0}__".format(_name), _forward(_func, True))
+del _name, _func
 
 
 class RAMLLoader(object):
     """
     Extends YAML loader to load RAML files with ``!include`` tags.
+
+    :param bool libyaml: ``True`` to force the libyaml-backed \
+        ``yaml.CSafeLoader``, ``False`` to force the pure-Python \
+        ``yaml.SafeLoader``.  Defaults to ``None``, which uses libyaml \
+        when available.
+    :param IncludeCache include_cache: Cache of loaded ``!include`` \
+        files, e.g. the process-wide :py:data:`INCLUDE_CACHE`.  Its \
+        values are shared by every load, so the loaded data must not be \
+        changed.  Defaults to ``None``, which reads included files from \
+        disk every time.
+    :param int prefetch: Number of threads to read ``!include`` d files \
+        with.  When set, the document is scanned for ``!include`` tags \
+        (transitively) and all included files are read concurrently \
+        before the data is constructed.  Defaults to ``None``, which \
+        reads each included file when it is reached.
+    :param bool lazy: If ``True``, JSON ``!include`` s (schemas and \
+        examples) are returned as :py:class:`LazyInclude` proxies that \
+        are only read and loaded on first access.  Errors reading such a \
+        file are raised on first access.  All other included files, e.g. \
+        YAML/RAML or Markdown documentation, are still loaded right away.
+    :raises LoadRAMLError: If libyaml is forced but PyYAML was not \
+        built with it.
     """
+    def __init__(self, libyaml=None, include_cache=None,
+                 prefetch=None, lazy=False):
+        if libyaml is None:
+            libyaml = LIBYAML
+        if libyaml and not LIBYAML:
+            msg = "PyYAML was not built with libyaml support."
+            raise LoadRAMLError(msg)
+        self.libyaml = libyaml
+        self.include_cache = include_cache
+        self.prefetch = prefetch
+        self.lazy = lazy
+        #: absolute paths of every file pulled in by the last :py:meth:`load`
+        self.includes = []
+        #: ``False`` if the last :py:meth:`load` pulled in something whose
+        #: changes can not be tracked (e.g. a remote JSON ``$ref``)
+        self.cacheable = True
+        # stack of files pulled in by the includes currently being loaded
+        self._include_deps = []
+        # contents & composed YAML nodes of prefetched includes
+        self._prefetched = {}
+        self._prefetched_nodes = {}
+
+    @property
+    def yaml_loader(self):
+        """The base ``yaml`` loader class used to scan & parse RAML."""
+        if self.libyaml:
+            return yaml.CSafeLoader
+        return yaml.SafeLoader
+
     def _yaml_include(self, loader, node):
         """
         Adds the ability to follow ``!include`` directives within
@@ -28,20 +333,91 @@ class RAMLLoader(object):
         """
         # Get the path out of the yaml file
         file_name = os.path.join(os.path.dirname(loader.name), node.value)
+        self.includes.append(os.path.abspath(file_name))
+
+        if self._is_lazy(file_name):
+            # the proxy is loaded later, so a file including it can't be
+            # cached as is
+            self._add_deps([None])
+            return LazyInclude(lambda: self._include(file_name))
+        return self._include(file_name)
+
+    def _is_lazy(self, file_name):
+        return self.lazy and os.path.splitext(file_name)[1] in LAZY_EXT
+
+    def _include(self, file_name):
+        """Loads an included file, going through the include cache."""
+        if self.include_cache is None:
+            return self._load_include(file_name)
+        try:
+            stamp = _file_stamp(file_name)
+        except OSError:
+            # let _load_include raise the usual IOError
+            return self._load_include(file_name)
+
+        entry = self.include_cache.get(stamp)
+        if entry is None:
+            self._include_deps.append([])
+            try:
+                value = self._load_include(file_name)
+            finally:
+                deps = self._include_deps.pop()
+            if None in deps:
+                # depends on something we can not check for changes
+                entry = _CacheEntry(value, deps)
+            else:
+                entry = self.include_cache.set(stamp, value, deps)
+        else:
+            # nested includes are not visited again on a cache hit
+            self.includes.extend(d[0] for d in entry.deps)
+        self._add_deps([stamp] + list(entry.deps))
+        return entry.value
+
+    def _add_deps(self, stamps):
+        """Records ``stamps`` as dependencies of the include being loaded."""
+        if self._include_deps:
+            self._include_deps[-1].extend(stamps)
+
+    def _load_include(self, file_name):
+        """Reads & loads an included file."""
         file_ext = os.path.splitext(file_name)[1]
         parsable_ext = [".yaml", ".yml", ".raml", ".json"]
+        file_key = os.path.abspath(file_name)
+        content = self._prefetched.get(file_key)
 
         if file_ext not in parsable_ext:
+            if content is not None:
+                return content
             with open(file_name) as inputfile:
                 return inputfile.read()
 
         if file_ext == ".json":
-            return self._parse_json(file_name, os.path.dirname(file_name))
+            schema = self._parse_json(file_name, os.path.dirname(file_name),
+                                      content)
+            self._track_json_refs(file_name, content)
+            return schema
 
+        if file_key in self._prefetched_nodes:
+            return self._construct(self._prefetched_nodes[file_key],
+                                   file_name)
         with open(file_name) as inputfile:
             return yaml.load(inputfile, self._ordered_loader)
 
-    def _parse_json(self, jsonfile, base_path):
+    def _track_json_refs(self, json_file, content=None):
+        """Records the local files a JSON file reaches through ``$ref`` s."""
+        ref_files = _json_ref_files(json_file, content=content)
+        try:
+            stamps = [_file_stamp(f) for f in ref_files or []]
+        except OSError:
+            ref_files = None
+        if ref_files is None:
+            self.cacheable = False
+            self._add_deps([None])
+            return
+        self.includes.extend(ref_files)
+        self._add_deps(stamps)
+
+    def _parse_json(self, jsonfile, base_path, content=None):
         """
         Parses JSON as well as resolves any `$ref`s, including references to
         local files and remote (HTTP/S) files.
@@ -51,16 +427,109 @@ class RAMLLoader(object):
             base_path = base_path + "/"
         base_path = "file://" + base_path
 
+        if content is not None:
+            return jsonref.loads(content, base_uri=base_path,
+                                 jsonschema=True)
         with open(jsonfile, "r") as f:
             schema = jsonref.load(f, base_uri=base_path, jsonschema=True)
         return schema
 
+    def _construct(self, node, name):
+        """Constructs data from a composed YAML ``node`` of file ``name``."""
+        if node is None:
+            return None
+        loader = self._ordered_loader(io.StringIO(u""))
+        loader.name = name
+        try:
+            return loader.construct_document(node)
+        finally:
+            loader.dispose()
+
+    def _find_includes(self, node, name):
+        """
+        Returns the absolute paths of the files included directly by a
+        composed YAML ``node`` of the file ``name``.
+        """
+        includes = []
+        seen = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node is None or id(node) in seen:
+                continue
+            seen.add(id(node))
+            if isinstance(node, yaml.ScalarNode):
+                if node.tag == "!include":
+                    file_name = os.path.join(os.path.dirname(name),
+                                             node.value)
+                    includes.append(os.path.abspath(file_name))
+            elif isinstance(node, yaml.SequenceNode):
+                stack.extend(reversed(node.value))
+            elif isinstance(node, yaml.MappingNode):
+                for key, value in reversed(node.value):
+                    stack.extend([value, key])
+        return includes
+
+    def _fetch(self, file_name):
+        """Reads an included file; run on the prefetch thread pool."""
+        try:
+            if self.include_cache is not None:
+                if _file_stamp(file_name) in self.include_cache:
+                    return file_name, None
+            with open(file_name) as inputfile:
+                return file_name, inputfile.read()
+        except (IOError, OSError):
+            # the error is raised when the include is loaded
+            return file_name, None
+
+    def _prefetch(self, node, name):
+        """
+        Reads every file ``node`` includes, transitively, on a thread pool.
+        """
+        pending = self._find_includes(node, name)
+        pending = [i for i in pending if not self._is_lazy(i)]
+        seen = set(pending)
+        pool = ThreadPool(self.prefetch)
+        try:
+            while pending:
+                fetched = pool.map(self._fetch, pending)
+                pending = []
+                for file_name, content in fetched:
+                    if content is None:
+                        continue
+                    self._prefetched[file_name] = content
+                    if os.path.splitext(file_name)[1] not in YAML_EXT:
+                        continue
+                    loader = self._ordered_loader(content)
+                    try:
+                        child = loader.get_single_node()
+                    except yaml.YAMLError:
+                        # the error is raised when the include is loaded
+                        continue
+                    finally:
+                        loader.dispose()
+                    self._prefetched_nodes[file_name] = child
+                    for include in self._find_includes(child, file_name):
+                        if include not in seen and not self._is_lazy(include):
+                            seen.add(include)
+                            pending.append(include)
+        finally:
+            pool.close()
+            pool.join()
+
     def _ordered_load(self, stream, loader=yaml.SafeLoader):
         """
         Preserves order set in RAML file.
         """
         class OrderedLoader(loader):
-            pass
+            def __init__(self, stream):
+                # libyaml's parser does not keep track of the stream name,
+                # which ``_yaml_include`` needs to resolve relative paths
+                name = getattr(stream, "name", None)
+                super(OrderedLoader, self).__init__(stream)
+                if name is None:
+                    name = getattr(self, "name", "<unicode string>")
+                self.name = name
 
         def construct_mapping(loader, node):
             loader.flatten_mapping(node)
@@ -71,7 +540,20 @@ class RAMLLoader(object):
 
         self._ordered_loader = OrderedLoader
 
-        return yaml.load(stream, OrderedLoader)
+        if not self.prefetch:
+            return yaml.load(stream, OrderedLoader)
+
+        loader = OrderedLoader(stream)
+        try:
+            node = loader.get_single_node()
+            if node is None:
+                return None
+            self._prefetch(node, loader.name)
+            return loader.construct_document(node)
+        finally:
+            loader.dispose()
+            self._prefetched = {}
+            self._prefetched_nodes = {}
 
     def load(self, raml):
         """
@@ -84,9 +566,10 @@ class RAMLLoader(object):
         :rtype: ``dict``
 
         """
-
+        self.includes = []
+        self.cacheable = True
         try:
-            return self._ordered_load(raml, yaml.SafeLoader)
+            return self._ordered_load(raml, self.yaml_loader)
         except yaml.parser.ParserError as e:
             msg = "Error parsing RAML: {0}".format(e)
             raise LoadRAMLError(msg)
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2015 Spotify AB
+"""
+A mock HTTP server for a parsed API, answering each request with the
+examples of the matching :py:class:`.raml.ResourceNode` 's responses.
+
+Requires ``asyncio`` (Python 3.4+).
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import asyncio
+from collections import deque
+import json
+import random
+
+from six import string_types
+from six.moves.http_client import responses as REASONS
+from six.moves.urllib.parse import urlsplit
+import xmltodict
+
+from ._routes import _compile, router
+
+
+__all__ = ["MockServer", "serve"]
+
+#: Request header to ask for a response code other than the default one
+STATUS_HEADER = b"x-mock-status"
+
+#: Largest request head (request line & headers) accepted, in bytes
+MAX_HEAD = 64 * 1024
+
+#: The event loop running the current callback
+_running_loop = getattr(asyncio, "get_running_loop",
+                        asyncio.get_event_loop)  # NOCOV, Python < 3.7
+
+
+def _example(body):
+    """Bytes of the example of ``body``, as written in the RAML file."""
+    raw = body.raw.get("example") if isinstance(body.raw, dict) else None
+    if isinstance(raw, string_types):
+        return raw.encode("utf-8")
+    example = body.example
+    if example is None:
+        return b""
+    if isinstance(example, string_types):
+        return example.encode("utf-8")
+    if "xml" in body.mime_type:
+        try:
+            return xmltodict.unparse(example).encode("utf-8")
+        except Exception:  # not a single root element; fall back to JSON
+            pass
+    return json.dumps(example).encode("utf-8")
+
+
+def _header_value(header):
+    for value in (header.example, header.default):
+        if value is not None:
+            return str(value).lower() if isinstance(value, bool) \
+                else str(value)
+    return None
+
+
+def _message(code, mime_type=None, body=b"", headers=()):
+    """Serializes a response; returns its head & its body."""
+    lines = ["HTTP/1.1 {0} {1}".format(code, REASONS.get(code, "Unknown"))]
+    for name, value in headers:
+        lines.append("{0}: {1}".format(name, value))
+    if mime_type is not None:
+        lines.append("Content-Type: {0}".format(mime_type))
+    lines.append("Content-Length: {0}".format(len(body)))
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head, body
+
+
+def _base_path(root):
+    """
+    Regex of the path of the base URI of ``root`` at the start of a
+    request target, or ``None`` if it has no path.
+    """
+    path = urlsplit(root.base_uri or "").path.rstrip("/")
+    if not path:
+        return None
+    params = dict((p.name, p) for p in root.base_uri_params or [])
+    return _compile(path, params, root.version, "[^/?#]+",
+                    end=r"(?=[/?#]|\Z)")[0]
+
+
+def _chunked_length(data, start):
+    """
+    Length of the chunked body at ``start`` of ``data``, up to the end of
+    its trailer, or ``None`` if ``data`` does not hold all of it yet.
+
+    :raises ValueError: If the body is not validly chunked
+    """
+    pos = start
+    while True:
+        end = data.find(b"\r\n", pos)
+        if end < 0:
+            return None
+        size = int(data[pos:end].split(b";", 1)[0], 16)
+        pos = end + 2
+        if size == 0:
+            break
+        pos += size + 2
+        if len(data) < pos:
+            return None
+        if data[pos - 2:pos] != b"\r\n":
+            raise ValueError("chunk of the wrong size")
+    # the trailer fields, up to an empty line
+    while True:
+        end = data.find(b"\r\n", pos)
+        if end < 0:
+            return None
+        if end == pos:
+            return end + 2 - start
+        pos = end + 2
+
+
+def _default_code(codes):
+    success = [c for c in codes if 200 <= c < 300]
+    return min(success or codes)
+
+
+class _Responses(object):
+    """
+    The serialized responses of a ``ResourceNode``, by code and by media
+    type.
+    """
+    __slots__ = ("default", "by_code")
+
+    def __init__(self, node):
+        self.by_code = {}
+        for response in node.responses or []:
+            headers = [(h.name, _header_value(h)) for h in
+                       response.headers or []]
+            headers = [(n, v) for n, v in headers if v is not None]
+            messages = [
+                (b.mime_type.lower().encode("latin-1"),
+                 _message(response.code, b.mime_type, _example(b), headers))
+                for b in response.body or []
+            ] or [(None, _message(response.code, headers=headers))]
+            self.by_code.setdefault(response.code, messages)
+        if self.by_code:
+            self.default = self.by_code[_default_code(list(self.by_code))]
+        else:
+            self.default = [(None, _message(200))]
+
+    def get(self, code=None, accept=None):
+        messages = self.default
+        if code is not None:
+            messages = self.by_code.get(code, messages)
+        if accept and len(messages) > 1:
+            for mime_type, message in messages:
+                if mime_type in accept:
+                    return message
+        return messages[0][1]
+
+
+_NOT_FOUND = _message(404, "text/plain", b"Not Found")
+_BAD_REQUEST = _message(400, "text/plain", b"Bad Request")
+
+
+class MockServer(object):
+    """
+    Serves the examples of the responses of each resource of ``root``.
+
+    Each request is routed with :py:meth:`.raml.RootNode.match`, after
+    removing the path of the base URI (e.g. ``/v1``) it starts with; the
+    default response is that of the lowest 2xx code, and its body the
+    first one declared, or the one of a media type in the ``Accept``
+    header.  The ``X-Mock-Status`` request header selects another code.
+    All responses are serialized once, when the server is created.
+
+    :param RootNode root: The parsed API
+    :param float latency: Seconds to delay each response by
+    :param float jitter: Up to that many seconds are randomly added to \
+        ``latency``
+    """
+    def __init__(self, root, latency=0, jitter=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.router = router(root)
+        self.base_path = _base_path(root)
+        self.responses = dict((id(node), _Responses(node))
+                              for node in root.resources or [])
+
+    def delay(self):
+        """Seconds to delay the next response by."""
+        if self.jitter:
+            return self.latency + random.uniform(0, self.jitter)
+        return self.latency
+
+    def respond(self, method, target, headers):
+        """
+        Returns the head & body of the response to a request.
+
+        :param str method: Request method
+        :param str target: Request target, e.g. ``/v1/users/1?limit=2``
+        :param dict headers: Request headers with lower-cased ``bytes`` \
+            names & values
+        """
+        match = None
+        base = self.base_path and self.base_path.match(target)
+        if base:
+            match = self.router.match(method, target[base.end():])
+        if match is None:
+            match = self.router.match(method, target)
+        if match is None:
+            return _NOT_FOUND
+        responses = self.responses[id(match[0])]
+        code = headers.get(STATUS_HEADER)
+        try:
+            code = int(code) if code is not None else None
+        except ValueError:
+            return _BAD_REQUEST
+        return responses.get(code, headers.get(b"accept"))
+
+    def protocol(self):
+        """Returns a new ``asyncio.Protocol`` for one connection."""
+        return _MockProtocol(self)
+
+    def start(self, host="127.0.0.1", port=8000, loop=None):
+        """
+        Starts listening on ``host`` & ``port`` in ``loop``, or in a new
+        event loop that is set as the current one.
+
+        :returns: The ``asyncio`` server, once it is listening
+        """
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+        return loop.run_until_complete(
+            loop.create_server(self.protocol, host, port))
+
+
+class _MockProtocol(asyncio.Protocol):
+    """
+    HTTP/1.1 connection of a :py:class:`MockServer`; requests may be
+    pipelined, and are answered in order.
+    """
+    def __init__(self, server):
+        self.server = server
+        self.buffer = b""
+        self.transport = None
+        self.loop = None
+        self.queue = deque()  # delayed responses, in order: (due, ...)
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.loop = _running_loop()
+
+    def connection_lost(self, exc):
+        self.transport = None
+        self.queue.clear()
+
+    def data_received(self, data):
+        self.buffer += data
+        while self.transport is not None:
+            end = self.buffer.find(b"\r\n\r\n")
+            if end < 0:
+                if len(self.buffer) > MAX_HEAD:
+                    self.send(_BAD_REQUEST, close=True)
+                return
+            lines = self.buffer[:end].split(b"\r\n")
+            try:
+                method, target, version = lines[0].split(b" ")
+                headers = dict(self.header(line) for line in lines[1:])
+                length = self.body_length(headers, end + 4)
+            except ValueError:
+                self.send(_BAD_REQUEST, close=True)
+                return
+            if length is None or len(self.buffer) < end + 4 + length:
+                return  # wait for the rest of the request body
+            self.buffer = self.buffer[end + 4 + length:]
+
+            method = method.decode("latin-1")
+            head, body = self.server.respond(
+                "get" if method == "HEAD" else method,
+                target.decode("latin-1"), headers)
+            if method == "HEAD":
+                body = b""
+            connection = headers.get(b"connection", b"")
+            close = connection == b"close" or \
+                version == b"HTTP/1.0" and connection != b"keep-alive"
+            self.send((head, body), close)
+            if close:
+                return
+
+    def body_length(self, headers, start):
+        """
+        Length of the body of the request whose head ends at ``start`` of
+        the buffer, or ``None`` if it is chunked & not all received yet.
+        """
+        coding = headers.get(b"transfer-encoding", b"").split(b",")[-1]
+        if coding.strip() == b"chunked":
+            return _chunked_length(self.buffer, start)
+        return int(headers.get(b"content-length", 0))
+
+    @staticmethod
+    def header(line):
+        name, value = line.split(b":", 1)
+        return name.strip().lower(), value.strip().lower()
+
+    def send(self, message, close=False):
+        delay = self.server.delay()
+        if not delay and not self.queue:
+            return self.write(message, close)
+        # responses to pipelined requests must not overtake each other,
+        # so they are queued & written by one timer at a time
+        due = self.loop.time() + delay
+        if self.queue:
+            due = max(due, self.queue[-1][0])
+        self.queue.append((due, message, close))
+        if len(self.queue) == 1:
+            self.loop.call_at(due, self.flush)
+
+    def flush(self):
+        now = self.loop.time()
+        while self.queue and self.queue[0][0] <= now:
+            _, message, close = self.queue.popleft()
+            self.write(message, close)
+        if self.queue:
+            self.loop.call_at(self.queue[0][0], self.flush)
+
+    def write(self, message, close):
+        if self.transport is None:
+            return
+        self.transport.write(message[0] + message[1])
+        if close:
+            self.transport.close()
+            self.transport = None
+
+
+def serve(root, host="127.0.0.1", port=8000, latency=0, jitter=0):
+    """
+    Serves the examples of ``root`` with a :py:class:`MockServer` until
+    interrupted.
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    server = MockServer(root, latency, jitter).start(host, port, loop)
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
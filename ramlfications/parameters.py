@@ -3,9 +3,15 @@
 
 from __future__ import absolute_import, division, print_function
 
+import copy
+
 import attr
 import markdown2 as md
+from six import iteritems
 
+from .config import SLOTS
+from .errors import InvalidPayloadError
+from .schema import validator_for
 from .validate import *  # NOQA
 
 HTTP_METHODS = [
@@ -20,6 +26,43 @@ NAMED_PARAMS = [
 ]
 
 
+def _model(cls):
+    """
+    ``attr.s``, with ``__slots__`` if :py:data:`.config.SLOTS` is set.
+    """
+    if SLOTS:
+        return attr.s(slots=True)(cls)
+    cls = attr.s(cls)
+    # older attrs leave an ``Attribute`` on the class for each field,
+    # which would be found for fields unset on an instance (see
+    # ``ResourceNode.__getattr__``)
+    for a in attr.fields(cls):
+        if isinstance(cls.__dict__.get(a.name), attr.Attribute):
+            delattr(cls, a.name)
+    return cls
+
+
+def _inherit(obj, names, inherited):
+    """
+    Returns ``obj`` with its properties ``names`` that are ``None`` set
+    from the first of the ``inherited`` objects that sets them.  ``obj``
+    may be shared by several nodes, so it is copied instead of changed.
+    """
+    changes = {}
+    for param in inherited:
+        for n in names:
+            if changes.get(n, getattr(obj, n)) is None:
+                value = getattr(param, n, None)
+                if value is not None:
+                    changes[n] = value
+    if not changes:
+        return obj
+    obj = copy.copy(obj)
+    for n, value in iteritems(changes):
+        setattr(obj, n, value)
+    return obj
+
+
 class Content(object):
     """
     Returns documentable content from the RAML file (e.g. Documentation
@@ -48,7 +91,7 @@ class Content(object):
         return self.raw
 
 
-@attr.s
+@_model
 class BaseParameter(object):
     """
     Base parameter with properties defined by the RAML spec's \
@@ -81,8 +124,7 @@ class BaseParameter(object):
         not set.
     """
     name         = attr.ib()
-    raw          = attr.ib(repr=False,
-                           validator=attr.validators.instance_of(dict))
+    raw          = attr.ib(repr=False, validator=dict_type)
     desc         = attr.ib(repr=False)
     display_name = attr.ib(repr=False)
     min_length   = attr.ib(repr=False, validator=string_type_parameter)
@@ -91,8 +133,7 @@ class BaseParameter(object):
     maximum      = attr.ib(repr=False, validator=integer_number_type_parameter)
     example      = attr.ib(repr=False)
     default      = attr.ib(repr=False)
-    config       = attr.ib(repr=False,
-                           validator=attr.validators.instance_of(dict))
+    config       = attr.ib(repr=False, validator=dict_type)
     errors       = attr.ib(repr=False)
     repeat       = attr.ib(repr=False, default=False)
     pattern      = attr.ib(repr=False, default=None,
@@ -108,17 +149,14 @@ class BaseParameter(object):
         return None
 
     def _inherit_type_properties(self, inherited_param):
-        for param in inherited_param:
-            name = getattr(param, "name", getattr(param, "code", None))
-            if name == self.name:
-                for n in NAMED_PARAMS:
-                    attr = getattr(self, n, None)
-                    if attr is None:
-                        attr = getattr(param, n, None)
-                        setattr(self, n, attr)
+        inherited = [
+            p for p in inherited_param
+            if getattr(p, "name", getattr(p, "code", None)) == self.name
+        ]
+        return _inherit(self, NAMED_PARAMS, inherited)
 
 
-@attr.s
+@_model
 class URIParameter(BaseParameter):
     """
     URI parameter with properties defined by the RAML specification's \
@@ -128,7 +166,7 @@ class URIParameter(BaseParameter):
     required = attr.ib(repr=False, default=True)
 
 
-@attr.s
+@_model
 class QueryParameter(BaseParameter):
     """
     Query parameter with properties defined by the RAML specification's \
@@ -138,7 +176,7 @@ class QueryParameter(BaseParameter):
     required = attr.ib(repr=False, default=False)
 
 
-@attr.s
+@_model
 class FormParameter(BaseParameter):
     """
     Form parameter with properties defined by the RAML specification's
@@ -174,7 +212,7 @@ class Documentation(object):
         return "Documentation(title='{0}')".format(self.title)
 
 
-@attr.s
+@_model
 class Header(object):
     """
     Header with properties defined by the RAML spec's 'Named Parameters'
@@ -215,8 +253,7 @@ class Header(object):
     """
     name         = attr.ib(repr=False)
     display_name = attr.ib()
-    raw          = attr.ib(repr=False,
-                           validator=attr.validators.instance_of(dict))
+    raw          = attr.ib(repr=False, validator=dict_type)
     desc         = attr.ib(repr=False)
     example      = attr.ib(repr=False)
     default      = attr.ib(repr=False)
@@ -224,8 +261,7 @@ class Header(object):
     max_length   = attr.ib(repr=False, validator=string_type_parameter)
     minimum      = attr.ib(repr=False, validator=integer_number_type_parameter)
     maximum      = attr.ib(repr=False, validator=integer_number_type_parameter)
-    config       = attr.ib(repr=False,
-                           validator=attr.validators.instance_of(dict))
+    config       = attr.ib(repr=False, validator=dict_type)
     errors       = attr.ib(repr=False)
     type         = attr.ib(repr=False, default="string", validator=header_type)
     enum         = attr.ib(repr=False, default=None,
@@ -243,16 +279,10 @@ class Header(object):
         return None
 
     def _inherit_type_properties(self, inherited_param):
-        params = NAMED_PARAMS + ["method"]
-        for param in inherited_param:
-            for n in params:
-                attr = getattr(self, n, None)
-                if attr is None:
-                    attr = getattr(param, n, None)
-                    setattr(self, n, attr)
+        return _inherit(self, NAMED_PARAMS + ["method"], inherited_param)
 
 
-@attr.s
+@_model
 class Body(object):
     """
     Body of the request/response.
@@ -272,28 +302,51 @@ class Body(object):
         schema and/or example is defined.
     """
     mime_type   = attr.ib(init=True, validator=body_mime_type)
-    raw         = attr.ib(repr=False, init=True,
-                          validator=attr.validators.instance_of(dict))
+    raw         = attr.ib(repr=False, init=True, validator=dict_type)
     schema      = attr.ib(repr=False, validator=body_schema)
     example     = attr.ib(repr=False, validator=body_example)
     form_params = attr.ib(repr=False, validator=body_form)
-    config      = attr.ib(repr=False,
-                          validator=attr.validators.instance_of(dict))
+    config      = attr.ib(repr=False, validator=dict_type)
     errors      = attr.ib(repr=False)
 
+    @property
+    def validator(self):
+        """
+        Compiled validator of ``schema`` (see \
+        :py:func:`.schema.validator_for`), or ``None`` if the body has no \
+        JSON schema.
+        """
+        schema = self.schema
+        if not schema or "json" not in (self.mime_type or ""):
+            return None
+        if not isinstance(schema, dict):  # not JSON, or a lazy include
+            schema = getattr(schema, "__subject__", schema)
+            if not isinstance(schema, dict):
+                return None
+        return validator_for(schema)
+
+    def validate(self, payload):
+        """
+        Validates ``payload`` against ``schema``.
+
+        :param payload: Decoded payload, or a JSON ``str`` / ``bytes``
+        :returns: ``list`` of :py:class:`.errors.InvalidPayloadError` s; \
+            empty if valid or if the body has no JSON schema.
+        """
+        validator = self.validator
+        if validator is None:
+            return []
+        return validator(payload)
+
     def _inherit_type_properties(self, inherited_param):
         body_params = ["schema", "example", "form_params"]
-        for param in inherited_param:
-            if param.mime_type != self.mime_type:
-                continue
-            for n in body_params:
-                attr = getattr(self, n, None)
-                if attr is None:
-                    attr = getattr(param, n, None)
-                    setattr(self, n, attr)
+        inherited = [
+            p for p in inherited_param if p.mime_type == self.mime_type
+        ]
+        return _inherit(self, body_params, inherited)
 
 
-@attr.s
+@_model
 class Response(object):
     """
     Expected response parameters.
@@ -306,13 +359,11 @@ class Response(object):
     :param str method: HTTP request method associated with response.
     """
     code     = attr.ib(validator=response_code)
-    raw      = attr.ib(repr=False, init=True,
-                       validator=attr.validators.instance_of(dict))
+    raw      = attr.ib(repr=False, init=True, validator=dict_type)
     desc     = attr.ib(repr=False)
     headers  = attr.ib(repr=False)
     body     = attr.ib(repr=False)
-    config   = attr.ib(repr=False,
-                       validator=attr.validators.instance_of(dict))
+    config   = attr.ib(repr=False, validator=dict_type)
     errors   = attr.ib(repr=False)
     method   = attr.ib(default=None)
 
@@ -322,15 +373,41 @@ class Response(object):
             return Content(self.desc)
         return None
 
+    def validate(self, payload, mime_type=None):
+        """
+        Validates ``payload`` against the schema of the response's body \
+        of ``mime_type``.
+
+        :param payload: Decoded payload, or a JSON ``str`` / ``bytes``
+        :param str mime_type: Media type of the payload, e.g. the \
+            ``Content-Type`` of the response.  Defaults to the first body \
+            with a JSON schema.
+        :returns: ``list`` of :py:class:`.errors.InvalidPayloadError` s; \
+            empty if valid or if no body has a JSON schema.
+        """
+        bodies = self.body or []
+        if mime_type is None:
+            for body in bodies:
+                if body.validator is not None:
+                    return body.validate(payload)
+            return []
+        mime_type = mime_type.split(";")[0].strip()
+        for body in bodies:
+            if body.mime_type == mime_type:
+                return body.validate(payload)
+        if not bodies:
+            return []
+        msg = "'{0}' response has no body of type '{1}'.".format(
+            self.code, mime_type)
+        return [InvalidPayloadError(msg, [])]
+
     def _inherit_type_properties(self, inherited_param):
-        for param in inherited_param:
-            for n in NAMED_PARAMS:
-                attr = getattr(self, n, None)
-                if attr is None:
-                    attr = getattr(param, n, None)
-                    setattr(self, n, attr)
+        # of the named parameter properties, a response only has ``desc``
+        return _inherit(self, ["desc"], inherited_param)
 
 
+# never slotted: the parser sets the ``describedBy`` properties (headers,
+# responses, ...) on a scheme as attributes that are not attrs fields
 @attr.s
 class SecurityScheme(object):
     """
@@ -346,8 +423,7 @@ class SecurityScheme(object):
     :param dict settings: Security schema-specific information
     """
     name          = attr.ib()
-    raw           = attr.ib(repr=False, init=True,
-                            validator=attr.validators.instance_of(dict))
+    raw           = attr.ib(repr=False, init=True, validator=dict_type)
     type          = attr.ib(repr=False)
     described_by  = attr.ib(repr=False)
     desc          = attr.ib(repr=False)
@@ -5,9 +5,10 @@ from __future__ import absolute_import, division, print_function
 import re
 
 import attr
-from six import iteritems, iterkeys, itervalues
+from six import iteritems, iterkeys, itervalues, string_types
 
 
+from ._decorators import run_validators
 from .config import MEDIA_TYPES
 from .errors import InvalidRAMLError
 from .parameters import (
@@ -17,51 +18,184 @@ from .parameters import (
 from .parser_utils import (
     security_schemes
 )
-from .raml import RootNode, ResourceNode, ResourceTypeNode, TraitNode
+from .raml import (
+    RootNode, ResourceNode, ResourceGroup, ResourceTypeNode, TraitNode,
+    UNLOADED, METHOD_PROPERTIES
+)
 from .utils import (
-    load_schema, _resource_type_lookup,
-    _get_resource_type, _get_trait, _get_attribute,
-    _get_inherited_attribute, _remove_duplicates, _create_uri_params,
+    load_schema, _resource_type_lookup, _resource_type_method_lookup,
+    _trait_lookup, _get_resource_type, _get_trait, _get_attribute,
+    _get_inherited_attribute, _keyed_responses, _merge, _create_uri_params,
     _get, _create_base_param_obj, _get_res_type_attribute,
-    _get_inherited_type_params, _get_inherited_item, _get_attribute_dict,
-    get_inherited, set_param_object, set_params, _get_data_union,
-    _preserve_uri_order
+    _get_attribute_dict, _merge_resource_types,
+    get_inherited, set_param_object, set_params,
+    _preserve_uri_order, _defined, _memoize_schemas, _schema_memo,
+    _interning, _intern_table
 )
+from .validate import root_has_resources
+
+
+__all__ = ["parse_raml", "iter_raml_resources", "PROFILES"]
+
+#: Resource-level ``ResourceNode`` attributes computed once per
+#: :py:class:`.raml.ResourceGroup` & shared by the methods that do not
+#: change them
+GROUP_FIELDS = ("absolute_uri", "protocols", "uri_params", "base_uri_params")
 
+#: ``ResourceNode`` attributes that are only built if selected
+NODE_FIELDS = (
+    "headers", "body", "responses", "uri_params", "base_uri_params",
+    "query_params", "form_params"
+)
+
+#: ``ResourceNode`` attributes that are computed on first access when
+#: parsing with ``lazy=True``
+LAZY_FIELDS = (
+    "headers", "body", "responses", "query_params", "form_params",
+    "security_schemes"
+)
 
-__all__ = ["parse_raml"]
+#: Named selections of ``ResourceNode`` attributes to build
+PROFILES = {
+    "full": NODE_FIELDS,
+    "routing": ("uri_params", "base_uri_params"),
+}
 
 
-def parse_raml(loaded_raml, config):
+def _select_fields(fields):
+    """
+    Returns the set of ``NODE_FIELDS`` to build for ``fields``, a profile
+    name or list of ``ResourceNode`` attribute names, or ``None`` for all.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, string_types):
+        if fields not in PROFILES:
+            msg = "Unknown parse profile '{0}', expected one of: {1}".format(
+                fields, ", ".join(sorted(PROFILES)))
+            raise ValueError(msg)
+        fields = PROFILES[fields]
+    known = [a.name for a in attr.fields(ResourceNode)]
+    unknown = [f for f in fields if f not in known]
+    if unknown:
+        msg = "Unknown resource attributes: {0}".format(", ".join(unknown))
+        raise ValueError(msg)
+    return frozenset(f for f in fields if f in NODE_FIELDS)
+
+
+def parse_raml(loaded_raml, config, fields=None, lazy=False, intern=True):
     """
     Parse loaded RAML file into RAML/Python objects.
 
     :param RAMLDict loaded_raml: OrderedDict of loaded RAML file
+    :param fields: Name of a profile in :py:data:`PROFILES`, or list of \
+        ``ResourceNode`` attributes to build; the others in \
+        :py:data:`NODE_FIELDS` are set to :py:data:`.raml.UNLOADED` \
+        (and not validated).  Defaults to all.
+    :param bool lazy: Compute the :py:data:`LAZY_FIELDS` of each \
+        ``ResourceNode`` on first access instead, validating them then.
+    :param bool intern: Share one object between all identical URI, \
+        query & form parameters and headers.
     :returns: :py:class:`.raml.RootNode` object.
     :raises: :py:class:`.errors.InvalidRAMLError` when RAML file is invalid
     """
+    validate = str(_get(config, "validate")).lower() == 'true'
+    fields = _select_fields(fields)
+
+    with _memoize_schemas(), _interning({} if intern else None):
+        root = _create_api(loaded_raml, config, validate)
+        with run_validators(validate):
+            root.resource_groups = list(iter_resource_groups(
+                root.raml_obj, root, fields=fields, lazy=lazy))
+            root.resources = [r for g in root.resource_groups
+                              for r in g.resources]
+
+    if validate:
+        _validate_root(root)
+
+    return root
+
+
+def iter_raml_resources(loaded_raml, config, fields=None, lazy=False,
+                        intern=True):
+    """
+    Parse loaded RAML file, yielding each :py:class:`.raml.ResourceNode`
+    in the same order as :py:func:`parse_raml`'s ``resources`` as soon as
+    it is built.  The nodes are not collected on the
+    :py:class:`.raml.RootNode`, whose ``resources`` & ``resource_groups``
+    are ``None``.
 
+    :param RAMLDict loaded_raml: OrderedDict of loaded RAML file
+    :param fields: ``ResourceNode`` attributes to build, see \
+        :py:func:`parse_raml`
+    :param bool lazy: Compute attributes on first access, see \
+        :py:func:`parse_raml`
+    :param bool intern: Share identical parameter objects, see \
+        :py:func:`parse_raml`
+    :returns: generator of :py:class:`.raml.ResourceNode` objects.
+    :raises: :py:class:`.errors.InvalidRAMLError` when RAML file is invalid,
+        once all resources have been yielded
+    """
     validate = str(_get(config, "validate")).lower() == 'true'
+    fields = _select_fields(fields)
+
+    table = {} if intern else None
+    with _memoize_schemas() as memo, _interning(table):
+        root = _create_api(loaded_raml, config, validate)
+    root.resources = root.resource_groups = None
+    nodes = iter_resource_nodes(root.raml_obj, root, fields=fields,
+                                lazy=lazy)
+    found = False
+    while True:
+        # only switch validators while building nodes, not while the
+        # caller runs between them
+        with run_validators(validate), _memoize_schemas(memo), \
+                _interning(table):
+            node = next(nodes, None)
+        if node is None:
+            break
+        found = True
+        yield node
+
+    if validate:
+        _validate_root(root, found)
 
+
+def _create_api(loaded_raml, config, validate):
+    """
+    Creates the :py:class:`.raml.RootNode` with everything but its
+    resources.
+    """
     # Postpone validating the root node until the end; otherwise,
     # we end up with duplicate validation exceptions.
-    attr.set_run_validators(False)
-    root = create_root(loaded_raml, config)
-    attr.set_run_validators(validate)
+    with run_validators(False):
+        root = create_root(loaded_raml, config)
 
-    root.security_schemes = create_sec_schemes(root.raml_obj, root)
-    root.traits = create_traits(root.raml_obj, root)
-    root.resource_types = create_resource_types(root.raml_obj, root)
-    root.resources = create_resources(root.raml_obj, [], root,
-                                      parent=None)
+    with run_validators(validate):
+        root.security_schemes = create_sec_schemes(root.raml_obj, root)
+        root.traits = create_traits(root.raml_obj, root)
+        root.resource_types = create_resource_types(root.raml_obj, root)
+    return root
 
-    if validate:
-        attr.validate(root)  # need to validate again for root node
 
-        if root.errors:
-            raise InvalidRAMLError(root.errors)
+def _validate_root(root, found=None):
+    """
+    Validates the root node and raises all errors collected while parsing.
 
-    return root
+    :param bool found: Whether any resource was parsed, if they are not \
+        collected on ``root.resources``
+    """
+    with run_validators(True):
+        for a in attr.fields(RootNode):
+            if a.validator is None:
+                continue
+            if a.name == "resources" and found is not None:
+                root_has_resources(root, a, found)
+            else:
+                a.validator(root, a, getattr(root, a.name))
+
+    if root.errors:
+        raise InvalidRAMLError(root.errors)
 
 
 def create_root(raml, config):
@@ -392,27 +526,15 @@ def create_resource_types(raml_data, root):
 
     def headers(data):
         _headers = _get(data, "headers", {})
-        if _get(v, "type"):
-            _headers = _get_inherited_item(_headers, "headers",
-                                           resource_types,
-                                           meth, v)
-
         header_objs = _create_base_param_obj(_headers,
                                              Header,
                                              root.config,
-                                             root.errors)
-        if header_objs:
-            for h in header_objs:
-                h.method = method(meth)
-
+                                             root.errors,
+                                             method=method(meth))
         return header_objs
 
     def body(data):
         _body = _get(data, "body", default={})
-        if _get(v, "type"):
-            _body = _get_inherited_item(_body, "body", resource_types,
-                                        meth, v)
-
         body_objects = []
         for key, value in list(iteritems(_body)):
             body = Body(
@@ -430,18 +552,12 @@ def create_resource_types(raml_data, root):
     def responses(data):
         response_objects = []
         _responses = _get(data, "responses", {})
-        if _get(v, "type"):
-            _responses = _get_inherited_item(_responses, "responses",
-                                             resource_types, meth, v)
-
         for key, value in list(iteritems(_responses)):
             _headers = _get(_get(data, "responses", {}), key, {})
             _headers = _get(_headers, "headers", {})
             header_objs = _create_base_param_obj(_headers, Header,
-                                                 root.config, root.errors)
-            if header_objs:
-                for h in header_objs:
-                    h.method = method(meth)
+                                                 root.config, root.errors,
+                                                 method=method(meth))
             response = Response(
                 code=key,
                 raw={key: value},
@@ -459,10 +575,6 @@ def create_resource_types(raml_data, root):
 
     def uri_params(data):
         uri_params = _get_attribute_dict(data, "uriParameters", v)
-
-        if _get(v, "type"):
-            uri_params = _get_inherited_type_params(v, "uriParameters",
-                                                    uri_params, resource_types)
         return _create_base_param_obj(uri_params,
                                       URIParameter,
                                       root.config,
@@ -478,12 +590,6 @@ def create_resource_types(raml_data, root):
 
     def query_params(data):
         query_params = _get_attribute_dict(data, "queryParameters", v)
-
-        if _get(v, "type"):
-            query_params = _get_inherited_type_params(v, "queryParameters",
-                                                      query_params,
-                                                      resource_types)
-
         return _create_base_param_obj(query_params,
                                       QueryParameter,
                                       root.config,
@@ -491,12 +597,6 @@ def create_resource_types(raml_data, root):
 
     def form_params(data):
         form_params = _get_attribute_dict(data, "formParameters", v)
-
-        if _get(v, "type"):
-            form_params = _get_inherited_type_params(v, "formParameters",
-                                                     form_params,
-                                                     resource_types)
-
         return _create_base_param_obj(form_params,
                                       FormParameter,
                                       root.config,
@@ -538,9 +638,9 @@ def create_resource_types(raml_data, root):
             if root.traits:
                 trait_objs = []
                 for trait in assigned:
-                    obj = [t for t in root.traits if t.name == trait]
-                    if obj:
-                        trait_objs.append(obj[0])
+                    obj = _trait_lookup(trait, root)
+                    if obj is not None:
+                        trait_objs.append(obj)
                 return trait_objs or None
 
     def secured_by(data):
@@ -579,16 +679,16 @@ def create_resource_types(raml_data, root):
         )
 
     resource_types = _get(raml_data, "resourceTypes", [])
+    # each type's data, merged with the data of the types it inherits
+    merged = _merge_resource_types(resource_types)
     resource_type_objects = []
-    child_res_type_objects = []
-    child_res_type_names = []
+    child_res_types = []
 
     for res in resource_types:
         for k, v in list(iteritems(res)):
             if isinstance(v, dict):
                 if "type" in list(iterkeys(v)):
-                    child_res_type_objects.append({k: v})
-                    child_res_type_names.append(k)
+                    child_res_types.append(k)
 
                 else:
                     for meth in list(iterkeys(v)):
@@ -601,105 +701,140 @@ def create_resource_types(raml_data, root):
                 resource = wrap(k, {}, meth, v)
                 resource_type_objects.append(resource)
 
-    while child_res_type_objects:
-        child = child_res_type_objects.pop()
-        name = list(iterkeys(child))[0]
-        data = list(itervalues(child))[0]
-        parent = data.get("type")
-        if parent in child_res_type_names:
-            continue
-        p_data = [r for r in resource_types if list(iterkeys(r))[0] == parent]
-        p_data = p_data[0].get(parent)
-        res_data = _get_data_union(data, p_data)
-
-        for meth in list(iterkeys(res_data)):
+    # inheriting types come last, in reverse order of definition
+    for k in reversed(child_res_types):
+        v = merged[k]
+        for meth in list(iterkeys(v)):
             if meth in accepted_methods:
-                method_data = _get(res_data, meth, {})
-                comb_data = dict(list(iteritems(method_data)) +
-                                 list(iteritems(res_data)))
-                resource = ResourceTypeNode(
-                    name=name,
-                    raw=res_data,
-                    root=root,
-                    headers=headers(method_data),
-                    body=body(method_data),
-                    responses=responses(method_data),
-                    uri_params=uri_params(comb_data),
-                    base_uri_params=base_uri_params(comb_data),
-                    query_params=query_params(method_data),
-                    form_params=form_params(method_data),
-                    media_type=_get(v, "mediaType"),
-                    desc=description(),
-                    type=_get(res_data, "type"),
-                    method=method(meth),
-                    usage=_get(res_data, "usage"),
-                    optional=optional(),
-                    is_=is_(res_data),
-                    traits=traits(res_data),
-                    secured_by=secured_by(res_data),
-                    security_schemes=security_schemes_(res_data),
-                    display_name=_get(method_data, "displayName", name),
-                    protocols=protocols(res_data),
-                    errors=root.errors
-                )
+                method_data = _get(v, meth, {})
+                resource = wrap(k, method_data, meth, v)
                 resource_type_objects.append(resource)
 
     return resource_type_objects or None
 
 
-def create_resources(node, resources, root, parent):
+def create_resources(node, resources, root, parent, fields=None,
+                     lazy=False):
     """
-    Recursively traverses the RAML file via DFS to find each resource
-    endpoint.
+    Traverses the RAML file via DFS to find each resource endpoint.
 
     :param dict node: Dictionary of node to traverse
     :param list resources: List of collected ``ResourceNode`` s
     :param RootNode root: The ``RootNode`` of the API
     :param ResourceNode parent: Parent ``ResourceNode`` of current ``node``
+    :param set fields: ``NODE_FIELDS`` to build, or ``None`` for all
+    :param bool lazy: Compute ``LAZY_FIELDS`` on first access
     :returns: List of :py:class:`.raml.ResourceNode` objects.
     """
-    for k, v in list(iteritems(node)):
-        if k.startswith("/"):
-            avail = _get(root.config, "http_optional")
-            methods = [m for m in avail if m in list(iterkeys(v))]
-            if "type" in list(iterkeys(v)):
-                assigned = _resource_type_lookup(_get(v, "type"), root)
-                if hasattr(assigned, "method"):
-                    if not assigned.optional:
-                        methods.append(assigned.method)
-                        methods = list(set(methods))
-            if methods:
-                for m in methods:
-                    child = create_node(name=k,
-                                        raw_data=v,
-                                        method=m,
-                                        parent=parent,
-                                        root=root)
-                    resources.append(child)
-            # inherit resource type methods
-            elif "type" in list(iterkeys(v)):
-                if hasattr(assigned, "method"):
-                    method = assigned.method
-                else:
-                    method = None
-                child = create_node(name=k,
-                                    raw_data=v,
-                                    method=method,
-                                    parent=parent,
-                                    root=root)
-                resources.append(child)
-            else:
-                child = create_node(name=k,
-                                    raw_data=v,
-                                    method=None,
-                                    parent=parent,
-                                    root=root)
-                resources.append(child)
-            resources = create_resources(child.raw, resources, root, child)
+    resources.extend(iter_resource_nodes(node, root, parent, fields, lazy))
     return resources
 
 
-def create_node(name, raw_data, method, parent, root):
+def iter_resource_nodes(node, root, parent=None, fields=None, lazy=False):
+    """
+    Traverses the RAML file via DFS, yielding each resource endpoint as
+    soon as it is created.
+
+    :param dict node: Dictionary of node to traverse
+    :param RootNode root: The ``RootNode`` of the API
+    :param ResourceNode parent: Parent ``ResourceNode`` of ``node``
+    :param set fields: ``NODE_FIELDS`` to build, or ``None`` for all
+    :param bool lazy: Compute ``LAZY_FIELDS`` on first access
+    :returns: generator of :py:class:`.raml.ResourceNode` objects.
+    """
+    for group in iter_resource_groups(node, root, parent, fields, lazy):
+        for resource in group.resources:
+            yield resource
+
+
+def iter_resource_groups(node, root, parent=None, fields=None, lazy=False):
+    """
+    Traverses the RAML file via DFS, yielding a
+    :py:class:`.raml.ResourceGroup` with the nodes of all methods of each
+    resource as soon as it is created.  Uses an explicit stack rather
+    than recursion, so deeply nested APIs do not hit the recursion limit.
+
+    :param dict node: Dictionary of node to traverse
+    :param RootNode root: The ``RootNode`` of the API
+    :param ResourceNode parent: Parent ``ResourceNode`` of ``node``
+    :param set fields: ``NODE_FIELDS`` to build, or ``None`` for all
+    :param bool lazy: Compute ``LAZY_FIELDS`` on first access
+    :returns: generator of :py:class:`.raml.ResourceGroup` objects.
+    """
+    stack = [(iter(list(iteritems(node))), parent)]
+    while stack:
+        items, parent = stack[-1]
+        for k, v in items:
+            if k.startswith("/"):
+                break
+        else:
+            stack.pop()
+            continue
+
+        group = _create_group(k, v, parent, root, fields, lazy)
+        yield group
+        # nested resources are children of the last node created
+        stack.append((iter(list(iteritems(v))), group.resources[-1]))
+
+
+def _create_group(name, data, parent, root, fields, lazy):
+    """
+    Creates the ``ResourceGroup`` of the resource ``name``, with a
+    ``ResourceNode`` for each method, or a single one if no method is
+    defined.
+    """
+    group = ResourceGroup(
+        name=name,
+        raw=data,
+        parent=parent.group if parent else None,
+        path=(parent.path if parent else "") + name,
+        display_name=_get(data, "displayName", name),
+        root=root
+    )
+    avail = _get(root.config, "http_optional")
+    methods = [m for m in avail if m in list(iterkeys(data))]
+    if "type" in list(iterkeys(data)):
+        assigned = _resource_type_lookup(_get(data, "type"), root)
+        if hasattr(assigned, "method"):
+            if not assigned.optional:
+                methods.append(assigned.method)
+                methods = list(set(methods))
+    if not methods:
+        # inherit resource type methods
+        if "type" in list(iterkeys(data)) and hasattr(assigned, "method"):
+            methods = [assigned.method]
+        else:
+            methods = [None]
+    shared = []
+    group.resources = [create_node(name=name,
+                                   raw_data=data,
+                                   method=m,
+                                   parent=parent,
+                                   root=root,
+                                   fields=fields,
+                                   lazy=lazy,
+                                   group=group,
+                                   shared=shared) for m in methods]
+    return group
+
+
+def _memoized(func):
+    """
+    Caches the result of a node attribute function that takes no
+    arguments, so attributes other attributes depend on (e.g. the
+    assigned type & traits) are only resolved once per node.
+    """
+    result = []
+
+    def wrapper():
+        if not result:
+            result.append(func())
+        return result[0]
+    return wrapper
+
+
+def create_node(name, raw_data, method, parent, root, fields=None,
+                lazy=False, group=None, shared=None):
     """
     Create a Resource Node object.
 
@@ -708,18 +843,29 @@ def create_node(name, raw_data, method, parent, root):
     :param str method: HTTP method associated with resource node
     :param ResourceNode parent: Parent node object of resource node, if any
     :param RootNode api: API ``RootNode`` that the resource node is attached to
+    :param set fields: ``NODE_FIELDS`` to build, or ``None`` for all; \
+        the others are set to :py:data:`.raml.UNLOADED`
+    :param bool lazy: Compute ``LAZY_FIELDS`` on first access
+    :param ResourceGroup group: ``ResourceGroup`` of the resource, if any
+    :param list shared: ``GROUP_FIELDS`` already computed for the other \
+        methods of the resource, as ``(inputs, values)`` pairs; the \
+        node's are added if not there yet
     :returns: :py:class:`.raml.ResourceNode` object
     """
     #####
     # Node attribute functions
     #####
+    @_memoized
     def path():
         """Set resource's relative URI path."""
+        if group is not None:
+            return group.path
         parent_path = ""
         if parent:
             parent_path = parent.path
         return parent_path + name
 
+    @_memoized
     def absolute_uri():
         """Set resource's absolute URI path."""
         uri = root.base_uri + path()
@@ -740,6 +886,7 @@ def create_node(name, raw_data, method, parent, root):
                     uri = proto[0].lower() + "://" + uri
         return uri
 
+    @_memoized
     def protocols():
         """Set resource's supported protocols."""
         # trait = _get_trait("protocols", root, is_())
@@ -773,9 +920,7 @@ def create_node(name, raw_data, method, parent, root):
                                           root.config,
                                           root.errors,
                                           method=method)
-        if _headers is None:
-            return header_objs or None
-        return _remove_duplicates(header_objs, _headers)
+        return _merge([header_objs], own=_headers)
 
     def body():
         """Set resource's supported request/response body."""
@@ -797,9 +942,7 @@ def create_node(name, raw_data, method, parent, root):
                 errors=root.errors
             )
             _body_objs.append(body)
-        if _body_objs == []:
-            return body_objects or None
-        return _remove_duplicates(body_objects, _body_objs)
+        return _merge([body_objects], own=_body_objs)
 
     def responses():
         """Set resource's expected responses."""
@@ -838,7 +981,8 @@ def create_node(name, raw_data, method, parent, root):
                     # if a root mediaType was defined, the response body
                     # may omit the mime_type definition
                     if key in ('schema', 'example'):
-                        default_body[key] = load_schema(spec) if spec else {}
+                        default_body[key] = load_schema(spec) \
+                            if _defined(spec) else {}
                 else:
                     mime_type = key
                     # spec might be '!!null'
@@ -848,9 +992,9 @@ def create_node(name, raw_data, method, parent, root):
                     if spec:
                         _schema_spec = _get(spec, 'schema', '')
                         _example_spec = _get(spec, 'example', '')
-                        if _schema_spec:
+                        if _defined(_schema_spec):
                             _schema = load_schema(_schema_spec)
-                        if _example_spec:
+                        if _defined(_example_spec):
                             _example = load_schema(_example_spec)
                     body_list.append(Body(
                         mime_type=mime_type,
@@ -877,54 +1021,29 @@ def create_node(name, raw_data, method, parent, root):
         resps = _get_attribute("responses", method, raw_data)
         type_resp = _get_resource_type("responses", root, type_(), method)
         trait_resp = _get_trait("responses", root, is_())
-        resp_objs = type_resp + trait_resp
-        resp_codes = [r.code for r in resp_objs]
+        resp_objs = _keyed_responses([type_resp, trait_resp])
         for k, v in list(iteritems(resps)):
-            if k in resp_codes:
-                resp = [r for r in resp_objs if r.code == k][0]
-                index = resp_objs.index(resp)
-                inherit_resp = resp_objs.pop(index)
-                headers = resp_headers(_get(v, "headers", default={}))
-                if inherit_resp.headers:
-                    headers = _remove_duplicates(inherit_resp.headers, headers)
-                    # if headers:
-                    #     headers.extend(inherit_resp.headers)
-                    # else:
-                    #     headers = inherit_resp.headers
-                body = resp_body(_get(v, "body", {}))
-                if inherit_resp.body:
-                    body = _remove_duplicates(inherit_resp.body, body)
-                    # if body:
-                    #     body.extend(inherit_resp.body)
-                    # else:
-                    #     body = inherit_resp.body
-                resp = Response(
-                    code=k,
-                    raw={k: v},  # should prob get data union
-                    method=method,
-                    desc=_get(v, "description") or inherit_resp.desc,
-                    headers=headers,
-                    body=body,
-                    config=root.config,
-                    errors=root.errors
-                )
-                resp_objs.insert(index, resp)  # preserve order
-            else:
-                _headers = _get(v, "headers", default={})
-                _body = _get(v, "body", default={})
-                resp = Response(
-                    code=k,
-                    raw={k: v},
-                    method=method,
-                    desc=_get(v, "description"),
-                    headers=resp_headers(_headers),
-                    body=resp_body(_body),
-                    config=root.config,
-                    errors=root.errors
-                )
-                resp_objs.append(resp)
+            inherit_resp = resp_objs.get(k)
+            headers = resp_headers(_get(v, "headers", default={}))
+            body = resp_body(_get(v, "body", {}))
+            desc = _get(v, "description")
+            if inherit_resp:
+                headers = _merge([inherit_resp.headers], own=headers)
+                body = _merge([inherit_resp.body], own=body)
+                desc = desc or inherit_resp.desc
+            # an inherited response keeps its position
+            resp_objs[k] = Response(
+                code=k,
+                raw={k: v},  # should prob get data union
+                method=method,
+                desc=desc,
+                headers=headers,
+                body=body,
+                config=root.config,
+                errors=root.errors
+            )
 
-        return resp_objs or None
+        return list(itervalues(resp_objs)) or None
 
     def uri_params():
         """Set resource's URI parameters."""
@@ -942,6 +1061,7 @@ def create_node(name, raw_data, method, parent, root):
         return _preserve_uri_order(absolute_uri(), params, root.config,
                                    root.errors, declared)
 
+    @_memoized
     def base_uri_params():
         """Set resource's base URI parameters."""
         root_params = root.base_uri_params
@@ -1008,6 +1128,7 @@ def create_node(name, raw_data, method, parent, root):
                 desc = _get(raw_data, "description")
         return desc
 
+    @_memoized
     def is_():
         """Set resource's assigned trait names."""
         is_list = []
@@ -1023,6 +1144,7 @@ def create_node(name, raw_data, method, parent, root):
                 is_list.extend(method_level)
         return is_list or None
 
+    @_memoized
     def traits():
         """Set resource's assigned trait objects."""
         assigned = is_()
@@ -1030,12 +1152,13 @@ def create_node(name, raw_data, method, parent, root):
             if root.traits:
                 trait_objs = []
                 for trait in assigned:
-                    obj = [t for t in root.traits if t.name == trait]
-                    if obj:
-                        trait_objs.append(obj[0])
+                    obj = _trait_lookup(trait, root)
+                    if obj is not None:
+                        trait_objs.append(obj)
                 return trait_objs or None
 
     # TODO: wow this function sucks.
+    @_memoized
     def type_():
         """Set resource's assigned resource type name."""
         __get_method = _get(raw_data, method, {})
@@ -1050,15 +1173,13 @@ def create_node(name, raw_data, method, parent, root):
             return list(iterkeys(assigned_type))[0]  # NOCOV
         return assigned_type
 
+    @_memoized
     def resource_type():
         """Set resource's assigned resource type objects."""
         if type_() and root.resource_types:
-            assigned_name = type_()
-            res_types = root.resource_types
-            type_obj = [r for r in res_types if r.name == assigned_name]
-            if type_obj:
-                return type_obj[0]
+            return _resource_type_lookup(type_(), root)
 
+    @_memoized
     def secured_by():
         """
         Set resource's assigned security scheme names and related paramters.
@@ -1081,6 +1202,71 @@ def create_node(name, raw_data, method, parent, root):
         secured = secured_by()
         return security_schemes(secured, root)
 
+    def group_inputs():
+        """
+        What the ``GROUP_FIELDS`` depend on besides the resource: the
+        traits & type, and what the method & its resource type define.
+        """
+        r_type = None
+        if type_() and root.resource_types:
+            r_type = _resource_type_method_lookup(type_(), method, root)
+        method_level = _get(raw_data, method, {}) or {}
+        return (
+            is_(), type_(),
+            [_get(method_level, k) for k in
+             ("protocols", "uriParameters", "baseUriParameters")],
+            [getattr(r_type, f, None) for f in GROUP_FIELDS[1:]]
+        )
+
+    def group_fields():
+        """
+        Set resource's ``GROUP_FIELDS``, computing them only if no other
+        method of the resource has the same inputs.
+        """
+        inputs = group_inputs() if shared is not None else None
+        for other, values in shared or []:
+            if other == inputs:
+                return values
+        values = dict(
+            absolute_uri=absolute_uri(),
+            protocols=protocols(),
+            uri_params=selected("uri_params", uri_params),
+            base_uri_params=selected("base_uri_params", base_uri_params)
+        )
+        if shared is not None:
+            shared.append((inputs, values))
+        return values
+
+    def selected(field, func):
+        if fields is not None and field in NODE_FIELDS and \
+                field not in fields:
+            return UNLOADED
+        if lazy and field in LAZY_FIELDS:
+            loaders[field] = deferred(field, func)
+            return UNLOADED
+        return func()
+
+    def deferred(field, func):
+        """Sets the node's ``field`` on first access."""
+        validate = str(_get(root.config, "validate")).lower() == 'true'
+        memo = _schema_memo()
+        table = _intern_table()
+
+        def load(node):
+            first_error = len(root.errors)
+            with run_validators(validate), _memoize_schemas(memo), \
+                    _interning(table):
+                setattr(node, field, func())
+                if field in METHOD_PROPERTIES and resource_type():
+                    node._inherit_type([field])
+            errors = root.errors[first_error:]
+            if errors:
+                raise InvalidRAMLError(errors)
+        return load
+
+    loaders = {}
+    grouped = group_fields()
+
     node = ResourceNode(
         name=name,
         raw=raw_data,
@@ -1089,15 +1275,16 @@ def create_node(name, raw_data, method, parent, root):
         root=root,
         display_name=_get(raw_data, "displayName", name),
         path=path(),
-        absolute_uri=absolute_uri(),
-        protocols=protocols(),
-        headers=headers(),
-        body=body(),
-        responses=responses(),
-        uri_params=uri_params(),
-        base_uri_params=base_uri_params(),
-        query_params=query_params(),
-        form_params=form_params(),
+        group=group,
+        absolute_uri=grouped["absolute_uri"],
+        protocols=grouped["protocols"],
+        headers=selected("headers", headers),
+        body=selected("body", body),
+        responses=selected("responses", responses),
+        uri_params=grouped["uri_params"],
+        base_uri_params=grouped["base_uri_params"],
+        query_params=selected("query_params", query_params),
+        form_params=selected("form_params", form_params),
         media_type=media_type_(),
         desc=description(),
         is_=is_(),
@@ -1105,10 +1292,12 @@ def create_node(name, raw_data, method, parent, root):
         type=type_(),
         resource_type=resource_type(),
         secured_by=secured_by(),
-        security_schemes=security_schemes_(),
+        security_schemes=selected("security_schemes", security_schemes_),
         errors=root.errors
     )
     if resource_type():
         # correct inheritance (issue #23)
-        node._inherit_type()
+        node._inherit_type([p for p in METHOD_PROPERTIES if p not in loaders])
+    if loaders:
+        node._defer(loaders)
     return node
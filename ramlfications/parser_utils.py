@@ -4,32 +4,36 @@
 from __future__ import absolute_import, division, print_function
 
 
-from six import itervalues, iterkeys
+from six import iterkeys
 
-from .parameters import SecurityScheme
-from .utils import _get_scheme
+from .utils import _lookup, _lookup_table
 # functions used to parse the same shit in parser.py
 
 
+def _scheme_name(item):
+    if isinstance(item, dict):
+        return list(iterkeys(item))[0]
+    return item
+
+
 # resource, resource type
 def security_schemes(secured, root):
-    """Set resource's assigned security scheme objects."""
+    """
+    Set resource's assigned security scheme objects.
+
+    The :py:class:`.parameters.SecurityScheme` objects are the ones
+    defined on ``root.security_schemes`` and are shared by every node
+    that is secured by them; parameters of an assignment (e.g. OAuth 2
+    scopes) are kept in the node's ``secured_by`` and
+    ``security_scheme_params``.
+    """
     if secured:
+        index = _lookup_table(root, "security_schemes",
+                              root.security_schemes, lambda s: s.name)
         secured_objs = []
         for item in secured:
-            assigned_scheme = _get_scheme(item, root)
-            if assigned_scheme:
-                raw_data = list(itervalues(assigned_scheme))[0]
-                scheme = SecurityScheme(
-                    name=list(iterkeys(assigned_scheme))[0],
-                    raw=raw_data,
-                    type=raw_data.get("type"),
-                    described_by=raw_data.get("describedBy"),
-                    desc=raw_data.get("description"),
-                    settings=raw_data.get("settings"),
-                    config=root.config,
-                    errors=root.errors
-                )
+            scheme = _lookup(index, _scheme_name(item))
+            if scheme:
                 secured_objs.append(scheme)
         return secured_objs
     return None
@@ -4,9 +4,13 @@
 from __future__ import absolute_import, division, print_function
 
 import attr
+from six import iteritems
 from six.moves import BaseHTTPServer as httpserver  # NOQA
 
-from .parameters import Content
+from . import export
+from ._routes import router
+from .parameters import Content, _model
+from .utils import _intern
 from .validate import *  # NOQA
 
 HTTP_RESP_CODES = httpserver.BaseHTTPRequestHandler.responses.keys()
@@ -20,6 +24,60 @@ METHOD_PROPERTIES = [
 ]
 
 
+class _Unloaded(object):
+    """
+    Type of :py:data:`UNLOADED`.  Falsy, so code that treats a missing
+    attribute like ``None`` keeps working.
+    """
+    def __repr__(self):
+        return "UNLOADED"
+
+    def __bool__(self):
+        return False
+    __nonzero__ = __bool__
+
+    def __reduce__(self):
+        return "UNLOADED"
+
+
+#: Value of node attributes that were skipped while parsing, see the
+#: ``fields`` of :py:func:`ramlfications.parse`
+UNLOADED = _Unloaded()
+
+
+def _is_set(node, name):
+    try:
+        object.__getattribute__(node, name)
+    except AttributeError:
+        return False
+    return True
+
+
+def _restore_node(cls, state):
+    """Unpickles a :py:class:`ResourceNode` of class ``cls``."""
+    node = cls.__new__(cls)
+    node._lazy = None
+    for name, value in iteritems(state):
+        setattr(node, name, value)
+    return node
+
+
+def _security_scheme_params(secured_by):
+    """
+    Maps each assigned security scheme name in ``secured_by`` to the
+    parameters of that assignment (e.g. OAuth 2 scopes), or ``None``.
+    """
+    if not secured_by:
+        return None
+    params = {}
+    for item in secured_by:
+        if isinstance(item, dict):
+            params.update(item)
+        elif item is not None:
+            params.setdefault(item, None)
+    return params
+
+
 @attr.s
 class RootNode(object):
     """
@@ -49,6 +107,8 @@ class RootNode(object):
         :py:class:`parameters.SecurityScheme` objects, or ``None``
     :param list resources: list of :py:class:`ResourceNode` objects, \
         or ``None``
+    :param list resource_groups: list of :py:class:`ResourceGroup` \
+        objects, one per resource path, that ``resources`` is made of
     :param raml_obj: loaded :py:class:`raml.RAMLDict` object
     """
     raw              = attr.ib(repr=False)
@@ -69,12 +129,49 @@ class RootNode(object):
     resources        = attr.ib(repr=False, init=False,
                                validator=root_resources)
     raml_obj         = attr.ib(repr=False)
-    config           = attr.ib(repr=False,
-                               validator=attr.validators.instance_of(dict))
+    config           = attr.ib(repr=False, validator=dict_type)
     errors           = attr.ib(repr=False)
+    resource_groups  = attr.ib(repr=False, init=False, default=None)
 
+    def match(self, method, url):
+        """
+        Finds the resource that handles a request.
 
-@attr.s
+        The route index is compiled from the ``path`` and ``uri_params`` \
+        of all ``resources`` on first use.  Literal path segments take \
+        precedence over URI parameters; a URI parameter's ``enum``, \
+        ``pattern`` or numeric ``type`` restricts the values it matches.
+
+        :param str method: HTTP method of the request
+        :param str url: Absolute URL, matched against ``base_uri`` and \
+            its ``base_uri_params``, or path relative to ``base_uri``.
+        :returns: Tuple of the matching :py:class:`ResourceNode` and a \
+            ``dict`` of URI & base URI parameter values, or ``None``.
+        """
+        return router(self).match(method, url)
+
+    def to_dict(self, raw=False):
+        """
+        Returns the API as JSON-serializable data (see \
+        :py:mod:`.export`): each node once, with references to other \
+        nodes replaced by their index in ``resources``, \
+        ``resource_types``, ``traits`` or ``security_schemes``.
+
+        :param bool raw: Include the ``raw`` data of each object, too.
+        """
+        return export.to_dict(self, raw)
+
+    def dump(self, fp, raw=False):
+        """
+        Writes :py:meth:`to_dict` as JSON to the text file object \
+        ``fp``, one node at a time.
+
+        :param bool raw: Include the ``raw`` data of each object, too.
+        """
+        export.dump(self, fp, raw)
+
+
+@_model
 class BaseNode(object):
     """
     :param dict raw: The raw data parsed from the RAML file
@@ -121,7 +218,7 @@ class BaseNode(object):
         return Content(self.desc)
 
 
-@attr.s
+@_model
 class TraitNode(BaseNode):
     """
     RAML Trait object
@@ -134,7 +231,7 @@ class TraitNode(BaseNode):
     usage = attr.ib(repr=False)
 
 
-@attr.s
+@_model
 class ResourceTypeNode(BaseNode):
     """
     RAML Resource Type object
@@ -156,6 +253,8 @@ class ResourceTypeNode(BaseNode):
         are the parameters assigned (e.g. relevant OAuth 2 scopes).
     :param list security_schemes: A list of assigned \
         :py:class:`parameters.SecurityScheme` objects, or ``None``.
+    :param dict security_scheme_params: Assigned security scheme names \
+        mapped to the parameters of their assignment, or ``None``.
     :param str display_name: User-friendly name of resource; \
         defaults to ``name``
 
@@ -172,8 +271,12 @@ class ResourceTypeNode(BaseNode):
     security_schemes = attr.ib(repr=False)
     display_name     = attr.ib(repr=False)
 
+    @property
+    def security_scheme_params(self):
+        return _security_scheme_params(self.secured_by)
 
-@attr.s
+
+@_model
 class ResourceNode(BaseNode):
     """
     Supported API-endpoint (“resource”)
@@ -199,6 +302,9 @@ class ResourceNode(BaseNode):
         the values are the parameters assigned (e.g. relevant OAuth 2 scopes).
     :param list security_schemes: A list of assigned \
         :py:class:`parameters.SecurityScheme` objects, or ``None``.
+    :param dict security_scheme_params: Assigned security scheme names \
+        mapped to the parameters of their assignment, or ``None``.
+    :param ResourceGroup group: The resource's :py:class:`ResourceGroup`
     """
     name             = attr.ib(repr=False)
     raw              = attr.ib(repr=False)
@@ -213,11 +319,105 @@ class ResourceNode(BaseNode):
     resource_type    = attr.ib(repr=False)
     secured_by       = attr.ib(repr=False)
     security_schemes = attr.ib(repr=False)
+    group            = attr.ib(repr=False, default=None, cmp=False)
+    _lazy            = attr.ib(repr=False, init=False, default=None,
+                               cmp=False)
+
+    @property
+    def security_scheme_params(self):
+        return _security_scheme_params(self.secured_by)
 
-    def _inherit_type(self):
-        for p in METHOD_PROPERTIES:
+    def __getattr__(self, name):
+        # only called for attributes that are not set, i.e. those that
+        # are still to be computed when parsed with ``lazy=True``
+        if name == "_lazy":  # older attrs do not set ``init=False`` ones
+            return None
+        lazy = self._lazy
+        load = lazy and lazy.get(name)
+        if load is None:
+            raise AttributeError(name)
+        try:
+            load(self)
+        finally:
+            if _is_set(self, name):
+                lazy.pop(name, None)
+        return object.__getattribute__(self, name)
+
+    def __reduce__(self):
+        # rather than ``__getstate__``, which slotted attrs classes
+        # replace with their own
+        self.load()
+        state = dict((a.name, getattr(self, a.name))
+                     for a in attr.fields(type(self)) if a.name != "_lazy")
+        return _restore_node, (type(self), state)
+
+    def _defer(self, loaders):
+        """
+        Unsets the attributes in ``loaders``, so that each is set by
+        calling its loader with the node on first access.
+        """
+        for name in loaders:
+            delattr(self, name)
+        self._lazy = loaders
+
+    def load(self):
+        """
+        Computes all attributes that are not computed yet, e.g. to \
+        validate them.
+
+        :raises InvalidRAMLError: If validating and any of them is invalid
+        """
+        for name in list(self._lazy or ()):
+            getattr(self, name)
+
+    def _inherit_type(self, properties=METHOD_PROPERTIES):
+        for p in properties:
             inherited_prop = getattr(self.resource_type, p)
             resource_prop = getattr(self, p)
             if resource_prop and inherited_prop:
-                for r in resource_prop:
-                    r._inherit_type_properties(inherited_prop)
+                resource_prop = [
+                    _intern(r._inherit_type_properties(inherited_prop))
+                    for r in resource_prop
+                ]
+                setattr(self, p, resource_prop)
+
+
+@_model
+class ResourceGroup(object):
+    """
+    All methods of one API resource (i.e. path), each a
+    :py:class:`ResourceNode`.  The resource-level data of the nodes
+    (``absolute_uri``, ``protocols``, ``uri_params`` & ``base_uri_params``)
+    is computed once and shared by the methods that do not change it
+    (e.g. through a trait or their own ``protocols``).
+
+    :param str name: Resource name
+    :param dict raw: The raw data parsed from the RAML file
+    :param ResourceGroup parent: Group of the parent resource, or ``None``
+    :param str path: relative path of resource
+    :param str display_name: User-friendly name of resource; \
+        defaults to ``name``
+    :param list resources: :py:class:`ResourceNode` objects, one per \
+        method, or a single one with method ``None``
+    :param RootNode root: Back reference to the API root
+    """
+    name         = attr.ib(repr=False)
+    raw          = attr.ib(repr=False)
+    parent       = attr.ib(repr=False)
+    path         = attr.ib()
+    display_name = attr.ib(repr=False)
+    root         = attr.ib(repr=False)
+    resources    = attr.ib(repr=False, default=attr.Factory(list))
+
+    @property
+    def methods(self):
+        return [r.method for r in self.resources]
+
+    def resource(self, method):
+        """
+        Returns the :py:class:`ResourceNode` of ``method``, or ``None``.
+        """
+        for r in self.resources:
+            if r.method == method:
+                return r
+        return None
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2015 Spotify AB
+
+from __future__ import absolute_import, division, print_function
+
+from email.utils import parsedate
+import re
+
+from six import iteritems, string_types
+from six.moves.urllib.parse import parse_qsl
+
+from .errors import InvalidParameterError
+
+
+def _boolean(value):
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    raise ValueError(value)
+
+
+def _date(value):
+    # RFC 2616, e.g. "Sun, 06 Nov 1994 08:49:37 GMT"
+    if parsedate(value) is None:
+        raise ValueError(value)
+    return value
+
+
+#: Converters of request values by primitive type; the others are strings
+CONVERTERS = {
+    "integer": int,
+    "number": float,
+    "boolean": _boolean,
+    "date": _date,
+}
+
+
+def _text(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value if isinstance(value, string_types) else str(value)
+
+
+def _compile_param(param):
+    """
+    Returns a function that checks the list of request values of the
+    named parameter ``param``, returning an error message or ``None``.
+    """
+    name = param.name
+    type_ = param.type or "string"
+    convert = CONVERTERS.get(type_)
+    repeat = param.repeat
+    enum = None
+    if param.enum:
+        if convert is None:
+            enum = frozenset(_text(e) for e in param.enum)
+        else:
+            enum = frozenset(param.enum)
+    pattern = None
+    if param.pattern and convert is None:
+        try:
+            pattern = re.compile(param.pattern)
+        except re.error:  # not our job to validate it here
+            pass
+    min_length = param.min_length if convert is None else None
+    max_length = param.max_length if convert is None else None
+    minimum, maximum = param.minimum, param.maximum
+
+    def check(values):
+        if not repeat and len(values) > 1:
+            return "'{0}' must not be repeated.".format(name)
+        for value in values:
+            if convert is not None:
+                try:
+                    value = convert(value)
+                except (TypeError, ValueError):
+                    return "'{0}' must be of type '{1}', not '{2}'.".format(
+                        name, type_, value)
+            if enum is not None and value not in enum:
+                return "'{0}' must be one of {1}, not '{2}'.".format(
+                    name, sorted(enum), value)
+            if pattern is not None and not pattern.search(value):
+                return "'{0}' does not match '{1}': '{2}'.".format(
+                    name, pattern.pattern, value)
+            if min_length is not None and len(value) < min_length:
+                return "'{0}' must be at least {1} characters long.".format(
+                    name, min_length)
+            if max_length is not None and len(value) > max_length:
+                return "'{0}' must be at most {1} characters long.".format(
+                    name, max_length)
+            if minimum is not None and value < minimum:
+                return "'{0}' must be at least {1}, not {2}.".format(
+                    name, minimum, value)
+            if maximum is not None and value > maximum:
+                return "'{0}' must be at most {1}, not {2}.".format(
+                    name, maximum, value)
+        return None
+    return check
+
+
+class ParameterValidator(object):
+    """
+    Checks request values against a set of named parameters, e.g. a
+    resource's ``query_params`` or ``headers``.  Patterns, enums and type
+    conversions are compiled once, when created.
+
+    Values of undeclared parameters are ignored.
+
+    :param list params: :py:class:`.parameters.URIParameter`, \
+        :py:class:`.parameters.QueryParameter`, \
+        :py:class:`.parameters.FormParameter` or \
+        :py:class:`.parameters.Header` objects, or ``None``
+    :param bool ignore_case: Match parameter names case-insensitively, \
+        as for headers.
+    :param bool required: Report missing ``required`` parameters.
+    """
+    __slots__ = ("checks", "required", "ignore_case")
+
+    def __init__(self, params, ignore_case=False, required=True):
+        self.ignore_case = ignore_case
+        self.checks = {}
+        self.required = []
+        for p in params or []:
+            name = p.name.lower() if ignore_case else p.name
+            if name in self.checks:
+                continue
+            self.checks[name] = _compile_param(p)
+            if required and p.required:
+                self.required.append((name, p.name))
+
+    def __call__(self, values):
+        """
+        :param values: A query string, or a mapping of names to a value \
+            or a list of values (e.g. a header ``dict``).
+        :returns: ``list`` of :py:class:`.errors.InvalidParameterError` \
+            s, whose ``parameter`` is the parameter name; empty if valid.
+        """
+        if isinstance(values, string_types):
+            values = parse_qsl(values.lstrip("?"), keep_blank_values=True)
+        elif hasattr(values, "items"):
+            values = iteritems(values)
+        checks = self.checks
+        ignore_case = self.ignore_case
+
+        found = {}
+        for name, value in values:
+            if ignore_case:
+                name = name.lower()
+            if name not in checks:
+                continue
+            if isinstance(value, (list, tuple)):
+                found.setdefault(name, []).extend(value)
+            else:
+                found.setdefault(name, []).append(value)
+
+        errors = []
+        for name, found_values in iteritems(found):
+            msg = checks[name](found_values)
+            if msg is not None:
+                errors.append(InvalidParameterError(msg, name))
+        for name, declared in self.required:
+            if name not in found:
+                msg = "'{0}' is required.".format(declared)
+                errors.append(InvalidParameterError(msg, declared))
+        return errors
+
+
+class RequestValidator(object):
+    """
+    Checks the URI parameters, query string, headers and form of a
+    request against those declared by a
+    :py:class:`.raml.ResourceNode`.
+
+    :param ResourceNode resource: The resource to check requests for
+    """
+    __slots__ = ("uri_params", "query_params", "headers", "form_params")
+
+    def __init__(self, resource):
+        uri_params = (resource.uri_params or []) + \
+            (resource.base_uri_params or [])
+        # the route a request matched supplies its URI parameters; those
+        # of the base URI are only known for absolute URLs
+        self.uri_params = ParameterValidator(uri_params, required=False)
+        self.query_params = ParameterValidator(resource.query_params)
+        self.headers = ParameterValidator(resource.headers, ignore_case=True)
+        self.form_params = ParameterValidator(resource.form_params)
+
+    def __call__(self, uri_params=None, query=None, headers=None, form=None):
+        """
+        Checks the given parts of a request; parts that are ``None`` are
+        not checked.
+
+        :param dict uri_params: URI (& base URI) parameter values, e.g. as \
+            returned by :py:meth:`.raml.RootNode.match`
+        :param query: Query string, or ``dict`` of query parameters
+        :param dict headers: Request headers
+        :param form: URL encoded form, or ``dict`` of form parameters
+        :returns: ``list`` of :py:class:`.errors.InvalidParameterError` \
+            s; empty if valid.
+        """
+        errors = []
+        if uri_params is not None:
+            errors.extend(self.uri_params(uri_params))
+        if query is not None:
+            errors.extend(self.query_params(query))
+        if headers is not None:
+            errors.extend(self.headers(headers))
+        if form is not None:
+            errors.extend(self.form_params(form))
+        return errors
@@ -0,0 +1,697 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2015 Spotify AB
+
+from __future__ import absolute_import, division, print_function
+
+import hashlib
+import json
+import re
+import threading
+
+try:
+    from collections import OrderedDict
+except ImportError:  # NOCOV
+    from ordereddict import OrderedDict
+
+from six import integer_types, iteritems, itervalues, string_types
+
+from .errors import InvalidPayloadError
+
+
+__all__ = ["SchemaValidator", "validator_for", "clear_cache",
+           "JSONSCHEMA", "VALIDATOR_CACHE_SIZE"]
+
+#: Maximum number of compiled validators kept by :py:func:`validator_for`
+VALIDATOR_CACHE_SIZE = 512
+
+#: Whether :py:func:`validator_for` uses ``jsonschema``: ``None`` until
+#: first needed, when it is imported if installed.  Set to ``False`` to
+#: always use :py:class:`SchemaValidator`.
+JSONSCHEMA = None
+
+
+def _subject(schema):
+    # the object behind a ``jsonref`` or ``LazyInclude`` proxy, so that
+    # all references to one schema share its identity (& validator)
+    return getattr(schema, "__subject__", schema)
+
+
+def _is_number(value):
+    return isinstance(value, integer_types + (float,)) and \
+        not isinstance(value, bool)
+
+
+_TYPES = {
+    "string": lambda v: isinstance(v, string_types),
+    "integer": lambda v: isinstance(v, integer_types) and
+    not isinstance(v, bool),
+    "number": _is_number,
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "array": lambda v: isinstance(v, list),
+    "object": lambda v: isinstance(v, dict),
+    "any": lambda v: True,
+}
+
+
+def _enum_key(value):
+    # ``True == 1`` in Python, but not in JSON
+    try:
+        return isinstance(value, bool), hash(value), value
+    except TypeError:
+        return None, json.dumps(value, sort_keys=True)
+
+
+def _path(path):
+    # ``path`` is a linked ``(key, parent)`` tuple, only unrolled on error
+    keys = []
+    while path:
+        key, path = path
+        keys.append(key)
+    return keys[::-1]
+
+
+def _error(errors, path, msg, *args):
+    errors.append(InvalidPayloadError(msg.format(*args), _path(path)))
+
+
+def _resolve(root, ref):
+    """Resolves a local JSON pointer ``ref``, e.g. ``#/definitions/x``."""
+    if not ref.startswith("#"):
+        return None
+    node = root
+    for part in ref[1:].split("/"):
+        if not part:
+            continue
+        part = part.replace("~1", "/").replace("~0", "~")
+        try:
+            node = node[int(part) if isinstance(node, list) else part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            return None
+    return _subject(node)
+
+
+class _Compiler(object):
+    """
+    Compiles a (draft 3 or 4) JSON schema into a tree of closures, each
+    checking one keyword.  Subschemas are compiled once, so recursive
+    schemas only refer back to themselves.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.compiled = {}
+
+    def __call__(self, schema):
+        schema = _subject(schema)
+        if not isinstance(schema, dict):
+            return None
+        key = id(schema)
+        if key in self.compiled:
+            cell = self.compiled[key]
+            # a reference back to a schema that is still being compiled
+            return lambda value, path, errors: cell[0](value, path, errors)
+        cell = self.compiled[key] = [None]
+        checks = self._checks(schema)
+
+        def check(value, path, errors):
+            for c in checks:
+                c(value, path, errors)
+        cell[0] = check
+        return check
+
+    def _checks(self, schema):
+        ref = schema.get("$ref")
+        if isinstance(ref, string_types):
+            target = self(_resolve(self.root, ref))
+            # other keywords are ignored next to ``$ref``
+            return [target] if target is not None else []
+
+        checks = []
+        for keyword, value in iteritems(schema):
+            compile_ = getattr(self, "_" + keyword, None)
+            if compile_ is None:
+                continue
+            try:
+                check = compile_(value, schema)
+            except (AttributeError, TypeError, ValueError, re.error):
+                continue  # not our job to validate the schema here
+            if check is not None:
+                checks.append(check)
+        return checks
+
+    def _schemas(self, schemas):
+        return [c for c in (self(s) for s in schemas) if c is not None]
+
+    def _type(self, types, schema):
+        if not isinstance(types, list):
+            types = [types]
+        simple = [_TYPES[t] for t in types if t in _TYPES]
+        complex_ = self._schemas(t for t in types if isinstance(t, dict))
+        names = [t if isinstance(t, string_types) else "schema"
+                 for t in types]
+
+        def check(value, path, errors):
+            for is_type in simple:
+                if is_type(value):
+                    return
+            for c in complex_:
+                errs = []
+                c(value, path, errs)
+                if not errs:
+                    return
+            _error(errors, path, "{0!r} is not of type {1}.", value,
+                   ", ".join(names))
+        return check
+
+    def _enum(self, enum, schema):
+        keys = frozenset(_enum_key(e) for e in enum)
+
+        def check(value, path, errors):
+            if _enum_key(value) not in keys:
+                _error(errors, path, "{0!r} is not one of {1!r}.", value,
+                       enum)
+        return check
+
+    def _properties(self, properties, schema):
+        checks = [(name, self(s)) for name, s in iteritems(properties)]
+        checks = [(name, c) for name, c in checks if c is not None]
+        # draft 3 marks required properties in the subschema
+        required = [name for name, s in iteritems(properties)
+                    if isinstance(s, dict) and s.get("required") is True]
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for name, c in checks:
+                if name in value:
+                    c(value[name], (name, path), errors)
+            for name in required:
+                if name not in value:
+                    _error(errors, path, "{0!r} is a required property.",
+                           name)
+        return check
+
+    def _required(self, required, schema):
+        if not isinstance(required, list):  # draft 3, see ``_properties``
+            return None
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if name not in value:
+                    _error(errors, path, "{0!r} is a required property.",
+                           name)
+        return check
+
+    def _patternProperties(self, patterns, schema):
+        checks = [(re.compile(p), self(s)) for p, s in iteritems(patterns)]
+        checks = [(r, c) for r, c in checks if c is not None]
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for name, item in iteritems(value):
+                for regex, c in checks:
+                    if regex.search(name):
+                        c(item, (name, path), errors)
+        return check
+
+    def _additionalProperties(self, additional, schema):
+        names = frozenset(schema.get("properties") or ())
+        patterns = [re.compile(p) for p in schema.get("patternProperties")
+                    or ()]
+        c = self(additional)
+        if additional is not False and c is None:
+            return None
+
+        def extra(value):
+            return [n for n in value if n not in names and
+                    not any(p.search(n) for p in patterns)]
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            if c is None:
+                for name in extra(value):
+                    _error(errors, path, "Additional property {0!r} is not "
+                           "allowed.", name)
+            else:
+                for name in extra(value):
+                    c(value[name], (name, path), errors)
+        return check
+
+    def _dependencies(self, dependencies, schema):
+        checks = []
+        for name, dep in iteritems(dependencies):
+            if isinstance(dep, string_types):
+                dep = [dep]
+            checks.append((name, dep if isinstance(dep, list) else None,
+                           self(dep)))
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for name, names, c in checks:
+                if name not in value:
+                    continue
+                if c is not None:
+                    c(value, path, errors)
+                for n in names or ():
+                    if n not in value:
+                        _error(errors, path, "{0!r} is a dependency of "
+                               "{1!r}.", n, name)
+        return check
+
+    def _minProperties(self, minimum, schema):
+        if not _is_number(minimum):
+            return None
+
+        def check(value, path, errors):
+            if isinstance(value, dict) and len(value) < minimum:
+                _error(errors, path, "Expected at least {0} properties.",
+                       minimum)
+        return check
+
+    def _maxProperties(self, maximum, schema):
+        if not _is_number(maximum):
+            return None
+
+        def check(value, path, errors):
+            if isinstance(value, dict) and len(value) > maximum:
+                _error(errors, path, "Expected at most {0} properties.",
+                       maximum)
+        return check
+
+    def _items(self, items, schema):
+        if isinstance(items, list):
+            checks = [self(s) for s in items]
+            additional = schema.get("additionalItems", True)
+            extra = self(additional)
+
+            def check(value, path, errors):
+                if not isinstance(value, list):
+                    return
+                for i, item in enumerate(value):
+                    if i < len(checks):
+                        if checks[i] is not None:
+                            checks[i](item, (i, path), errors)
+                    elif additional is False:
+                        _error(errors, path, "Expected at most {0} items.",
+                               len(checks))
+                        return
+                    elif extra is not None:
+                        extra(item, (i, path), errors)
+            return check
+
+        c = self(items)
+        if c is None:
+            return None
+
+        def check(value, path, errors):
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    c(item, (i, path), errors)
+        return check
+
+    def _minItems(self, minimum, schema):
+        if not _is_number(minimum):
+            return None
+
+        def check(value, path, errors):
+            if isinstance(value, list) and len(value) < minimum:
+                _error(errors, path, "Expected at least {0} items.", minimum)
+        return check
+
+    def _maxItems(self, maximum, schema):
+        if not _is_number(maximum):
+            return None
+
+        def check(value, path, errors):
+            if isinstance(value, list) and len(value) > maximum:
+                _error(errors, path, "Expected at most {0} items.", maximum)
+        return check
+
+    def _uniqueItems(self, unique, schema):
+        if not unique:
+            return None
+
+        def check(value, path, errors):
+            if isinstance(value, list) and \
+                    len(set(_enum_key(v) for v in value)) < len(value):
+                _error(errors, path, "{0!r} has non-unique items.", value)
+        return check
+
+    def _minLength(self, minimum, schema):
+        if not _is_number(minimum):
+            return None
+
+        def check(value, path, errors):
+            if isinstance(value, string_types) and len(value) < minimum:
+                _error(errors, path, "{0!r} is shorter than {1}.", value,
+                       minimum)
+        return check
+
+    def _maxLength(self, maximum, schema):
+        if not _is_number(maximum):
+            return None
+
+        def check(value, path, errors):
+            if isinstance(value, string_types) and len(value) > maximum:
+                _error(errors, path, "{0!r} is longer than {1}.", value,
+                       maximum)
+        return check
+
+    def _pattern(self, pattern, schema):
+        regex = re.compile(pattern)
+
+        def check(value, path, errors):
+            if isinstance(value, string_types) and not regex.search(value):
+                _error(errors, path, "{0!r} does not match {1!r}.", value,
+                       pattern)
+        return check
+
+    def _minimum(self, minimum, schema):
+        if not _is_number(minimum):
+            return None
+        exclusive = schema.get("exclusiveMinimum") is True
+
+        def check(value, path, errors):
+            if _is_number(value) and (value < minimum or
+                                      exclusive and value == minimum):
+                _error(errors, path, "{0!r} is less than {1}the minimum of "
+                       "{2}.", value, "or equal to " if exclusive else "",
+                       minimum)
+        return check
+
+    def _maximum(self, maximum, schema):
+        if not _is_number(maximum):
+            return None
+        exclusive = schema.get("exclusiveMaximum") is True
+
+        def check(value, path, errors):
+            if _is_number(value) and (value > maximum or
+                                      exclusive and value == maximum):
+                _error(errors, path, "{0!r} is greater than {1}the maximum "
+                       "of {2}.", value, "or equal to " if exclusive else "",
+                       maximum)
+        return check
+
+    def _multipleOf(self, factor, schema):
+        if not _is_number(factor) or not factor:
+            return None
+
+        def check(value, path, errors):
+            if not _is_number(value):
+                return
+            if isinstance(factor, float) or isinstance(value, float):
+                quotient = value / factor
+                failed = int(quotient) != quotient
+            else:
+                failed = value % factor
+            if failed:
+                _error(errors, path, "{0!r} is not a multiple of {1}.",
+                       value, factor)
+        return check
+
+    _divisibleBy = _multipleOf  # draft 3
+
+    def _allOf(self, schemas, schema):
+        checks = self._schemas(schemas)
+
+        def check(value, path, errors):
+            for c in checks:
+                c(value, path, errors)
+        return check
+
+    def _anyOf(self, schemas, schema):
+        checks = self._schemas(schemas)
+
+        def check(value, path, errors):
+            for c in checks:
+                errs = []
+                c(value, path, errs)
+                if not errs:
+                    return
+            _error(errors, path, "{0!r} is not valid under any of the given "
+                   "schemas.", value)
+        return check
+
+    def _oneOf(self, schemas, schema):
+        checks = self._schemas(schemas)
+
+        def check(value, path, errors):
+            valid = 0
+            for c in checks:
+                errs = []
+                c(value, path, errs)
+                valid += not errs
+            if valid != 1:
+                _error(errors, path, "{0!r} is valid under {1} of the given "
+                       "schemas, not exactly one.", value, valid)
+        return check
+
+    def _not(self, not_schema, schema):
+        c = self(not_schema)
+        if c is None:
+            return None
+
+        def check(value, path, errors):
+            errs = []
+            c(value, path, errs)
+            if not errs:
+                _error(errors, path, "{0!r} is not allowed by {1!r}.", value,
+                       not_schema)
+        return check
+
+    def _disallow(self, types, schema):  # draft 3
+        check_type = self._type(types, schema)
+
+        def check(value, path, errors):
+            errs = []
+            check_type(value, path, errs)
+            if not errs:
+                _error(errors, path, "{0!r} is disallowed.", value)
+        return check
+
+    def _extends(self, schemas, schema):  # draft 3
+        if not isinstance(schemas, list):
+            schemas = [schemas]
+        return self._allOf(schemas, schema)
+
+
+def _decode(payload):
+    if isinstance(payload, bytes):
+        payload = payload.decode("utf-8")
+    return json.loads(payload)
+
+
+def _compiled(schema):
+    return _Compiler(schema)(schema) or (lambda value, path, errors: None)
+
+
+class SchemaValidator(object):
+    """
+    Validates payloads against a JSON schema (draft 3 or 4) without any
+    dependencies beyond the standard library.  The schema is compiled
+    once, when created; ``format`` and remote ``$ref`` s are not checked.
+
+    :param dict schema: Decoded JSON schema, e.g. :py:attr:`.Body.schema`
+    """
+    __slots__ = ("schema", "_check")
+
+    def __init__(self, schema):
+        self.schema = _subject(schema)
+        self._check = _compiled(self.schema)
+
+    def __call__(self, payload):
+        """
+        :param payload: Decoded payload, or a JSON ``str`` / ``bytes``
+        :returns: ``list`` of :py:class:`.errors.InvalidPayloadError` s; \
+            empty if valid.
+        """
+        if isinstance(payload, (string_types, bytes)):
+            try:
+                payload = _decode(payload)
+            except ValueError as e:
+                return [InvalidPayloadError(
+                    "Payload is not valid JSON: {0}".format(e), [])]
+        errors = []
+        self._check(payload, (), errors)
+        return errors
+
+
+#: Keywords only draft 3 of JSON schema has
+_DRAFT3 = frozenset(["disallow", "extends", "divisibleBy"])
+
+#: Keywords whose values map names to schemas, rather than being one
+_SCHEMA_MAPS = frozenset(["properties", "patternProperties", "definitions"])
+
+#: Keywords whose values are data, not schemas
+_DATA = frozenset(["enum", "default", "example"])
+
+
+def _is_draft3(schema):
+    """
+    ``True`` if ``schema`` uses keywords or values only draft 3 has, e.g.
+    ``required: true``, ``type: any`` or schemas as types.
+    """
+    todo, seen = [schema], set()
+    while todo:
+        node = _subject(todo.pop())
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, list):
+            todo.extend(node)
+            continue
+        if not isinstance(node, dict):
+            continue
+        types = node.get("type")
+        types = types if isinstance(types, list) else [types]
+        if _DRAFT3.intersection(node) or \
+                isinstance(node.get("required"), bool) or \
+                any(t == "any" or isinstance(t, dict) for t in types):
+            return True
+        for keyword, value in iteritems(node):
+            if keyword in _SCHEMA_MAPS and isinstance(value, dict):
+                todo.extend(itervalues(value))
+            elif keyword not in _DATA:
+                todo.append(value)
+    return False
+
+
+def _jsonschema():
+    """
+    The ``jsonschema`` module, imported on first use so that it only
+    slows down the import of callers that validate; ``None`` if it is
+    not installed or disabled by :py:data:`JSONSCHEMA`.
+    """
+    global JSONSCHEMA
+    if JSONSCHEMA is False:
+        return None
+    try:
+        import jsonschema
+    except ImportError:  # NOCOV
+        JSONSCHEMA = False
+        return None
+    JSONSCHEMA = True
+    return jsonschema
+
+
+def _jsonschema_class(jsonschema, schema):
+    # without ``$schema``, ``jsonschema`` assumes its latest draft, while
+    # RAML 0.8 APIs mostly use draft 3 (or 4)
+    default = jsonschema.Draft3Validator if _is_draft3(schema) \
+        else jsonschema.Draft4Validator
+    return jsonschema.validators.validator_for(schema, default)
+
+
+class _JSONSchemaValidator(SchemaValidator):
+    """
+    A :py:class:`SchemaValidator` backed by ``jsonschema``.  Payloads that
+    ``jsonschema`` fails on, e.g. for an unknown type, are checked by
+    :py:class:`SchemaValidator` instead, compiled the first time that
+    happens.
+
+    :param dict schema: Decoded JSON schema, valid for ``cls``
+    :param cls: ``jsonschema`` validator class of the schema's draft
+    """
+    __slots__ = ()
+
+    def __init__(self, schema, cls):
+        self.schema = schema = _subject(schema)
+        validator = cls(schema)
+        fallback = []
+
+        def check(value, path, errors):
+            try:
+                found = [InvalidPayloadError(e.message, list(e.absolute_path))
+                         for e in validator.iter_errors(value)]
+            except Exception:
+                if not fallback:
+                    fallback.append(_compiled(schema))
+                return fallback[0](value, path, errors)
+            errors.extend(found)
+        self._check = check
+
+
+def _compile(schema):
+    """
+    A new validator of ``schema``: a :py:class:`_JSONSchemaValidator` if
+    ``jsonschema`` is installed and accepts the schema, and a
+    :py:class:`SchemaValidator` otherwise.
+    """
+    jsonschema = _jsonschema()
+    if jsonschema is not None:
+        cls = _jsonschema_class(jsonschema, schema)
+        try:
+            cls.check_schema(schema)
+        except Exception:  # ``SchemaError``, or e.g. a recursive schema
+            pass
+        else:
+            return _JSONSchemaValidator(schema, cls)
+    return SchemaValidator(schema)
+
+
+_lock = threading.Lock()
+_by_id = OrderedDict()
+_by_digest = {}
+
+
+def _digest(schema):
+    try:
+        data = json.dumps(schema, sort_keys=True)
+    except (TypeError, ValueError):  # e.g. a recursive ``jsonref`` schema
+        return None
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def validator_for(schema):
+    """
+    Returns the compiled validator of the JSON ``schema``: a callable
+    taking a payload and returning a list of
+    :py:class:`.errors.InvalidPayloadError` s.
+
+    Validators are cached by the identity of the schema and, for other
+    schema objects, by the hash of its content, so all endpoints that
+    share a schema share its validator.  Of more than
+    :py:data:`VALIDATOR_CACHE_SIZE` schemas, the least recently used
+    ones are dropped.  ``jsonschema`` is used if it is
+    installed and the schema is valid for its draft (draft 3 or 4 unless
+    set by ``$schema``), and :py:class:`SchemaValidator` otherwise.
+
+    :param dict schema: Decoded JSON schema, e.g. :py:attr:`.Body.schema`
+    """
+    schema = _subject(schema)
+    key = id(schema)
+    with _lock:
+        entry = _by_id.get(key)
+        if entry is not None and entry[0] is schema:
+            # move to the end to mark as most recently used
+            del _by_id[key]
+            _by_id[key] = entry
+            return entry[2]
+
+    digest = _digest(schema)
+    with _lock:
+        validator = _by_digest.get(digest) if digest else None
+        if validator is None:
+            validator = _compile(schema)
+            if digest:
+                _by_digest[digest] = validator
+        # keeps ``schema`` alive, so that its id is not reused
+        _by_id.pop(key, None)
+        _by_id[key] = (schema, digest, validator)
+        while len(_by_id) > VALIDATOR_CACHE_SIZE:
+            _, (_, old, _) = _by_id.popitem(last=False)
+            if old and not any(d == old for _, d, _ in _by_id.values()):
+                _by_digest.pop(old, None)
+    return validator
+
+
+def clear_cache():
+    """Drops all validators compiled by :py:func:`validator_for`."""
+    with _lock:
+        _by_id.clear()
+        _by_digest.clear()
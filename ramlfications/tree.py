@@ -14,7 +14,7 @@ from six import iteritems, itervalues
 from termcolor import colored
 
 from .config import setup_config
-from .parser import parse_raml
+from .parser import parse_raml, PROFILES
 
 COLOR_MAP = {
     "light": (('white', None),
@@ -124,6 +124,15 @@ def _print_tree(api, ordered_resources, print_color, verbosity):
     _print_verbosity(ordered_resources, print_color, verbosity)
 
 
+def _tree_fields(verbosity, config):
+    """Only builds the resource attributes printed, unless validating."""
+    if str(config.get("validate")).lower() == "true":
+        return None
+    if verbosity > 1:
+        return PROFILES["routing"] + ("query_params", "form_params")
+    return "routing"
+
+
 def tree(load_obj, color, output, verbosity, validate, config):  # NOCOV
     """
     Create a tree visualization of given RAML file.
@@ -143,7 +152,7 @@ def tree(load_obj, color, output, verbosity, validate, config):  # NOCOV
         according to RAML `specification <http://raml.org/spec.html>`_.
     """
     config = setup_config(config)
-    api = parse_raml(load_obj, config)
+    api = parse_raml(load_obj, config, _tree_fields(verbosity, config))
     resources = _get_tree(api)
 
     if output:
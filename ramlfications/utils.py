@@ -4,23 +4,29 @@
 from __future__ import absolute_import, division, print_function
 
 
+from contextlib import contextmanager
 import json
 import logging
 import os
 import re
 import sys
+import threading
 
 try:
     from collections import OrderedDict
 except ImportError:  # NOCOV
     from ordereddict import OrderedDict
 
-from six import iterkeys, iteritems
+from six import (
+    integer_types, iterkeys, iteritems, itervalues, string_types
+)
 import xmltodict
 
 from .errors import MediaTypeError
+from .loader import LazyInclude
 from .parameters import (
-    Body, URIParameter, Header, FormParameter, QueryParameter
+    Body, Response, BaseParameter, URIParameter, Header, FormParameter,
+    QueryParameter, NAMED_PARAMS
 )
 
 PYVER = sys.version_info[:3]
@@ -45,14 +51,67 @@ else:
 IANA_URL = "https://www.iana.org/assignments/media-types/media-types.xml"
 
 
+#: Maximum number of decoded schemas & examples memoized during a parse
+SCHEMA_MEMO_SIZE = 128
+
+_schemas = threading.local()
+_interned = threading.local()
+
+
+def _schema_memo():
+    """The memo of the current thread's parse, or ``None``."""
+    return getattr(_schemas, "memo", None)
+
+
+@contextmanager
+def _memoize_schemas(memo=None):
+    """
+    While active, :py:func:`load_schema` returns the same decoded object
+    for equal schema/example strings instead of decoding them again.
+    Nested blocks share the memo of the outer one unless given ``memo``,
+    e.g. the one of an earlier parse of the same API.
+    """
+    previous = _schema_memo()
+    if memo is None:
+        memo = previous if previous is not None else OrderedDict()
+    _schemas.memo = memo
+    try:
+        yield memo
+    finally:
+        _schemas.memo = previous
+
+
 def load_schema(data):
     """
     Load Schema/Example data depending on its type (JSON, XML).
 
     If error in parsing as JSON and XML, just returns unloaded data.
+    A not yet loaded :py:class:`.loader.LazyInclude` is wrapped so that
+    it is only loaded & parsed on first access.
+
+    While parsing, equal strings are only decoded once, and share the
+    decoded object.
 
     :param str data: schema/example data
     """
+    if isinstance(data, LazyInclude):
+        return LazyInclude(lambda: load_schema(data.__subject__))
+    memo = _schema_memo()
+    if memo is None or not isinstance(data, string_types):
+        return _decode_schema(data)
+
+    # keyed by the string itself: equal strings share a hash & entry
+    try:
+        value = memo.pop(data)
+    except KeyError:
+        value = _decode_schema(data)
+    memo[data] = value  # most recently used last
+    if len(memo) > SCHEMA_MEMO_SIZE:
+        memo.popitem(last=False)
+    return value
+
+
+def _decode_schema(data):
     try:
         return json.loads(data)
     except Exception:  # POKEMON!
@@ -66,6 +125,71 @@ def load_schema(data):
     return data
 
 
+def _intern_table():
+    """The parameter table of the current thread's parse, or ``None``."""
+    return getattr(_interned, "table", None)
+
+
+@contextmanager
+def _interning(table):
+    """
+    While active, :py:func:`_intern` shares parameter objects through
+    ``table``, a ``dict``.  ``None`` turns sharing off.
+    """
+    previous = _intern_table()
+    _interned.table = table
+    try:
+        yield table
+    finally:
+        _interned.table = previous
+
+
+def _freeze(data):
+    """Hashable equivalent of loaded RAML ``data``."""
+    if isinstance(data, LazyInclude):
+        raise TypeError("not loaded yet")
+    if isinstance(data, dict):
+        return dict, tuple((k, _freeze(v)) for k, v in iteritems(data))
+    if isinstance(data, (list, tuple)):
+        return list, tuple(_freeze(v) for v in data)
+    if isinstance(data, (bool, float) + integer_types):
+        # keep e.g. ``1`` and ``true`` apart
+        return type(data), data
+    return data
+
+
+#: Properties that make up the identity of an interned parameter
+INTERN_PROPERTIES = ["raw"] + NAMED_PARAMS + ["method"]
+
+
+def _intern(param):
+    """
+    Returns the first URI, query or form parameter or header seen while
+    interning that is of the same class, name and properties as
+    ``param``, or ``param`` itself.  Other objects are returned as is.
+    """
+    table = _intern_table()
+    if table is None or not isinstance(param, (BaseParameter, Header)):
+        return param
+    try:
+        key = (type(param), param.name) + tuple(
+            _freeze(getattr(param, n, None)) for n in INTERN_PROPERTIES
+        )
+        return table.setdefault(key, param)
+    except TypeError:  # unhashable, e.g. a lazily included declaration
+        return param
+
+
+def _defined(data):
+    """
+    Truthiness of RAML data that does not force loading a
+    :py:class:`.loader.LazyInclude`.
+    """
+    if isinstance(data, LazyInclude):
+        return True
+    return bool(data)
+
+
 def setup_logger(key):
     """General logger"""
     log = logging.getLogger(__name__)
@@ -193,6 +317,58 @@ def update_mime_types():
     log.debug("Done! Supported IANA MIME media types have been updated.")
 
 
+#####
+# Name-indexed lookups of root definitions
+#####
+
+def _lookup_table(root, name, items, key):
+    """
+    Returns a ``dict`` index of ``items`` keyed by ``key(item)``, cached
+    on ``root`` under ``name``.  The first item for a key wins, just like
+    a linear scan.  The index is rebuilt if ``items`` is replaced, e.g.
+    once ``root.resource_types`` is set.
+    """
+    tables = root.__dict__.setdefault("_lookup_tables", {})
+    table = tables.get(name)
+    if table is None or table[0] is not items:
+        index = {}
+        for item in items or []:
+            index.setdefault(key(item), item)
+        table = tables[name] = (items, index)
+    return table[1]
+
+
+def _lookup(index, name):
+    try:
+        return index.get(name)
+    except TypeError:  # unhashable, e.g. a parameterized trait
+        return None
+
+
+def _trait_lookup(assigned, root):
+    """Returns the ``TraitNode`` object named ``assigned``, or ``None``."""
+    index = _lookup_table(root, "traits", root.traits, lambda t: t.name)
+    return _lookup(index, assigned)
+
+
+def _resource_type_method_lookup(assigned, method, root):
+    """
+    Returns the ``ResourceTypeNode`` object named ``assigned`` for
+    ``method``, or ``None``.
+    """
+    index = _lookup_table(root, "resource_types_by_method",
+                          root.resource_types, lambda r: (r.name, r.method))
+    return _lookup(index, (assigned, method))
+
+
+def _raw_scheme_lookup(name, root):
+    """Returns the raw ``{name: data}`` security scheme, or ``None``."""
+    schemes = _get(root.raw, "securitySchemes", [])
+    index = _lookup_table(root, "raw_security_schemes", schemes,
+                          lambda s: list(iterkeys(s))[0])
+    return _lookup(index, name)
+
+
 def _resource_type_lookup(assigned, root):
     """
     Returns ``ResourceType`` object
@@ -200,11 +376,9 @@ def _resource_type_lookup(assigned, root):
     :param str assigned: The string name of the assigned resource type
     :param root: RAML root object
     """
-    res_types = root.resource_types
-    if res_types:
-        res_type_obj = [r for r in res_types if r.name == assigned]
-        if res_type_obj:
-            return res_type_obj[0]
+    index = _lookup_table(root, "resource_types", root.resource_types,
+                          lambda r: r.name)
+    return _lookup(index, assigned)
 
 
 #####
@@ -261,7 +435,7 @@ def _create_base_param_obj(attribute_data, param_obj, config, errors, **kw):
             kwargs["method"] = _get(kw, "method")
 
         item = param_obj(**kwargs)
-        objects.append(item)
+        objects.append(_intern(item))
 
     return objects or None
 
@@ -313,9 +487,11 @@ def __get_sets(child, parent):
         child_keys = list(iterkeys(child))
     if parent:
         parent_keys = list(iterkeys(parent))
-    child_diff = list(set(child_keys) - set(parent_keys))
-    parent_diff = list(set(parent_keys) - set(child_keys))
-    intersection = list(set(child_keys).intersection(parent_keys))
+    # keep the order of definition, so merged data is ordered the same
+    # on every run
+    child_diff = [k for k in child_keys if k not in parent_keys]
+    parent_diff = [k for k in parent_keys if k not in child_keys]
+    intersection = [k for k in child_keys if k in parent_keys]
     opt_inters = [i for i in child_keys if str(i) + "?" in parent_keys]
     intersection = intersection + opt_inters
 
@@ -352,10 +528,48 @@ def _get_data_union(child, parent):
     return union
 
 
-def _get_inherited_resource(res_name, resource_types):
-    for resource in resource_types:
-        if res_name == list(iterkeys(resource))[0]:
-            return resource
+def _assigned_type_name(data):
+    """Name of the resource type that ``data`` inherits from, if any."""
+    assigned = _get(data, "type")
+    if isinstance(assigned, dict):
+        return list(iterkeys(assigned))[0]
+    return assigned
+
+
+def _merge_resource_types(resource_types):
+    """
+    Returns the data of each resource type in ``resource_types``, keyed
+    by name, merged with the data of every type it inherits from (with
+    preference to the inheriting type).
+
+    Types are merged in topological order of their ``type`` references,
+    each one once, so multi-level chains are resolved in linear time.
+    A type that inherits from an undefined type is not merged, and an
+    inheritance cycle is cut where it is first entered.
+    """
+    raw = OrderedDict()
+    for res in resource_types:
+        for k, v in list(iteritems(res)):
+            raw.setdefault(k, v)
+
+    merged = {}
+    for name in raw:
+        # walk up the chain until a type that is merged already, the
+        # top of the chain, or the start of a cycle
+        chain = []
+        current = name
+        while current in raw and current not in merged and \
+                current not in chain:
+            chain.append(current)
+            current = _assigned_type_name(raw[current])
+        base = merged.get(current)
+        for res_name in reversed(chain):
+            data = raw[res_name]
+            if isinstance(data, dict) and isinstance(base, dict):
+                data = _get_data_union(data, base)
+            merged[res_name] = data
+            base = data
+    return merged
 
 
 def _get_res_type_attribute(res_data, method_data, item, default={}):
@@ -364,30 +578,6 @@ def _get_res_type_attribute(res_data, method_data, item, default={}):
     return method_level, resource_level
 
 
-def _get_inherited_type_params(data, attribute, params, resource_types):
-    inherited = _get_inherited_resource(data.get("type"), resource_types)
-    inherited = inherited.get(data.get("type"))
-    inherited_params = inherited.get(attribute, {})
-
-    return dict(list(iteritems(params)) +
-                list(iteritems(inherited_params)))
-
-
-def _get_inherited_item(items, item_name, res_types, meth_, _data):
-    inherited = _get_inherited_resource(_data.get("type"), res_types)
-    resource = inherited.get(_data.get("type"))
-    res_level = resource.get(meth_, {}).get(item_name, {})
-
-    method_ = resource.get(meth_, {})
-    method_level = method_.get(item_name, {})
-    items = dict(
-        list(iteritems(items)) +
-        list(iteritems(res_level)) +
-        list(iteritems(method_level))
-    )
-    return items
-
-
 def _get_attribute_dict(data, item, v):
     resource_level = _get(v, item, {})
     method_level = _get(data, item, {})
@@ -439,13 +629,10 @@ def _get_parent(attribute, parent):
 def _get_resource_type(attribute, root, type_, method):
     """Returns ``attribute`` defined in the resource type, or ``None``."""
     if type_ and root.resource_types:
-        types = root.resource_types
-        r_type = [r for r in types if r.name == type_]
-        r_type = [r for r in r_type if r.method == method]
-        if r_type:
-            if hasattr(r_type[0], attribute):
-                if getattr(r_type[0], attribute) is not None:
-                    return getattr(r_type[0], attribute)
+        r_type = _resource_type_method_lookup(type_, method, root)
+        if r_type is not None:
+            if getattr(r_type, attribute, None) is not None:
+                return getattr(r_type, attribute)
     return []
 
 
@@ -453,28 +640,22 @@ def _get_trait(attribute, root, is_):
     """Returns ``attribute`` defined in a trait, or ``None``."""
 
     if is_:
-        traits = root.traits
-        if traits:
+        if root.traits:
             trait_objs = []
             for i in is_:
-                trait = [t for t in traits if t.name == i]
-                if trait:
-                    if hasattr(trait[0], attribute):
-                        if getattr(trait[0], attribute) is not None:
-                            trait_objs.extend(getattr(trait[0], attribute))
+                trait = _trait_lookup(i, root)
+                if trait is not None:
+                    if getattr(trait, attribute, None) is not None:
+                        trait_objs.extend(getattr(trait, attribute))
             return trait_objs
     return []
 
 
 def _get_scheme(item, root):
-    schemes = root.raw.get("securitySchemes", [])
-    for s in schemes:
-        if isinstance(item, str):
-            if item == list(iterkeys(s))[0]:
-                return s
-        elif isinstance(item, dict):
-            if list(iterkeys(item))[0] == list(iterkeys(s))[0]:
-                return s
+    if isinstance(item, str):
+        return _raw_scheme_lookup(item, root)
+    elif isinstance(item, dict):
+        return _raw_scheme_lookup(list(iterkeys(item))[0], root)
 
 
 def _get_attribute(attribute, method, raw_data):
@@ -490,23 +671,77 @@ def _get_inherited_attribute(attribute, root, type_, method, is_):
     return type_objects + trait_objects
 
 
-# TODO: refactor - this ain't pretty
-def _remove_duplicates(inherit_params, resource_params):
-    ret = []
-    if isinstance(resource_params[0], Body):
-        _params = [p.mime_type for p in resource_params]
-    else:
-        _params = [p.name for p in resource_params]
+#####
+# Merging inherited parameters, bodies & responses
+#####
 
-    for p in inherit_params:
-        if isinstance(p, Body):
-            if p.mime_type not in _params:
-                ret.append(p)
-        else:
-            if p.name not in _params:
-                ret.append(p)
-    ret.extend(resource_params)
-    return ret or None
+def _merge_key(item):
+    """
+    Identifies ``item`` when merging: the MIME type of a ``Body``, the
+    code of a ``Response``, and the name of a parameter.
+    """
+    if isinstance(item, Body):
+        return item.mime_type
+    if isinstance(item, Response):
+        return item.code
+    return item.name
+
+
+def _keyed(levels):
+    """
+    Returns an ``OrderedDict`` of the items in ``levels``, lists given in
+    order of precedence (e.g. resource, method, trait, type, parent, root),
+    by :py:func:`_merge_key`.  Of items with equal keys the one of the
+    first level wins, at the position its key was first seen.
+    """
+    merged = OrderedDict()
+    for level in levels:
+        for item in level or ():
+            merged.setdefault(_merge_key(item), item)
+    return merged
+
+
+def _keyed_responses(levels):
+    """
+    Like :py:func:`_keyed` for ``Response`` s, but a response of a code
+    seen before is merged into the earlier one rather than dropped: their
+    headers and bodies are merged with :py:func:`_merge`, and the first
+    description is kept.
+    """
+    merged = OrderedDict()
+    for level in levels:
+        for resp in level or ():
+            first = merged.get(resp.code)
+            if first is None:
+                merged[resp.code] = resp
+                continue
+            merged[resp.code] = Response(
+                code=first.code,
+                raw=first.raw,
+                method=first.method,
+                desc=first.desc or resp.desc,
+                headers=_merge([first.headers, resp.headers]),
+                body=_merge([first.body, resp.body]),
+                config=first.config,
+                errors=first.errors
+            )
+    return merged
+
+
+def _merge(levels, own=None):
+    """
+    Merges ``levels`` like :py:func:`_keyed`.  Items in ``own``, i.e.
+    defined on the node itself, override those of all levels and are
+    listed after them.
+
+    :returns: list of merged items, or ``None``
+    """
+    merged = _keyed(levels)
+    for item in own or ():
+        key = _merge_key(item)
+        merged.pop(key, None)
+        merged[key] = item
+    return list(itervalues(merged)) or None
 
 
 def _map_inheritance(nodetype):
@@ -596,46 +831,12 @@ def _create_uri_params(unparsed, parsed, root_params, root, type_, is_,
     params, param_objs = __create_params(unparsed, parsed, method, raw_data,
                                          root, URIParameter, type_, is_)
 
-    if params:
-        param_objs.extend(params)
-    if parent and parent.uri_params:
-        param_objs.extend(parent.uri_params)
-    if root_params:
-        param_names = [p.name for p in param_objs]
-        _params = [p for p in root_params if p.name not in param_names]
-        param_objs.extend(_params)
-    return param_objs or None
+    parent_params = parent.uri_params if parent else None
+    return _merge([params, param_objs, parent_params, root_params])
 # <--[uri]-->
 
 
 # <--[query, base uri, form]-->
-def _check_already_exists(param, ret_list):
-    if isinstance(param, Body):
-        param_name_list = [p.mime_type for p in ret_list]
-        if param.mime_type not in param_name_list:
-            ret_list.append(param)
-            param_name_list.append(param.mime_type)
-
-    else:
-        param_name_list = [p.name for p in ret_list]
-        if param.name not in param_name_list:
-            ret_list.append(param)
-            param_name_list.append(param.name)
-    return ret_list
-
-
-# TODO: refactor - this ain't pretty
-def __remove_duplicates(to_clean):
-    # order: resource, inherited, parent, root
-    ret = []
-
-    for param_set in to_clean:
-        if param_set:
-            for p in param_set:
-                ret = _check_already_exists(p, ret)
-    return ret or None
-
-
 def _map_parsed_str(parsed):
     name = parsed.split("_")[:-1]
     name.append("parameters")
@@ -669,14 +870,10 @@ def set_params(data, param_str, root, method, inherit=False, **kw):
         parent_params = getattr(parent, param_str, [])
 
     # root objects
-    root = kw.get("root_params")
-    if root:
-        param_names = [p.name for p in param_objs]
-        root_params = [p for p in root if p.name not in param_names]
+    root_params = kw.get("root_params")
 
-    to_clean = (params, param_objs, parent_params, root_params)
-
-    return __remove_duplicates(to_clean)
+    # order: resource, inherited, parent, root
+    return _merge([params, param_objs, parent_params, root_params])
 # <--[query, base uri, form]-->
 
 
@@ -725,9 +922,11 @@ def _preserve_uri_order(path, param_objs, config, errors, declared=[]):
                                   type=_get(data, "type", "string"),
                                   config=config,
                                   errors=errors)
-            param_objs.append(_param)
+            param_objs.append(_intern(_param))
+    by_name = {}
+    for p in param_objs:
+        by_name.setdefault(p.name, p)
     for p in params:
-        _param = [i for i in param_objs if i.name == p]
-        if _param:
-            sorted_params.append(_param[0])
+        if p in by_name:
+            sorted_params.append(by_name[p])
     return sorted_params or None
@@ -5,13 +5,18 @@ from __future__ import absolute_import, division, print_function
 
 import re
 
+import attr
 from six import iterkeys
 
-from ._decorators import collecterrors
+from ._decorators import collecterrors, skippable
 
 from .errors import *  # NOQA
 
 
+#: Requires a ``dict``, e.g. the ``raw`` data of an object
+dict_type = skippable(attr.validators.instance_of(dict))
+
+
 #####
 # RAMLRoot validators
 #####
@@ -120,13 +125,27 @@ def root_media_type(inst, attr, value):
             raise InvalidRootNodeError(msg)
 
 
-@collecterrors
-def root_resources(inst, attr, value):
-    if not value:
+def _require_resources(found):
+    if not found:
         msg = "API does not define any resources."
         raise InvalidRootNodeError(msg)
 
 
+@collecterrors
+def root_resources(inst, attr, value):
+    _require_resources(value)
+
+
+@collecterrors
+def root_has_resources(inst, attr, value):
+    """
+    Checks ``value``, whether any resource was parsed, in place of
+    :py:func:`root_resources` when the resources are not collected on
+    the root node.
+    """
+    _require_resources(value)
+
+
 @collecterrors
 def root_secured_by(inst, attr, value):
     pass
@@ -109,7 +109,8 @@ setup(
     package_data={"": ["data/supported_mime_types.json"]},
     install_requires=install_requires(),
     extras_require={
-        "all": ["requests[security]"]
+        "all": ["requests[security]", "jsonschema>=2.6.0"],
+        "jsonschema": ["jsonschema>=2.6.0"],
     },
     tests_require=[
         "pytest", "mock"
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2015 Spotify AB
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+
+import jsonref
+import pytest
+from six import StringIO
+
+from ramlfications import export
+from ramlfications import loads, parse
+from ramlfications import parser as pw
+from ramlfications.config import setup_config
+from ramlfications._helpers import load_file
+
+from .base import EXAMPLES
+
+
+@pytest.fixture(scope="session")
+def api():
+    raml_file = os.path.join(EXAMPLES + "complete-valid-example.raml")
+    loaded_raml_file = load_file(raml_file)
+    config = setup_config(EXAMPLES + "test-config.ini")
+    return pw.parse_raml(loaded_raml_file, config)
+
+
+def test_to_dict(api):
+    data = api.to_dict()
+    assert data == json.loads(json.dumps(data))
+    assert data["title"] == api.title
+    assert data["documentation"][0] == {
+        "title": api.documentation[0].title.raw,
+        "content": api.documentation[0].content.raw,
+    }
+    for name in ("raw", "raml_obj", "config", "errors", "resource_groups"):
+        assert name not in data
+    assert len(data["resources"]) == len(api.resources)
+
+    for node, res in zip(api.resources, data["resources"]):
+        assert res["path"] == node.path
+        assert res["method"] == node.method
+        for name in ("root", "group", "raw", "errors", "_lazy"):
+            assert name not in res
+        # references to other nodes are replaced by their index
+        if node.parent is not None:
+            assert api.resources[res["parent"]] is node.parent
+        if node.resource_type is not None:
+            assert api.resource_types[res["resource_type"]] is \
+                node.resource_type
+        assert [api.traits[i] for i in res["traits"] or []] == \
+            (node.traits or [])
+        assert [api.security_schemes[i] for i in
+                res["security_schemes"] or []] == (node.security_schemes or [])
+
+    widgets = data["resources"][0]
+    assert widgets["query_params"][0]["name"] == "ids"
+    assert "config" not in widgets["query_params"][0]
+
+    with_raw = api.to_dict(raw=True)
+    assert with_raw["raw"] == json.loads(json.dumps(api.raw))
+    assert with_raw["resources"][0]["raw"] is not None
+    assert "raw" in with_raw["resources"][0]["query_params"][0]
+
+
+def test_dump(api):
+    fp = StringIO()
+    api.dump(fp)
+    assert json.loads(fp.getvalue()) == api.to_dict()
+    # one chunk per node, rather than the whole document at once
+    chunks = list(export.iterencode(api))
+    assert "".join(chunks) == fp.getvalue()
+    nodes = len(api.resources) + len(api.resource_types) + \
+        len(api.traits) + len(api.security_schemes)
+    assert len(chunks) > nodes
+
+
+def test_dump_jsonref():
+    raml = loads("""#%RAML 0.8
+title: Export API
+/things:
+  get:
+""")
+    api = pw.parse_raml(raml, setup_config(EXAMPLES + "test-config.ini"))
+    api.schemas = [{"node": jsonref.loads(json.dumps({
+        "type": "object",
+        "properties": {"next": {"$ref": "#"}},
+    }))}]
+    fp = StringIO()
+    api.dump(fp)
+    data = json.loads(fp.getvalue())
+    assert data["schemas"] == [{"node": {
+        "type": "object", "properties": {"next": {"$ref": "#"}},
+    }}]
+    assert data["resource_types"] is None
+    assert data["resources"][0]["path"] == "/things"
+
+
+def test_dump_unloaded():
+    raml_file = os.path.join(EXAMPLES + "complete-valid-example.raml")
+    config = os.path.join(EXAMPLES + "test-config.ini")
+    api = parse(raml_file, config, fields="routing")
+
+    fp = StringIO()
+    api.dump(fp)
+    assert "UNLOADED" not in fp.getvalue()
+    data = json.loads(fp.getvalue())
+    assert data == api.to_dict()
+    resource = data["resources"][0]
+    assert "responses" not in resource
+    assert resource["uri_params"] == export._plain(api.resources[0].uri_params,
+                                                   False)
+
+
+@pytest.mark.parametrize("raml_file", ["md_includes.raml",
+                                       "complete-valid-example.raml"])
+def test_dump_lazy_includes(raml_file):
+    raml_file = os.path.join(EXAMPLES + raml_file)
+    config = os.path.join(EXAMPLES + "test-config.ini")
+    eager = parse(raml_file, config)
+    lazy = parse(raml_file, config, lazy_includes=True)
+
+    fp = StringIO()
+    lazy.dump(fp)
+    assert json.loads(fp.getvalue()) == eager.to_dict()
+    assert lazy.to_dict() == eager.to_dict()
@@ -5,11 +5,13 @@ import os
 
 import pytest
 
-from ramlfications import parse, load, loads, validate
+from ramlfications import (
+    parse, load, loads, validate, iter_resources, parse_many, validate_many
+)
 from ramlfications.raml import RootNode
-from ramlfications.errors import LoadRAMLError
+from ramlfications.errors import InvalidRAMLError, LoadRAMLError
 
-from .base import EXAMPLES
+from .base import EXAMPLES, VALIDATE
 
 
 @pytest.fixture(scope="session")
@@ -67,3 +69,321 @@ def test_validate_nonexistant_file():
     raml_file = "/tmp/non-existant-raml-file.raml"
     with pytest.raises(LoadRAMLError):
         validate(raml_file)
+
+
+def _write_cached_raml(tmpdir):
+    tmpdir.join("ref.json").write('{"type": "string"}')
+    tmpdir.join("schema.json").write(
+        '{"type": "object", "properties": {"a": {"$ref": "ref.json"}}}')
+    raml_file = tmpdir.join("api.raml")
+    raml_file.write("#%RAML 0.8\n"
+                    "title: Cached API\n"
+                    "baseUri: https://api.example.com\n"
+                    "schemas:\n"
+                    "  - foo: !include schema.json\n"
+                    "/foo:\n"
+                    "  get:\n")
+    return raml_file
+
+
+def test_parse_cache_dir(tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    raml_file = _write_cached_raml(tmpdir)
+
+    first = parse(raml_file.strpath, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+    if os.name == "posix":
+        assert os.stat(cache_dir).st_mode & 0o777 == 0o700
+
+    second = parse(raml_file.strpath, cache_dir=cache_dir)
+    assert second is not first
+    assert isinstance(second, RootNode)
+    assert second.title == "Cached API"
+    assert second.resources[0].path == "/foo"
+    assert second.schemas[0]["foo"]["properties"]["a"]["type"] == "string"
+
+
+def test_parse_cache_dir_invalidated_by_ref(tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    raml_file = _write_cached_raml(tmpdir)
+    parse(raml_file.strpath, cache_dir=cache_dir)
+
+    tmpdir.join("ref.json").write('{"type": "integer"}')
+    result = parse(raml_file.strpath, cache_dir=cache_dir)
+    assert result.schemas[0]["foo"]["properties"]["a"]["type"] == "integer"
+
+
+def test_parse_cache_dir_keyed_by_config(tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    raml_file = _write_cached_raml(tmpdir)
+    config = os.path.join(EXAMPLES + "test-config.ini")
+
+    parse(raml_file.strpath, cache_dir=cache_dir)
+    parse(raml_file.strpath, config, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 4
+
+
+def test_parse_cache_dir_keyed_by_lazy_includes(tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    raml_file = _write_cached_raml(tmpdir)
+
+    parse(raml_file.strpath, cache_dir=cache_dir)
+    parse(raml_file.strpath, cache_dir=cache_dir, lazy_includes=True)
+    assert len(os.listdir(cache_dir)) == 4
+    load(raml_file.strpath, cache_dir=cache_dir)
+    load(raml_file.strpath, cache_dir=cache_dir, lazy_includes=True)
+    assert len(os.listdir(cache_dir)) == 8
+
+
+def test_parse_cache_dir_lazy_includes_uncacheable(tmpdir, monkeypatch):
+    from ramlfications import loader
+
+    cache_dir = tmpdir.join("cache").strpath
+    raml_file = _write_cached_raml(tmpdir)
+    # as if schema.json had a remote $ref, found once it is loaded
+    monkeypatch.setattr(loader, "_json_ref_files", lambda *a, **kw: None)
+
+    result = parse(raml_file.strpath, cache_dir=cache_dir,
+                   lazy_includes=True)
+    assert result.schemas[0]["foo"]["properties"]["a"]["type"] == "string"
+    assert not os.path.exists(cache_dir) or not os.listdir(cache_dir)
+
+
+def test_load_cache_dir(tmpdir):
+    cache_dir = tmpdir.join("cache").strpath
+    raml_file = _write_cached_raml(tmpdir)
+
+    first = load(raml_file.strpath, cache_dir=cache_dir)
+    second = load(raml_file.strpath, cache_dir=cache_dir)
+    assert first == second
+
+    raml_file.write(raml_file.read().replace("Cached API", "Changed API"))
+    assert load(raml_file.strpath, cache_dir=cache_dir)["title"] == \
+        "Changed API"
+
+
+def test_parse_lazy_includes():
+    from ramlfications.loader import LazyInclude
+
+    raml_file = os.path.join(EXAMPLES + "complete-valid-example.raml")
+    eager = parse(raml_file)
+    lazy = parse(raml_file, lazy_includes=True)
+
+    assert isinstance(lazy.schemas[0]["Thingy"], LazyInclude)
+    assert not lazy.schemas[0]["Thingy"].loaded
+    assert lazy.schemas == eager.schemas
+    for eager_res, lazy_res in zip(eager.resources, lazy.resources):
+        assert lazy_res.body == eager_res.body
+        assert lazy_res.responses == eager_res.responses
+
+
+def test_parse_lazy_includes_markdown():
+    raml_file = os.path.join(EXAMPLES + "md_includes.raml")
+    config = os.path.join(EXAMPLES + "test-config.ini")
+    eager = parse(raml_file, config)
+    lazy = parse(raml_file, config, lazy_includes=True)
+
+    # only JSON includes are lazy; documentation is read right away
+    content = lazy.documentation[0].content
+    assert content.html == eager.documentation[0].content.html
+    assert content.raw == eager.documentation[0].content.raw
+
+
+@pytest.mark.parametrize("raml_file,config_file", [
+    ("complete-valid-example.raml", "test-config.ini"),
+    ("github.raml", "github-config.ini"),
+    ("twitter.raml", "twitter-config.ini"),
+])
+def test_iter_resources(raml_file, config_file):
+    raml_file = os.path.join(EXAMPLES + raml_file)
+    config = os.path.join(EXAMPLES + config_file)
+    expected = parse(raml_file, config).resources
+    result = list(iter_resources(raml_file, config))
+
+    assert len(result) == len(expected)
+    for res, exp in zip(result, expected):
+        assert (res.name, res.method, res.path) == \
+            (exp.name, exp.method, exp.path)
+        assert (res.parent and res.parent.path) == \
+            (exp.parent and exp.parent.path)
+        assert res.query_params == exp.query_params
+        assert res.responses == exp.responses
+
+
+def test_iter_resources_deeply_nested(tmpdir):
+    depth = 100
+    raml = "#%RAML 0.8\ntitle: Deep\nbaseUri: https://deep.example.com\n"
+    for i in range(depth):
+        raml += "{0}/r{1}:\n{0}  get:\n".format("  " * i, i)
+    raml_file = tmpdir.join("deep.raml")
+    raml_file.write(raml)
+
+    resources = iter_resources(raml_file.strpath)
+    first = next(resources)
+    assert first.path == "/r0"
+    assert len(list(resources)) == depth - 1
+
+
+def test_iter_resources_invalid():
+    raml_file = os.path.join(VALIDATE + "empty-mapping-trait.raml")
+    config = os.path.join(VALIDATE + "valid-config.ini")
+    resources = iter_resources(raml_file, config)
+    with pytest.raises(InvalidRAMLError) as e:
+        list(resources)
+    msg = "The trait 'emptyTrait' requires definition."
+    assert msg in [str(err) for err in e.value.errors]
+
+
+def test_iter_resources_root():
+    raml_file = os.path.join(EXAMPLES + "complete-valid-example.raml")
+    config = os.path.join(EXAMPLES + "test-config.ini")
+    res = next(iter_resources(raml_file, config))
+    assert res.root.resources is None
+    assert res.root.resource_groups is None
+
+
+def test_iter_resources_none_defined():
+    raml_file = os.path.join(VALIDATE + "no-resources.raml")
+    config = os.path.join(VALIDATE + "valid-config.ini")
+    with pytest.raises(InvalidRAMLError) as e:
+        list(iter_resources(raml_file, config))
+    msg = "API does not define any resources."
+    assert [str(err) for err in e.value.errors] == [msg]
+
+
+def test_validation_is_per_parse():
+    from multiprocessing.pool import ThreadPool
+
+    from ramlfications.config import setup_config
+    from ramlfications.parser import parse_raml
+
+    raml_file = os.path.join(VALIDATE + "empty-mapping-trait.raml")
+    loaded = load(raml_file)
+    config = os.path.join(VALIDATE + "valid-config.ini")
+
+    def run(validate):
+        conf = setup_config(config)
+        conf["validate"] = validate
+        try:
+            parse_raml(loaded, conf)
+        except InvalidRAMLError:
+            return True
+        return False
+
+    jobs = [True, False] * 20
+    pool = ThreadPool(8)
+    try:
+        assert pool.map(run, jobs) == jobs
+    finally:
+        pool.close()
+        pool.join()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many(workers):
+    raml_files = [
+        os.path.join(EXAMPLES + "complete-valid-example.raml"),
+        os.path.join(VALIDATE + "empty-mapping-trait.raml"),
+        os.path.join(EXAMPLES + "this-file-does-not-exist.raml"),
+        os.path.join(EXAMPLES + "simple-tree.raml"),
+    ]
+    config = os.path.join(VALIDATE + "valid-config.ini")
+    results = list(parse_many(raml_files, config, workers=workers))
+
+    assert len(results) == 4
+    assert isinstance(results[0], RootNode)
+    assert results[0].title == parse(raml_files[0], config).title
+    assert isinstance(results[1], InvalidRAMLError)
+    msg = "The trait 'emptyTrait' requires definition."
+    assert msg in [str(err) for err in results[1].errors]
+    assert isinstance(results[2], LoadRAMLError)
+    assert isinstance(results[3], RootNode)
+
+
+def test_validate_many():
+    raml_files = [
+        os.path.join(EXAMPLES + "complete-valid-example.raml"),
+        os.path.join(VALIDATE + "empty-mapping-trait.raml"),
+    ] * 3
+    results = list(validate_many(raml_files, workers=2))
+
+    assert results[0::2] == [None] * 3
+    for result in results[1::2]:
+        assert isinstance(result, InvalidRAMLError)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pool_imap_unordered(workers):
+    from ramlfications import _pool
+    from ramlfications.config import setup_config
+
+    valid = os.path.join(EXAMPLES + "complete-valid-example.raml")
+    invalid = os.path.join(VALIDATE + "empty-mapping-trait.raml")
+    config = setup_config()
+    config["validate"] = True
+    results = list(_pool.imap_unordered(_pool._validate, [valid, invalid] * 2,
+                                        config, workers))
+
+    assert sorted(path for path, _ in results) == sorted([valid, invalid] * 2)
+    for path, error in results:
+        if path == valid:
+            assert error is None
+        else:
+            assert isinstance(error, InvalidRAMLError)
+
+
+def test_parse_lazy_attributes():
+    import pickle
+
+    raml_file = os.path.join(EXAMPLES + "complete-valid-example.raml")
+    config = os.path.join(EXAMPLES + "test-config.ini")
+    eager = parse(raml_file, config)
+    lazy = parse(raml_file, config, lazy_attributes=True)
+
+    fields = ("headers", "body", "responses", "query_params",
+              "form_params", "security_schemes")
+    res = lazy.resources[17]
+    assert sorted(res._lazy) == sorted(fields)
+    assert res.responses is res.responses
+    assert "responses" not in res._lazy
+
+    for lazy_res, eager_res in zip(lazy.resources, eager.resources):
+        for field in fields:
+            assert getattr(lazy_res, field) == getattr(eager_res, field)
+
+    res = pickle.loads(pickle.dumps(lazy.resources[0]))
+    assert res._lazy is None
+    assert res.headers == eager.resources[0].headers
+
+
+def test_parse_lazy_attributes_validate():
+    raml_file = os.path.join(VALIDATE + "invalid-response-code.raml")
+    config = os.path.join(VALIDATE + "valid-config.ini")
+    with pytest.raises(InvalidRAMLError):
+        parse(raml_file, config)
+
+    api = parse(raml_file, config, lazy_attributes=True)
+    res = api.resources[0]
+    assert res.query_params is None
+    with pytest.raises(InvalidRAMLError) as e:
+        res.load()
+    msg = "'299' not a valid HTTP response code."
+    assert [str(err) for err in e.value.errors] == [msg]
+    # the invalid value is still set
+    assert res.responses[0].code == 299
+
+
+@pytest.mark.parametrize("intern", [True, False])
+def test_parse_intern_params(intern):
+    raml_file = os.path.join(EXAMPLES + "complete-valid-example.raml")
+    config = os.path.join(EXAMPLES + "test-config.ini")
+    api = parse(raml_file, config, intern_params=intern)
+
+    params = []
+    for res in api.resources:
+        params.extend(res.uri_params or [])
+        params.extend(res.headers or [])
+        params.extend(res.query_params or [])
+    copies = [(a, b) for a in params for b in params if a == b]
+    assert copies
+    assert all(a is b for a, b in copies) is intern
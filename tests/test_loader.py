@@ -2,12 +2,16 @@
 # Copyright (c) 2015 Spotify AB
 from __future__ import absolute_import, division, print_function
 
+import copy
 import os
+import pickle
 
 import json
 import pytest
+import yaml
 from six import iteritems
 
+import ramlfications
 from ramlfications import loader
 from ramlfications.errors import LoadRAMLError
 
@@ -265,3 +269,228 @@ def test_jsonref_absolute_local_uri_file(tmpdir):
     raml = loader.RAMLLoader().load(raml_file.read())
     expected_data = lf.json_ref_absolute_expected
     assert dict_equal(raml, expected_data)
+
+
+@pytest.mark.skipif(not loader.LIBYAML, reason="PyYAML built without libyaml")
+@pytest.mark.parametrize("raml_file", [
+    "base-includes.raml", "nested-includes.raml", "json_includes.raml",
+    "complete-valid-example.raml",
+])
+def test_libyaml_matches_pure_python(raml_file):
+    raml_file = os.path.join(EXAMPLES + raml_file)
+    with open(raml_file) as f:
+        pure = loader.RAMLLoader(libyaml=False).load(f)
+    with open(raml_file) as f:
+        fast = loader.RAMLLoader(libyaml=True).load(f)
+
+    assert fast == pure
+    assert list(fast.keys()) == list(pure.keys())
+
+
+@pytest.mark.skipif(not loader.LIBYAML, reason="PyYAML built without libyaml")
+def test_libyaml_parser_error():
+    raml_obj = os.path.join(EXAMPLES, "invalid_yaml.yaml")
+    with pytest.raises(LoadRAMLError) as e:
+        loader.RAMLLoader(libyaml=True).load(open(raml_obj))
+    msg = "Error parsing RAML:"
+    assert msg in e.value.args[0]
+
+
+def test_libyaml_forced_but_unavailable(monkeypatch):
+    monkeypatch.setattr(loader, "LIBYAML", False)
+    with pytest.raises(LoadRAMLError):
+        loader.RAMLLoader(libyaml=True)
+
+    assert loader.RAMLLoader().yaml_loader is yaml.SafeLoader
+
+
+def _write_includes(tmpdir):
+    tmpdir.join("shared.yaml").write("foo: !include nested.yaml\n")
+    tmpdir.join("nested.yaml").write("bar: 1\n")
+    raml_file = tmpdir.join("api.raml")
+    raml_file.write("title: Cache Test\nshared: !include shared.yaml\n")
+    return raml_file
+
+
+def _load(raml_file, **kw):
+    with open(raml_file.strpath) as f:
+        return loader.RAMLLoader(**kw).load(f)
+
+
+def test_include_cache_hits(tmpdir):
+    cache = loader.IncludeCache()
+    raml_file = _write_includes(tmpdir)
+
+    first = _load(raml_file, include_cache=cache)
+    assert cache.info() == (0, 2, 256, 2)
+
+    second = _load(raml_file, include_cache=cache)
+    assert cache.info() == (1, 2, 256, 2)
+    assert first == second
+    assert first["shared"] is second["shared"]
+
+
+def test_include_cache_nested_change(tmpdir):
+    cache = loader.IncludeCache()
+    raml_file = _write_includes(tmpdir)
+
+    _load(raml_file, include_cache=cache)
+    tmpdir.join("nested.yaml").write("bar: 22\n")
+    raml = _load(raml_file, include_cache=cache)
+
+    assert raml["shared"]["foo"]["bar"] == 22
+    assert cache.hits == 0
+
+
+def test_include_cache_maxsize(tmpdir):
+    cache = loader.IncludeCache(maxsize=1)
+    raml_file = _write_includes(tmpdir)
+
+    _load(raml_file, include_cache=cache)
+    assert cache.info().currsize == 1
+
+    cache.clear()
+    assert cache.info() == (0, 0, 1, 0)
+
+
+def test_include_cache_not_shared_by_load():
+    raml_file = os.path.join(EXAMPLES, "base-includes.raml")
+    first = ramlfications.load(raml_file)
+    expected = copy.deepcopy(first)
+    for value in first.values():
+        if isinstance(value, dict):
+            value["mutated"] = True
+        elif isinstance(value, list):
+            value.append("mutated")
+    assert ramlfications.load(raml_file) == expected
+
+
+def test_include_cache_used_by_parse():
+    raml_file = os.path.join(EXAMPLES, "complete-valid-example.raml")
+    config = os.path.join(EXAMPLES, "test-config.ini")
+    ramlfications.parse(raml_file, config)
+    hits = loader.INCLUDE_CACHE.hits
+    ramlfications.parse(raml_file, config)
+    assert loader.INCLUDE_CACHE.hits > hits
+
+
+def test_include_cache_disabled(tmpdir):
+    raml_file = _write_includes(tmpdir)
+    first = _load(raml_file, include_cache=None)
+    second = _load(raml_file, include_cache=None)
+
+    assert first == second
+    assert first["shared"] is not second["shared"]
+
+
+def test_include_cache_json_ref_change(tmpdir):
+    cache = loader.IncludeCache()
+    tmpdir.join("ref.json").write('{"type": "string"}')
+    tmpdir.join("schema.json").write('{"a": {"$ref": "ref.json"}}')
+    raml_file = tmpdir.join("api.raml")
+    raml_file.write("schema: !include schema.json\n")
+
+    first = loader.RAMLLoader(include_cache=cache)
+    with open(raml_file.strpath) as f:
+        assert first.load(f)["schema"]["a"]["type"] == "string"
+    assert first.includes == [tmpdir.join("schema.json").strpath,
+                              tmpdir.join("ref.json").strpath]
+
+    tmpdir.join("ref.json").write('{"type": "integer"}')
+    raml = _load(raml_file, include_cache=cache)
+    assert raml["schema"]["a"]["type"] == "integer"
+    assert cache.hits == 0
+
+
+@pytest.mark.parametrize("raml_file", [
+    EXAMPLES + "base-includes.raml",
+    EXAMPLES + "nested-includes.raml",
+    EXAMPLES + "nonyaml-includes.raml",
+    EXAMPLES + "json_includes.raml",
+    EXAMPLES + "xsd_includes.raml",
+    JSONREF + "jsonref_relative_local_includes.raml",
+])
+def test_prefetch_matches_sequential(raml_file):
+    with open(raml_file) as f:
+        expected = loader.RAMLLoader(include_cache=None).load(f)
+    prefetcher = loader.RAMLLoader(include_cache=None, prefetch=4)
+    with open(raml_file) as f:
+        raml = prefetcher.load(f)
+
+    assert raml == expected
+    assert list(raml.keys()) == list(expected.keys())
+    assert prefetcher._prefetched == {}
+
+
+def test_prefetch_nested_and_missing(tmpdir):
+    raml_file = _write_includes(tmpdir)
+    raml = _load(raml_file, include_cache=None, prefetch=2)
+    assert raml["shared"]["foo"]["bar"] == 1
+
+    raml_file.write("title: Missing\nfoo: !include missing.yaml\n")
+    with pytest.raises(IOError):
+        _load(raml_file, include_cache=None, prefetch=2)
+
+
+def test_prefetch_invalid_include():
+    raml_file = os.path.join(EXAMPLES, "include_has_invalid_tag.raml")
+    with pytest.raises(LoadRAMLError):
+        with open(raml_file) as f:
+            loader.RAMLLoader(include_cache=None, prefetch=2).load(f)
+
+
+def test_lazy_include(tmpdir):
+    tmpdir.join("schema.json").write('{"type": "string"}')
+    tmpdir.join("readme.md").write("# Read me")
+    raml_file = tmpdir.join("api.raml")
+    raml_file.write("schema: !include schema.json\n"
+                    "docs: !include readme.md\n")
+
+    raml = _load(raml_file, include_cache=None, lazy=True)
+    schema = raml["schema"]
+    assert isinstance(schema, loader.LazyInclude)
+    assert not schema.loaded
+    assert not isinstance(schema, dict)
+
+    tmpdir.join("schema.json").write('{"type": "integer"}')
+    assert schema["type"] == "integer"
+    assert schema.loaded
+    assert isinstance(schema, dict)
+    assert raml["docs"] == "# Read me"
+
+
+def test_lazy_include_proxy():
+    calls = []
+
+    def load():
+        calls.append(1)
+        return {"a": [1]}
+
+    value = loader.LazyInclude(load)
+    assert not calls
+    assert value == {"a": [1]} and "a" in value and len(value) == 1
+    assert value.get("a") == [1] and list(value) == ["a"]
+    assert type(pickle.loads(pickle.dumps(value))) is dict
+    assert copy.deepcopy(value) == {"a": [1]}
+    assert calls == [1]
+
+    text = loader.LazyInclude(lambda: "ab")
+    assert "x" + text + "c" == "xabc" and text * 2 == "abab"
+    assert str(text) == "ab" and hash(text) == hash("ab")
+
+
+def test_lazy_include_missing_file(tmpdir):
+    raml_file = tmpdir.join("api.raml")
+    raml_file.write("schema: !include missing.json\n")
+
+    raml = _load(raml_file, lazy=True)
+    with pytest.raises(IOError):
+        raml["schema"].get("type")
+
+
+def test_lazy_include_yaml_is_eager(tmpdir):
+    raml_file = _write_includes(tmpdir)
+    raml = _load(raml_file, include_cache=None, lazy=True)
+
+    assert not isinstance(raml["shared"], loader.LazyInclude)
+    assert raml["shared"]["foo"]["bar"] == 1
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 # Copyright (c) 2015 Spotify AB
 
+import json
 import os
 from textwrap import dedent
 
@@ -13,9 +14,11 @@ from .base import EXAMPLES, VALIDATE
 
 
 MAIN_USAGE = 'Usage: main [OPTIONS] COMMAND [ARGS]...\n\n'
+DUMP_USAGE = 'Usage: dump [OPTIONS] RAMLFILE\n\n'
+MOCK_USAGE = 'Usage: mock [OPTIONS] RAMLFILE\n\n'
 TREE_USAGE = 'Usage: tree [OPTIONS] RAMLFILE\n\n'
 UPDATE_USAGE = 'Usage: update [OPTIONS]\n\n'
-VALIDATE_USAGE = 'Usage: validate [OPTIONS] RAMLFILE\n\n'
+VALIDATE_USAGE = 'Usage: validate [OPTIONS] RAMLFILE...\n\n'
 
 MAIN_HELP = MAIN_USAGE + """\
   Yet Another RAML Parser
@@ -24,9 +27,33 @@ Options:
   -h, --help  Show this message and exit.
 
 Commands:
+  dump      Dump the parsed RAML file as JSON.
+  mock      Serve the examples of a RAML file from a mock...
   tree      Visualize the RAML file as a tree.
   update    Update RAMLfications' supported MIME types...
-  validate  Validate a RAML file.
+  validate  Validate RAML files.
+"""
+
+DUMP_HELP = DUMP_USAGE + """\
+  Dump the parsed RAML file as JSON.
+
+Options:
+  -c, --config PATH      Additionally supported items beyond RAML spec.
+  -o, --output FILENAME  Save output to file instead of stdout.
+  -r, --raw              Include the raw RAML data of each object.
+  -h, --help             Show this message and exit.
+"""
+
+MOCK_HELP = MOCK_USAGE + """\
+  Serve the examples of a RAML file from a mock server.
+
+Options:
+  -c, --config PATH         Additionally supported items beyond RAML spec.
+  -H, --host TEXT           Address to listen on.  [default: 127.0.0.1]
+  -p, --port INTEGER RANGE  Port to listen on.  [default: 8000]
+  -l, --latency FLOAT       Seconds to delay each response by.
+  -j, --jitter FLOAT        Random extra latency, up to that many seconds.
+  -h, --help                Show this message and exit.
 """
 
 TREE_HELP = TREE_USAGE + """\
@@ -49,11 +76,12 @@ Options:
 """
 
 VALIDATE_HELP = VALIDATE_USAGE + """\
-  Validate a RAML file.
+  Validate RAML files.
 
 Options:
-  -c, --config PATH  Additionally supported items beyond RAML spec.
-  -h, --help         Show this message and exit.
+  -c, --config PATH         Additionally supported items beyond RAML spec.
+  -j, --jobs INTEGER RANGE  Files to validate in parallel, 0 for one per CPU.
+  -h, --help                Show this message and exit.
 """
 
 
@@ -123,7 +151,12 @@ def test_validate_bad_file_handling(runner):
     """
     _handles_no_file(runner, VALIDATE_USAGE, main.validate)
     _handles_nonexistent_file(runner, VALIDATE_USAGE, main.validate)
-    _handles_file_extra_arg(runner, VALIDATE_USAGE, main.validate)
+
+    result = runner.invoke(main.validate, ["nonexistent*.raml"])
+    expected = VALIDATE_USAGE + (
+        'Error: Invalid value for "ramlfile": '
+        'Pattern "nonexistent*.raml" does not match any file.\n')
+    check_result(2, expected, result)
 
 
 def test_validate(runner):
@@ -155,6 +188,27 @@ def test_validate_fail(runner):
     assert exp_msg_3 in result.output
 
 
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_validate_many(runner, jobs):
+    """
+    Validate many RAML files, given as files & globs, via CLI.
+    """
+    valid_file = os.path.join(EXAMPLES, "complete-valid-example.raml")
+    invalid_glob = os.path.join(VALIDATE, "no-base-uri-no-t*.raml")
+    invalid_file = os.path.join(VALIDATE, "no-base-uri-no-title.raml")
+
+    result = runner.invoke(main.validate,
+                           ["-j", jobs, valid_file, invalid_glob, valid_file])
+
+    assert result.exit_code == 1
+    lines = result.output.splitlines()
+    # reported as each file is done, in any order
+    assert lines.count(
+        "Success! Valid RAML file: {0}".format(valid_file)) == 2
+    assert "Error validating file {0}: ".format(invalid_file) in lines
+    assert lines[-1] == "2 of 3 RAML files valid."
+
+
 @pytest.mark.parametrize('args', [['-h'], ['--help']])
 def test_tree_help(runner, args):
     """
@@ -272,3 +326,78 @@ def test_update(runner, mocker):
 
     # sanity check that data was not written to file
     assert start_mtime == end_mtime
+
+
+@pytest.mark.parametrize('args', [['-h'], ['--help']])
+def test_mock_help(runner, args):
+    """
+    Show the mock command usage help.
+    """
+    result = runner.invoke(main.mock, args)
+    check_result(0, MOCK_HELP, result)
+
+
+def test_mock_bad_file_handling(runner):
+    """
+    The mock command handles bad & invalid file arguments.
+    """
+    _handles_no_file(runner, MOCK_USAGE, main.mock)
+    _handles_nonexistent_file(runner, MOCK_USAGE, main.mock)
+    _handles_file_extra_arg(runner, MOCK_USAGE, main.mock)
+
+    raml_file = os.path.join(VALIDATE, "no-base-uri-no-title.raml")
+    result = runner.invoke(main.mock, [raml_file])
+    assert result.exit_code == 1
+    assert "is not a valid RAML file" in result.output
+
+
+@pytest.mark.parametrize('args', [['-h'], ['--help']])
+def test_dump_help(runner, args):
+    """
+    Show the dump command usage help.
+    """
+    result = runner.invoke(main.dump, args)
+    check_result(0, DUMP_HELP, result)
+
+
+def test_dump_bad_file_handling(runner):
+    """
+    The dump command handles bad & invalid file arguments.
+    """
+    _handles_no_file(runner, DUMP_USAGE, main.dump)
+    _handles_nonexistent_file(runner, DUMP_USAGE, main.dump)
+    _handles_file_extra_arg(runner, DUMP_USAGE, main.dump)
+
+    raml_file = os.path.join(VALIDATE, "no-base-uri-no-title.raml")
+    result = runner.invoke(main.dump, [raml_file])
+    assert result.exit_code == 1
+    assert "is not a valid RAML file" in result.output
+
+    # a directory can not be loaded
+    result = runner.invoke(main.dump, [VALIDATE])
+    assert result.exit_code == 1
+    assert "Error loading file {0}".format(VALIDATE) in result.output
+    assert "Traceback" not in result.output
+
+
+def test_dump(runner, tmpdir):
+    """
+    Dump a RAML file as JSON via CLI, to stdout or a file.
+    """
+    raml_file = os.path.join(EXAMPLES, "complete-valid-example.raml")
+    config = os.path.join(EXAMPLES, "test-config.ini")
+    result = runner.invoke(main.dump, ["-c", config, raml_file])
+    assert result.exit_code == 0
+    data = json.loads(result.output)
+    assert data["title"] == "Example Web API"
+    assert "raw" not in data
+
+    output = str(tmpdir.join("api.json"))
+    result = runner.invoke(main.dump,
+                           ["-r", "-c", config, "-o", output, raml_file])
+    assert result.exit_code == 0
+    assert result.output == ""
+    with open(output) as f:
+        dumped = json.load(f)
+    assert dumped["raw"]["title"] == "Example Web API"
+    assert len(dumped["resources"]) == len(data["resources"])
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2015 Spotify AB
+from __future__ import absolute_import, division, print_function
+
+import os
+import re
+import socket
+import threading
+import time
+
+import pytest
+from six.moves import http_client
+
+from ramlfications import parser as pw
+from ramlfications.config import setup_config
+from ramlfications._helpers import load_file
+
+from .base import EXAMPLES
+
+asyncio = pytest.importorskip("asyncio")
+mock = pytest.importorskip("ramlfications.mock")
+
+
+@pytest.fixture(scope="module")
+def api():
+    raml_file = os.path.join(EXAMPLES + "complete-valid-example.raml")
+    loaded_raml_file = load_file(raml_file)
+    config = setup_config(EXAMPLES + "test-config.ini")
+    return pw.parse_raml(loaded_raml_file, config)
+
+
+@pytest.fixture
+def serve(api):
+    """Starts a mock server of ``api`` in a thread; returns its port."""
+    loops = []
+
+    def start(**kwargs):
+        loop = asyncio.new_event_loop()
+        server = mock.MockServer(api, **kwargs).start("127.0.0.1", 0, loop)
+        thread = threading.Thread(target=loop.run_forever)
+        thread.daemon = True
+        thread.start()
+        loops.append((loop, server, thread))
+        return server.sockets[0].getsockname()[1]
+
+    yield start
+    for loop, server, thread in loops:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+
+
+def get(port, method, path, headers=None):
+    conn = http_client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.request(method, path, headers=headers or {})
+        response = conn.getresponse()
+        return (response.status, response.getheader("Content-Type"),
+                response.read())
+    finally:
+        conn.close()
+
+
+def test_mock_server(serve):
+    port = serve()
+    assert get(port, "GET", "/search?q=1") == (
+        200, "application/json", b'{"name": "the example search body"}')
+    # as are paths that start with the path of the base URI
+    assert get(port, "GET", "/v1/bar/search?q=1")[0] == 200
+    assert get(port, "GET", "/v1/bar/users/1/thingys")[0] == 200
+    # absolute URLs are matched against the base URI
+    url = "https://foo.example.com/v1/bar/search"
+    assert get(port, "GET", url)[0] == 200
+    assert get(port, "GET", "/search", {"X-Mock-Status": "403"}) == (
+        403, "application/json", b'{"name": "Foo Bar"}')
+    assert get(port, "HEAD", "/search") == (200, "application/json", b"")
+
+    status, mime_type, body = get(port, "GET", "/users/1/thingys",
+                                  {"Accept": "text/xml"})
+    assert (status, mime_type) == (200, "text/xml")
+    assert body.startswith(b"<thingies>\n  <thingy><name>Foo</name>")
+
+    assert get(port, "GET", "/nope") == (404, "text/plain", b"Not Found")
+    assert get(port, "POST", "/search")[0] == 404
+    assert get(port, "GET", "/search", {"X-Mock-Status": "x"})[0] == 400
+
+
+def test_mock_server_own_loop(api):
+    started = threading.Event()
+    loops = []
+
+    def run():
+        # no event loop is set in this thread
+        server = mock.MockServer(api, latency=0.01).start("127.0.0.1", 0)
+        loops.append((asyncio.get_event_loop(), server))
+        started.set()
+        loops[0][0].run_forever()
+
+    thread = threading.Thread(target=run)
+    thread.daemon = True
+    thread.start()
+    assert started.wait(5)
+    loop, server = loops[0]
+    try:
+        port = server.sockets[0].getsockname()[1]
+        assert get(port, "GET", "/search")[0] == 200
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+
+
+def test_mock_server_serializes_once(api):
+    server = mock.MockServer(api)
+    head, body = server.respond("GET", "/search", {})
+    assert head.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert b"Content-Length: 35\r\n" in head
+    assert server.respond("GET", "/search", {})[1] is body
+
+
+def test_mock_server_pipelining(serve):
+    port = serve(latency=0.05, jitter=0.05)
+    sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+    requests = [b"GET /search HTTP/1.1\r\n\r\n",
+                b"POST /users/1/thingys HTTP/1.1\r\n"
+                b"Content-Length: 2\r\n\r\n{}",
+                b"GET /nope HTTP/1.1\r\n\r\n",
+                b"GET /search HTTP/1.1\r\nX-Mock-Status: 403\r\n"
+                b"Connection: close\r\n\r\n"]
+    start = time.time()
+    sock.sendall(b"".join(requests))
+    data = b""
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    sock.close()
+    assert time.time() - start >= 0.05
+
+    lines = re.findall(b"HTTP/1.1 [^\r]*", data)
+    assert lines == [b"HTTP/1.1 200 OK", b"HTTP/1.1 201 Created",
+                     b"HTTP/1.1 404 Not Found", b"HTTP/1.1 403 Forbidden"]
+
+
+def test_mock_server_chunked(serve):
+    port = serve()
+    sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+    # sent in pieces, the second request after the chunked body
+    for data in [b"POST /users/1/thingys HTTP/1.1\r\n"
+                 b"Transfer-Encoding: chunked\r\n\r\n4\r\n{\"a\"",
+                 b"\r\n3;ext=1\r\n:1}\r\n0\r\nX-Trailer: 1\r\n",
+                 b"\r\nGET /search HTTP/1.1\r\nConnection: close\r\n\r\n"]:
+        sock.sendall(data)
+        time.sleep(0.01)
+    data = b""
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    sock.close()
+    lines = re.findall(b"HTTP/1.1 [^\r]*", data)
+    assert lines == [b"HTTP/1.1 201 Created", b"HTTP/1.1 200 OK"]
+
+    sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+    sock.sendall(b"POST /users/1/thingys HTTP/1.1\r\n"
+                 b"Transfer-Encoding: chunked\r\n\r\nzz\r\n")
+    assert sock.recv(65536).startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    sock.close()
+
+
+def test_mock_server_bad_request(serve):
+    port = serve()
+    sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+    sock.sendall(b"nonsense\r\n\r\n")
+    assert sock.recv(65536).startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    assert sock.recv(65536) == b""
+    sock.close()
@@ -4,12 +4,15 @@ from __future__ import absolute_import, division, print_function
 
 import os
 
+import attr
 import pytest
 import xmltodict
 
 from ramlfications import parser as pw
 from ramlfications.config import setup_config
-from ramlfications.raml import RootNode, ResourceTypeNode, TraitNode
+from ramlfications.raml import (
+    RootNode, ResourceTypeNode, TraitNode, UNLOADED
+)
 from ramlfications._helpers import load_file
 
 from .base import EXAMPLES
@@ -592,6 +595,12 @@ def test_resource_type_empty_mapping_headers():
     assert len(base_res_type.headers) == 3
     assert base_res_type.headers[-1].description is None
 
+    # inheriting resources must not change the resource type's headers
+    collection = api.resource_types[4]
+    assert collection.name == "collection"
+    assert collection.headers[1].name == "EmptyAccept"
+    assert collection.headers[1].description is None
+
 
 #####
 # Test Resources
@@ -854,6 +863,20 @@ def test_resource_security_scheme(resources):
         {"oauth_2_0": {"scopes": ["thingy-read-private"]}}
     ]
     assert res.security_schemes[0].name == "oauth_2_0"
+    assert res.security_scheme_params == {
+        "oauth_2_0": {"scopes": ["thingy-read-private"]}
+    }
+
+
+def test_resource_security_scheme_shared(api):
+    root_schemes = dict((s.name, s) for s in api.security_schemes)
+    secured = [r for r in api.resources if r.security_schemes]
+    assert len(secured) > 1
+    for res in secured:
+        for scheme in res.security_schemes:
+            assert scheme is root_schemes[scheme.name]
+    # describedBy is expanded on the shared object
+    assert secured[0].security_schemes[0].headers
 
 
 def test_resource_inherit_parent(resources):
@@ -875,6 +898,73 @@ def test_resource_response_no_desc():
     assert response.description is None
 
 
+def test_resource_uri_params_override_type():
+    from ramlfications import loads
+
+    raml = loads("""#%RAML 0.8
+title: Merged API
+resourceTypes:
+  - item:
+      uriParameters:
+        id:
+          type: string
+          description: From the type
+      get:
+/things/{id}:
+  type: item
+  uriParameters:
+    id:
+      type: integer
+      description: From the resource
+""")
+    api = pw.parse_raml(raml, setup_config(EXAMPLES + "test-config.ini"))
+    params = api.resources[0].uri_params
+
+    assert [p.name for p in params] == ["id"]
+    assert params[0].type == "integer"
+    assert params[0].description.raw == "From the resource"
+
+
+def test_resource_inherited_responses_merged():
+    from ramlfications import loads
+
+    raml = loads("""#%RAML 0.8
+title: Merged API
+resourceTypes:
+  - base:
+      get:
+        responses:
+          200:
+            description: From the type
+            body:
+              application/json:
+                example: '{"a": 1}'
+          404:
+traits:
+  - limited:
+      responses:
+        404:
+        200:
+          description: From the trait
+          headers:
+            X-Rate-Limit:
+              type: integer
+/things:
+  type: base
+  get:
+    is: [limited]
+""")
+    api = pw.parse_raml(raml, setup_config(EXAMPLES + "test-config.ini"))
+    responses = api.resources[0].responses
+
+    # the type's position & description, the trait's header
+    assert [r.code for r in responses] == [200, 404]
+    ok = responses[0]
+    assert ok.description.raw == "From the type"
+    assert [h.name for h in ok.headers] == ["X-Rate-Limit"]
+    assert [b.mime_type for b in ok.body] == ["application/json"]
+
+
 @pytest.fixture(scope="session")
 def inherited_resources():
     raml_file = os.path.join(EXAMPLES, "resource-type-inherited.raml")
@@ -1264,3 +1354,317 @@ doner andouille cupim meatball. Porchetta hamburger filet mignon jerky flank, \
 meatball salami beef cow venison tail ball tip pork belly.</p>
 """
     assert api.documentation[0].content.html == markdown_html
+
+
+def test_memoized_node_attribute():
+    calls = []
+
+    @pw._memoized
+    def type_():
+        calls.append(1)
+        return None
+
+    assert type_() is None
+    assert type_() is None
+    assert len(calls) == 1
+
+
+def test_parse_fields(loaded_raml):
+    config = setup_config(EXAMPLES + "test-config.ini")
+    full = pw.parse_raml(loaded_raml, config)
+    routing = pw.parse_raml(loaded_raml, config, fields="routing")
+    some = pw.parse_raml(loaded_raml, config,
+                         fields=["path", "method", "query_params"])
+
+    assert len(routing.resources) == len(full.resources)
+    for res, exp, res_some in zip(routing.resources, full.resources,
+                                  some.resources):
+        assert (res.path, res.method) == (exp.path, exp.method)
+        assert res.uri_params == exp.uri_params
+        assert res.base_uri_params == exp.base_uri_params
+        assert res_some.query_params == exp.query_params
+        for field in ("headers", "body", "responses", "query_params",
+                      "form_params"):
+            assert getattr(res, field) is UNLOADED
+        assert res_some.uri_params is UNLOADED
+        assert res_some.responses is UNLOADED
+    # resource types are built as usual
+    for res_type, exp in zip(routing.resource_types, full.resource_types):
+        assert res_type.responses == exp.responses
+
+
+def test_parse_fields_unknown(loaded_raml):
+    config = setup_config(EXAMPLES + "test-config.ini")
+    with pytest.raises(ValueError):
+        pw.parse_raml(loaded_raml, config, fields="everything")
+    with pytest.raises(ValueError):
+        pw.parse_raml(loaded_raml, config, fields=["schemas"])
+
+
+def test_unloaded():
+    import pickle
+
+    assert not UNLOADED
+    assert repr(UNLOADED) == "UNLOADED"
+    assert pickle.loads(pickle.dumps(UNLOADED)) is UNLOADED
+
+
+def test_nodes_not_slotted_by_default(resources):
+    import pickle
+
+    from ramlfications.config import SLOTS
+
+    res = resources[19]
+    if not SLOTS:
+        assert hasattr(res, "__dict__")
+    copied = pickle.loads(pickle.dumps(res))
+    assert copied.responses == res.responses
+    assert copied.headers == res.headers
+
+
+SLOTTED = """
+import pickle, sys
+from ramlfications import parse
+api = parse(sys.argv[1], sys.argv[2])
+res = api.resources[19]
+objs = [res, res.resource_type, res.responses[0], res.headers[0],
+        res.query_params[0], res.body[0]]
+assert not [type(o).__name__ for o in objs if hasattr(o, "__dict__")]
+copied = pickle.loads(pickle.dumps(res))
+assert copied.responses == res.responses
+assert copied.headers == res.headers
+"""
+
+
+@pytest.mark.skipif(
+    tuple(int(v) for v in attr.__version__.split(".")[:2]) < (16, 0),
+    reason="slotted classes need attrs>=16.0.0")
+def test_slotted_nodes():
+    import subprocess
+    import sys
+
+    env = dict(os.environ, RAMLFICATIONS_SLOTS="1")
+    args = [sys.executable, "-c", SLOTTED,
+            os.path.join(EXAMPLES + "complete-valid-example.raml"),
+            os.path.join(EXAMPLES + "test-config.ini")]
+    assert subprocess.call(args, env=env) == 0
+
+
+def test_resource_groups(api):
+    groups = api.resource_groups
+    assert [r for g in groups for r in g.resources] == api.resources
+    assert len(groups) == 21
+
+    widgets = groups[12]
+    assert widgets.path == "/me/widgets"
+    assert widgets.methods == ["get", "put", "delete"]
+    assert widgets.resource("put") is api.resources[13]
+    assert widgets.resource("post") is None
+    for res in widgets.resources:
+        assert res.group is widgets
+        assert res.path is widgets.path
+    get, put, delete = widgets.resources
+    for field in pw.GROUP_FIELDS:
+        assert getattr(get, field) == getattr(delete, field)
+    # a method may change resource-level data
+    assert get.protocols == ["HTTPS"]
+    assert put.protocols == ["HTTP"]
+    assert put.absolute_uri.startswith("http://")
+
+    thingy = groups[16]
+    assert thingy.path == "/users/{user_id}/thingys/{thingy_id}"
+    assert thingy.parent.path == "/users/{user_id}/thingys"
+    assert widgets.parent is groups[11]
+    assert groups[0].parent is None
+
+
+def test_resource_groups_computed_once(monkeypatch):
+    from ramlfications import loads
+
+    raml = loads("""#%RAML 0.8
+title: Grouped API
+baseUri: https://example.com/{version}
+version: v1
+traits:
+  - secure:
+      protocols: [HTTP]
+/things/{id}:
+  uriParameters:
+    id:
+      type: integer
+  get:
+  put:
+  delete:
+    is: [secure]
+""")
+    calls = []
+
+    def create_uri_params(*args):
+        calls.append(args[-2])
+        return _create_uri_params(*args)
+
+    _create_uri_params = pw._create_uri_params
+    monkeypatch.setattr(pw, "_create_uri_params", create_uri_params)
+    api = pw.parse_raml(raml, setup_config(EXAMPLES + "test-config.ini"))
+
+    get, put, delete = api.resource_groups[0].resources
+    assert calls == [raml["/things/{id}"]] * 2
+    assert put.uri_params is get.uri_params
+    assert put.absolute_uri is get.absolute_uri
+    assert delete.protocols == ["HTTP"]
+    assert delete.uri_params == get.uri_params
+
+
+def test_resource_type_inheritance_chain():
+    from ramlfications import loads
+
+    raml = loads("""#%RAML 0.8
+title: Chained API
+baseUri: https://example.com
+resourceTypes:
+  - grandchild:
+      type: child
+      get:
+        headers:
+          X-Grandchild:
+            description: grandchild header
+  - base:
+      get:
+        description: base description
+        headers:
+          X-Base:
+            description: base header
+          X-Overridden:
+            description: base version
+  - child:
+      type: base
+      get:
+        headers:
+          X-Overridden:
+            description: child version
+  - loop:
+      type: loop
+      get:
+        description: inherits from itself
+/things:
+  type: grandchild
+  get:
+""")
+    config = setup_config(EXAMPLES + "test-config.ini")
+    config["validate"] = False
+    api = pw.parse_raml(raml, config)
+
+    types = dict((r.name, r) for r in api.resource_types)
+    assert sorted(types) == ["base", "child", "grandchild", "loop"]
+
+    grandchild = types["grandchild"]
+    headers = dict((h.name, h.description.raw) for h in grandchild.headers)
+    assert headers == {
+        "X-Grandchild": "grandchild header",
+        "X-Base": "base header",
+        "X-Overridden": "child version",
+    }
+    assert grandchild.description.raw == "base description"
+    assert types["loop"].description.raw == "inherits from itself"
+
+    res = api.resources[0]
+    assert sorted(h.name for h in res.headers) == [
+        "X-Base", "X-Grandchild", "X-Overridden"
+    ]
+
+
+def test_root_match(api):
+    match = api.match("GET", "/widgets/12/gizmos")
+    assert match == (api.resources[2], {"id": "12"})
+    assert api.match("put", "/me/widgets/")[0] is api.resources[13]
+    assert api.match("post", "/me/widgets") is None
+    assert api.match("get", "/nope") is None
+    assert api.match(None, "/no_method_properties")[0].method is None
+
+    url = "https://foo.example.com/v1/bar/users/u1/thingys/t%201?q=1"
+    node, params = api.match("get", url)
+    assert node.path == "/users/{user_id}/thingys/{thingy_id}"
+    assert params == {"subdomain": "foo", "communityPath": "bar",
+                      "user_id": "u1", "thingy_id": "t 1"}
+    # {version} in the base URI is the API's version
+    url = "https://foo.example.com/v2/bar/users/u1/thingys/t1"
+    assert api.match("get", url) is None
+
+
+def test_root_match_invalid_patterns():
+    from ramlfications import loads
+
+    raml = loads("""#%RAML 0.8
+title: Routed API
+/users:
+  get:
+  /{name}:
+    uriParameters:
+      name:
+        pattern: (?i)^[a-z]+$
+    get:
+/people:
+  /{first}-{last}:
+    uriParameters:
+      first:
+        pattern: (?P<p1>[a-z]+)
+    get:
+""")
+    api = pw.parse_raml(raml, setup_config(EXAMPLES + "test-config.ini"))
+
+    # a pattern invalid as part of the route does not break the others
+    assert api.match("get", "/users")[0].path == "/users"
+    assert api.match("get", "/users/Bob") == (api.resources[1],
+                                              {"name": "Bob"})
+    assert api.match("get", "/people/a-b") == (
+        api.resources[-1], {"first": "a", "last": "b"})
+
+
+def test_root_match_uri_params():
+    from ramlfications import loads
+
+    raml = loads("""#%RAML 0.8
+title: Routed API
+baseUri: https://{region}.example.com/{version}
+version: v2
+baseUriParameters:
+  region:
+    enum: [eu, us]
+/users:
+  /me:
+    get:
+  /{id}:
+    uriParameters:
+      id:
+        type: integer
+    get:
+    delete:
+  /{name}:
+    uriParameters:
+      name:
+        pattern: ^[a-z]+$
+    get:
+  /{file}.json:
+    get:
+""")
+    api = pw.parse_raml(raml, setup_config(EXAMPLES + "test-config.ini"))
+
+    def route(method, url):
+        match = api.match(method, url)
+        return match and (match[0].path, match[1])
+
+    assert route("get", "/users/me") == ("/users/me", {})
+    # literal segments win, but not for methods they do not have
+    assert route("delete", "/users/me") is None
+    assert route("get", "/users/42") == ("/users/{id}", {"id": "42"})
+    assert route("get", "/users/bob") == ("/users/{name}", {"name": "bob"})
+    assert route("get", "/users/a.json") == ("/users/{file}.json",
+                                             {"file": "a"})
+    assert route("get", "/users/Bob") is None
+    assert route("get", "https://eu.example.com/v2/users/1") == \
+        ("/users/{id}", {"id": "1", "region": "eu"})
+    assert route("get", "https://asia.example.com/v2/users/1") is None
+
+    # the index follows replaced resources
+    api.resources = api.resources[:1]
+    assert route("get", "/users/42") is None
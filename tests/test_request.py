@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2015 Spotify AB
+from __future__ import absolute_import, division, print_function
+
+import os
+
+import pytest
+
+from ramlfications import loads
+from ramlfications import parser as pw
+from ramlfications.config import setup_config
+from ramlfications.errors import InvalidParameterError
+from ramlfications.request import ParameterValidator, RequestValidator
+from ramlfications._helpers import load_file
+
+from .base import EXAMPLES
+
+
+@pytest.fixture(scope="session")
+def api():
+    raml_file = os.path.join(EXAMPLES + "complete-valid-example.raml")
+    loaded_raml_file = load_file(raml_file)
+    config = setup_config(EXAMPLES + "test-config.ini")
+    return pw.parse_raml(loaded_raml_file, config)
+
+
+@pytest.fixture(scope="session")
+def params():
+    raml = loads("""#%RAML 0.8
+title: Request API
+/things:
+  get:
+    queryParameters:
+      name:
+        minLength: 2
+        maxLength: 5
+        pattern: ^[a-z]+$
+      count:
+        type: integer
+        minimum: 1
+        maximum: 10
+      ratio:
+        type: number
+      flag:
+        type: boolean
+      since:
+        type: date
+      kind:
+        enum: [a, b]
+      tag:
+        repeat: true
+      q:
+        required: true
+""")
+    api = pw.parse_raml(raml, setup_config(EXAMPLES + "test-config.ini"))
+    return api.resources[0].query_params
+
+
+def errors(validator, values):
+    return dict((e.parameter, str(e)) for e in validator(values))
+
+
+def test_parameter_validator(params):
+    check = ParameterValidator(params)
+    valid = ("q=x&name=abc&count=10&ratio=0.5&flag=true&kind=b"
+             "&since=Sun, 06 Nov 1994 08:49:37 GMT&tag=1&tag=2&other=1")
+    assert check(valid) == []
+    assert check("?" + valid) == []
+
+    assert errors(check, "q=x&name=a&count=0&kind=c") == {
+        "name": "'name' must be at least 2 characters long.",
+        "count": "'count' must be at least 1, not 0.",
+        "kind": "'kind' must be one of ['a', 'b'], not 'c'.",
+    }
+    assert errors(check, "q=x&name=abcdef&count=11&ratio=x&flag=1") == {
+        "name": "'name' must be at most 5 characters long.",
+        "count": "'count' must be at most 10, not 11.",
+        "ratio": "'ratio' must be of type 'number', not 'x'.",
+        "flag": "'flag' must be of type 'boolean', not '1'.",
+    }
+    assert errors(check, "name=AB&since=yesterday&kind=a&kind=b") == {
+        "name": "'name' does not match '^[a-z]+$': 'AB'.",
+        "since": "'since' must be of type 'date', not 'yesterday'.",
+        "kind": "'kind' must not be repeated.",
+        "q": "'q' is required.",
+    }
+
+
+def test_parameter_validator_mapping(params):
+    check = ParameterValidator(params)
+    assert check({"q": "x", "tag": ["1", "2"], "count": "3"}) == []
+    assert errors(check, {"q": ["x", "y"], "count": 3}) == {
+        "q": "'q' must not be repeated.",
+    }
+    assert errors(check, {"Q": "x"}) == {"q": "'q' is required."}
+    assert errors(ParameterValidator(params, ignore_case=True),
+                  {"Q": "x", "COUNT": "x"}) == {
+        "count": "'count' must be of type 'integer', not 'x'.",
+    }
+    assert ParameterValidator(params, required=False)({}) == []
+    assert ParameterValidator(None)("a=1") == []
+
+
+def test_request_validator(api):
+    search = RequestValidator(api.resources[10])
+    assert search(query="q=x&type=gizmo&limit=50",
+                  headers={"accept": "application/json"}) == []
+    errs = search(query="type=foo&limit=100")
+    assert all(isinstance(e, InvalidParameterError) for e in errs)
+    assert sorted(e.parameter for e in errs) == ["limit", "q", "type"]
+    assert search() == []
+
+    node, uri_params = api.match("get", "/users/u1/thingys/t1")
+    assert RequestValidator(node)(uri_params=uri_params,
+                                  headers={"X-Another-Header": "x"}) == []
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2015 Spotify AB
+from __future__ import absolute_import, division, print_function
+
+import copy
+import json
+import os
+import subprocess
+import sys
+
+import jsonref
+import pytest
+
+from ramlfications import loads
+from ramlfications import parser as pw
+from ramlfications import schema as sch
+from ramlfications.config import setup_config
+from ramlfications.errors import InvalidPayloadError
+from ramlfications.schema import SchemaValidator, validator_for
+from ramlfications._helpers import load_file
+
+from .base import EXAMPLES
+
+
+@pytest.fixture(scope="session")
+def api():
+    raml_file = os.path.join(EXAMPLES + "complete-valid-example.raml")
+    loaded_raml_file = load_file(raml_file)
+    config = setup_config(EXAMPLES + "test-config.ini")
+    return pw.parse_raml(loaded_raml_file, config)
+
+
+@pytest.fixture(autouse=True)
+def stdlib_engine(monkeypatch):
+    monkeypatch.setattr(sch, "JSONSCHEMA", False)
+    sch.clear_cache()
+
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer", "minimum": 1},
+        "name": {"type": "string", "minLength": 1, "maxLength": 5,
+                 "pattern": "^[a-z]+$"},
+        "kind": {"enum": ["a", 1, True]},
+        "tags": {"type": "array", "items": {"type": "string"},
+                 "maxItems": 2, "uniqueItems": True},
+        "ratio": {"type": ["number", "null"], "exclusiveMaximum": True,
+                  "maximum": 1},
+        "old": {"type": "string", "required": True},
+    },
+    "required": ["id"],
+    "additionalProperties": False,
+}
+
+
+def errors(validator, payload):
+    return sorted((e.path, str(e)) for e in validator(payload))
+
+
+def test_schema_validator():
+    check = SchemaValidator(SCHEMA)
+    valid = {"id": 1, "name": "abc", "kind": True, "tags": ["x", "y"],
+             "ratio": None, "old": ""}
+    assert check(valid) == []
+    assert check(json.dumps(valid)) == []
+    assert check(json.dumps(valid).encode("utf-8")) == []
+
+    invalid = {"id": True, "name": "ABCDEF", "kind": 1.5,
+               "tags": ["x", "x", 1], "ratio": 1, "other": 1}
+    assert errors(check, invalid) == [
+        ([], "'old' is a required property."),
+        ([], "Additional property 'other' is not allowed."),
+        (["id"], "True is not of type integer."),
+        (["kind"], "1.5 is not one of ['a', 1, True]."),
+        (["name"], "'ABCDEF' does not match '^[a-z]+$'."),
+        (["name"], "'ABCDEF' is longer than 5."),
+        (["ratio"], "1 is greater than or equal to the maximum of 1."),
+        (["tags"], "Expected at most 2 items."),
+        (["tags"], "['x', 'x', 1] has non-unique items."),
+        (["tags", 2], "1 is not of type string."),
+    ]
+    assert errors(check, {"id": 0, "kind": 1, "old": ""}) == [
+        (["id"], "0 is less than the minimum of 1."),
+    ]
+    errs = check("{")
+    assert len(errs) == 1 and errs[0].path == []
+    assert str(errs[0]).startswith("Payload is not valid JSON: ")
+    assert all(isinstance(e, InvalidPayloadError) for e in check([]))
+
+
+def test_schema_validator_combinators():
+    check = SchemaValidator({
+        "definitions": {"positive": {"type": "integer", "minimum": 1}},
+        "type": "array",
+        "items": [{"$ref": "#/definitions/positive"},
+                  {"anyOf": [{"type": "string"}, {"type": "null"}]},
+                  {"oneOf": [{"multipleOf": 2}, {"multipleOf": 3}]},
+                  {"not": {"type": "boolean"}},
+                  {"allOf": [{"type": "object"}, {"minProperties": 1}]}],
+        "additionalItems": False,
+    })
+    assert check([1, None, 4, "x", {"a": 1}]) == []
+    assert errors(check, [0, 1, 6, False, {}, 1]) == [
+        ([], "Expected at most 5 items."),
+        ([0], "0 is less than the minimum of 1."),
+        ([1], "1 is not valid under any of the given schemas."),
+        ([2], "6 is valid under 2 of the given schemas, not exactly one."),
+        ([3], "False is not allowed by {'type': 'boolean'}."),
+        ([4], "Expected at least 1 properties."),
+    ]
+
+
+def test_schema_validator_recursive():
+    schema = jsonref.loads(json.dumps({
+        "type": "object",
+        "properties": {"value": {"type": "integer"},
+                       "next": {"$ref": "#"}},
+    }), jsonschema=True)
+    check = validator_for(schema)
+    assert check({"value": 1, "next": {"value": 2, "next": {}}}) == []
+    assert errors(check, {"next": {"next": {"value": "3"}}}) == [
+        (["next", "next", "value"], "'3' is not of type integer."),
+    ]
+
+
+def test_schema_validator_ignores_invalid_keywords():
+    check = SchemaValidator({"properties": [], "pattern": "(",
+                             "minimum": "1", "items": {"type": "string"}})
+    assert check({}) == []
+    assert check(["a"]) == []
+    assert errors(check, [1]) == [([0], "1 is not of type string.")]
+
+
+def test_validator_for_cache():
+    schema = {"type": "object", "properties": {"a": {"type": "string"}}}
+    validator = validator_for(schema)
+    assert validator_for(schema) is validator
+    # equal schemas share the validator, too
+    assert validator_for(copy.deepcopy(schema)) is validator
+    assert validator_for({"type": "array"}) is not validator
+    assert errors(validator, {"a": 1}) == [
+        (["a"], "1 is not of type string."),
+    ]
+
+    sch.clear_cache()
+    assert validator_for(schema) is not validator
+
+
+def test_validator_for_cache_lru(monkeypatch):
+    monkeypatch.setattr(sch, "VALIDATOR_CACHE_SIZE", 2)
+    first, second, third = [{"maxLength": n} for n in range(3)]
+    validator = validator_for(first)
+    validator_for(second)
+    assert validator_for(first) is validator  # now most recently used
+    validator_for(third)  # drops ``second``
+
+    assert list(v[0] for v in sch._by_id.values()) == [first, third]
+    assert validator_for(first) is validator
+
+
+def test_body_validate(api):
+    search = api.resources[10]
+    body = search.responses[0].body[0]
+    assert body.validator is validator_for(body.schema)
+    assert body.validate(body.example) == []
+    assert body.validate(json.dumps(body.example)) == []
+
+    ok = api.resources[17].responses[0]
+    assert [b.mime_type for b in ok.body] == ["application/json", "text/xml"]
+    assert ok.body[1].validator is None
+    assert ok.validate([]) == []
+    assert ok.validate("[]", "application/json; charset=utf-8") == []
+    assert ok.validate("<thingies/>", "text/xml") == []
+    assert [str(e) for e in ok.validate({})] == [
+        "{} is not of type array."]
+    assert [str(e) for e in ok.validate({}, "text/html")] == [
+        "'200' response has no body of type 'text/html'."]
+
+    # every body with the same schema shares its validator
+    validators = {}
+    for node in api.resources:
+        for response in node.responses or []:
+            for b in response.body or []:
+                if b.validator is not None:
+                    key = json.dumps(b.schema, sort_keys=True)
+                    assert validators.setdefault(key, b.validator) is \
+                        b.validator
+
+
+def test_body_validate_no_schema():
+    raml = loads("""#%RAML 0.8
+title: Payload API
+/things:
+  get:
+    responses:
+      200:
+        body:
+          application/json:
+            example: '{"a": 1}'
+          application/xml:
+            schema: <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"/>
+      204:
+""")
+    api = pw.parse_raml(raml, setup_config(EXAMPLES + "test-config.ini"))
+    ok, empty = api.resources[0].responses
+    assert [b.validator for b in ok.body] == [None, None]
+    assert ok.validate("not json") == []
+    assert ok.validate("<a/>", "application/xml") == []
+    assert empty.validate({}, "application/json") == []
+
+
+@pytest.fixture(params=["stdlib", "jsonschema"])
+def engine(request, monkeypatch):
+    if request.param == "jsonschema":
+        pytest.importorskip("jsonschema")
+        monkeypatch.setattr(sch, "JSONSCHEMA", True)
+    return request.param
+
+
+def test_validate_github(engine):
+    raml_file = os.path.join(EXAMPLES + "github.raml")
+    config = setup_config(EXAMPLES + "github-config.ini")
+    api = pw.parse_raml(load_file(raml_file), config)
+
+    bodies = [b for node in api.resources for r in node.responses or []
+              for b in r.body or [] if b.validator is not None]
+    assert len(bodies) > 100
+    for body in bodies:
+        example = body.example if body.example is not None else {}
+        for payload in (example, {}, [], "x", None):
+            errs = body.validate(payload)
+            assert all(isinstance(e, InvalidPayloadError) for e in errs)
+
+
+def test_validator_for_drafts(engine):
+    # draft 3: ``required: true`` and ``type: any``, without ``$schema``
+    draft3 = {"type": "object",
+              "properties": {"a": {"type": "any", "required": True}}}
+    check = validator_for(draft3)
+    jsonschema = engine == "jsonschema"
+    assert isinstance(check, sch._JSONSchemaValidator) is jsonschema
+    assert check({"a": None}) == []
+    assert check({"a": 1}) == []
+    assert len(check({})) == 1
+
+    draft4 = {"type": "object", "required": ["a"]}
+    check = validator_for(draft4)
+    assert isinstance(check, sch._JSONSchemaValidator) is jsonschema
+    assert [e.path for e in check({})] == [[]]
+
+    # schemas ``jsonschema`` does not accept are checked without it
+    malformed = {"type": "object", "properties": [{"a": {}}],
+                 "required": ["a"]}
+    check = validator_for(malformed)
+    assert type(check) is SchemaValidator
+    assert [e.path for e in check({})] == [[]]
+
+
+def test_jsonschema_fallback_compiled_on_demand(monkeypatch):
+    pytest.importorskip("jsonschema")
+    monkeypatch.setattr(sch, "JSONSCHEMA", True)
+    compiled = []
+    compile_ = sch._compiled
+    monkeypatch.setattr(sch, "_compiled",
+                        lambda s: compiled.append(s) or compile_(s))
+
+    check = validator_for({
+        "$schema": "http://json-schema.org/draft-03/schema",
+        "type": "object",
+        "properties": {"at": {"type": "timestamp"},
+                       "n": {"type": "integer"}},
+    })
+    assert isinstance(check, sch._JSONSchemaValidator)
+    assert errors(check, {"n": "1"}) == [(["n"], "'1' is not of type "
+                                          "'integer'")]
+    assert compiled == []
+    # ``jsonschema`` does not know the type, the built-in validator does
+    for _ in range(2):
+        assert errors(check, {"at": 1, "n": "1"}) == [
+            (["at"], "1 is not of type timestamp."),
+            (["n"], "'1' is not of type integer."),
+        ]
+    assert len(compiled) == 1
+
+
+def test_jsonschema_imported_lazily():
+    code = ("import sys, ramlfications; "
+            "sys.exit('jsonschema' in sys.modules)")
+    assert subprocess.call([sys.executable, "-c", code]) == 0
@@ -202,3 +202,76 @@ def test_save_updated_mime_types():
     assert result == content
 
     os.remove(temp_output)
+
+
+class _Node(object):
+    def __init__(self, name, method=None):
+        self.name = name
+        self.method = method
+
+
+def test_definition_lookups():
+    root = Mock()
+    first, second = _Node("paged", "get"), _Node("paged", "post")
+    root.traits = [_Node("secured"), _Node("secured")]
+    root.resource_types = [first, second]
+    root.raw = {"securitySchemes": [{"oauth_2_0": {"type": "OAuth 2.0"}}]}
+
+    assert utils._trait_lookup("secured", root) is root.traits[0]
+    assert utils._trait_lookup({"secured": {"scope": "x"}}, root) is None
+    assert utils._resource_type_lookup("paged", root) is first
+    assert utils._resource_type_method_lookup("paged", "post",
+                                              root) is second
+    assert utils._get_scheme({"oauth_2_0": ["scope"]}, root) == \
+        root.raw["securitySchemes"][0]
+
+    # replacing the definitions rebuilds the index
+    root.resource_types = [second]
+    assert utils._resource_type_lookup("paged", root) is second
+
+
+def test_load_schema_memoized(monkeypatch):
+    schema = json.dumps({"type": "object", "title": "Thingy"})
+    example = "<thingy><name>foo</name></thingy>"
+
+    assert utils.load_schema(schema) is not utils.load_schema(schema)
+    with utils._memoize_schemas() as memo:
+        first = utils.load_schema(schema)
+        # an equal, but distinct string
+        assert utils.load_schema("".join(list(schema))) is first
+        assert utils.load_schema(example) is utils.load_schema(example)
+        assert utils.load_schema("not a schema") == "not a schema"
+        with utils._memoize_schemas():
+            assert utils.load_schema(schema) is first
+        assert len(memo) == 3
+    assert utils._schema_memo() is None
+
+    monkeypatch.setattr(utils, "SCHEMA_MEMO_SIZE", 2)
+    with utils._memoize_schemas() as memo:
+        for data in ("1", "2", "1", "3"):
+            utils.load_schema(data)
+        assert list(memo) == ["1", "3"]
+
+
+def test_merge():
+    from collections import namedtuple
+    from ramlfications.parameters import Body, Response
+
+    Param = namedtuple("Param", "name desc")
+    type_ = [Param("X-a", "type"), Param("X-b", "type")]
+    trait = [Param("X-c", "trait"), Param("X-a", "trait")]
+    own = [Param("X-b", "own"), Param("X-d", "own")]
+
+    # first level wins in first-seen order, own items override & go last
+    assert utils._merge([type_, trait], own=own) == [
+        ("X-a", "type"), ("X-c", "trait"), ("X-b", "own"), ("X-d", "own")]
+    assert utils._merge([trait, type_]) == [
+        ("X-c", "trait"), ("X-a", "trait"), ("X-b", "type")]
+    assert utils._merge([None, []]) is None
+
+    xml, json_ = Mock(spec=Body, mime_type="text/xml"), \
+        Mock(spec=Body, mime_type="application/json")
+    assert utils._merge([[xml], [json_, xml]]) == [xml, json_]
+
+    ok = Mock(spec=Response, code=200)
+    assert list(utils._keyed([[ok], None])) == [200]